@@ -0,0 +1,127 @@
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple, Type
+from src.parser.file_parser import FileParser
+from src.solver.bucket_queue import BucketQueue, Frontier, HeapQueue
+from src.solver.flow_solver import FlowSolver
+from src.solver.time_estimator import estimate_horizon
+from src.solver.time_graph import TimeGraph
+
+MAPS_DIR = Path(__file__).resolve().parent / "maps"
+REPEATS = 5
+
+# one frontier operation: (primary, item) for a push, None for a pop
+Operation = Optional[Tuple[int, Any]]
+
+
+class RecordingQueue(BucketQueue[Any]):
+    """BucketQueue logging every push and pop, one trace per search."""
+
+    traces: List[List[Operation]] = []
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.trace: List[Operation] = []
+        self.traces.append(self.trace)
+
+    def push(self, primary: int, item: Any) -> None:
+        self.trace.append((primary, item))
+        super().push(primary, item)
+
+    def pop(self) -> Tuple[int, Any]:
+        self.trace.append(None)
+        return super().pop()
+
+
+def record_traces(path: Path, search: str) -> List[List[Operation]]:
+    """Routes the fleet once and returns the frontier operations."""
+    simulation = FileParser().parse(str(path))
+    solver = FlowSolver(
+        TimeGraph(simulation, estimate_horizon(simulation)),
+        simulation.nb_drones,
+        search,
+    )
+    RecordingQueue.traces = []
+    solver.frontier = RecordingQueue
+    solver.route_drones()
+    return RecordingQueue.traces
+
+
+def replay(
+    traces: List[List[Operation]], frontier: Type[Frontier[Any]]
+) -> float:
+    """
+    Replays every search trace on a fresh queue and returns the
+    seconds spent in the queue alone.
+    """
+    started = time.perf_counter()
+    for trace in traces:
+        queue = frontier()
+        for operation in trace:
+            if operation is None:
+                queue.pop()
+            else:
+                queue.push(*operation)
+    return time.perf_counter() - started
+
+
+def route(path: Path, search: str, frontier: Type[Frontier[Any]]) -> float:
+    """Routes the fleet on a fresh graph and returns the seconds spent."""
+    simulation = FileParser().parse(str(path))
+    solver = FlowSolver(
+        TimeGraph(simulation, estimate_horizon(simulation)),
+        simulation.nb_drones,
+        search,
+    )
+    solver.frontier = frontier
+    started = time.perf_counter()
+    solver.route_drones()
+    return time.perf_counter() - started
+
+
+def best_of(measure: Callable[[], float]) -> float:
+    """Smallest of REPEATS measurements, in milliseconds."""
+    return min(measure() for _ in range(REPEATS)) * 1000
+
+
+def main() -> None:
+    """
+    Compares the heapq frontier with the bucket queue on every map:
+    raw push/pop replay of the recorded Dijkstra and A* searches,
+    then the whole fleet routing with each frontier.
+    """
+    maps = sorted(
+        path for path in MAPS_DIR.rglob("*.txt")
+        if len(sys.argv) < 2 or sys.argv[1] in str(path)
+    )
+    print(
+        f"{'map':<40} {'search':<9} {'ops':>7} "
+        f"{'heap ms':>8} {'bucket ms':>9} {'route heap':>10} "
+        f"{'route bucket':>12}"
+    )
+    totals = [0.0, 0.0, 0.0, 0.0]
+    for path in maps:
+        for search in ("dijkstra", "astar"):
+            traces = record_traces(path, search)
+            timings = [
+                best_of(lambda: replay(traces, HeapQueue)),
+                best_of(lambda: replay(traces, BucketQueue)),
+                best_of(lambda: route(path, search, HeapQueue)),
+                best_of(lambda: route(path, search, BucketQueue)),
+            ]
+            totals = [total + timing for total, timing in zip(totals, timings)]
+            name = path.relative_to(MAPS_DIR).as_posix()
+            print(
+                f"{name:<40} {search:<9} {sum(map(len, traces)):>7} "
+                f"{timings[0]:>8.2f} {timings[1]:>9.2f} "
+                f"{timings[2]:>10.2f} {timings[3]:>12.2f}"
+            )
+    print(
+        f"{'total':<40} {'':<9} {'':>7} {totals[0]:>8.2f} "
+        f"{totals[1]:>9.2f} {totals[2]:>10.2f} {totals[3]:>12.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import sys
+import time
+from pathlib import Path
+from typing import Sequence
+from src.parser.file_parser import FileParser
+from src.solver.flow_solver import FlowSolver
+from src.solver.time_estimator import estimate_horizon
+from src.solver.time_graph import TimeGraph
+
+MAPS_DIR = Path(__file__).resolve().parent / "maps"
+REPEATS = 5
+
+
+def route(path: Path, search: str) -> float:
+    """
+    Routes the fleet on a fresh graph with one search mode and
+    returns the seconds spent, graph construction excluded.
+    """
+    simulation = FileParser().parse(str(path))
+    solver = FlowSolver(
+        TimeGraph(simulation, estimate_horizon(simulation)),
+        simulation.nb_drones,
+        search,
+    )
+    started = time.perf_counter()
+    solver.route_drones()
+    return time.perf_counter() - started
+
+
+def main(searches: Sequence[str] = FlowSolver.SEARCH_MODES) -> None:
+    """
+    Wall time of every FlowSolver search mode on every map,
+    best of REPEATS runs, in milliseconds.
+    """
+    maps = sorted(
+        path for path in MAPS_DIR.rglob("*.txt")
+        if len(sys.argv) < 2 or sys.argv[1] in str(path)
+    )
+    print(f"{'map':<40}" + "".join(f" {search:>11}" for search in searches))
+    totals = [0.0] * len(searches)
+    for path in maps:
+        timings = [
+            min(route(path, search) for _ in range(REPEATS)) * 1000
+            for search in searches
+        ]
+        totals = [total + timing for total, timing in zip(totals, timings)]
+        name = path.relative_to(MAPS_DIR).as_posix()
+        print(f"{name:<40}" + "".join(f" {t:>11.2f}" for t in timings))
+    print(f"{'total':<40}" + "".join(f" {t:>11.2f}" for t in totals))
+
+
+if __name__ == "__main__":
+    main()
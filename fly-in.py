@@ -1,8 +1,8 @@
 import sys
 from src.parser.file_parser import FileParser
-from src.solver.time_graph import TimeGraph
-from src.solver.flow_solver import FlowSolver
-from src.solver.time_estimator import estimate_max_time
+from src.solver.horizon_planner import solve_within_horizon
+from src.solver.map_reduction import MapReduction
+from src.solver.time_estimator import NoPathError
 from src.schemas.simulation_map import SimulationMap
 from src.visualization.visual_simulation import VisualSimulation
 
@@ -22,16 +22,17 @@ def main() -> None:
 
     parser = FileParser()
     simulation: SimulationMap = parser.parse(map_file)
-    max_turns = estimate_max_time(simulation)
 
-    if max_turns < 0:
+    reduction = MapReduction(simulation)
+    for line in reduction.report():
+        print(f"[INFO] {line}", file=sys.stderr)
+
+    try:
+        solver, _ = solve_within_horizon(reduction.simulation)
+    except NoPathError:
         print("ERROR: No path exists from START to END", file=sys.stderr)
         sys.exit(1)
 
-    time_graph = TimeGraph(simulation, max_turns)
-    solver = FlowSolver(time_graph, simulation.nb_drones)
-    solver.solve_all_drones()
-
     drones = solver.get_drones()
     output_lines = solver.get_simulation_output()
 
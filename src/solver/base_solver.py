@@ -0,0 +1,155 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+from src.solver.models import TimeNode
+from src.schemas.definitions import NodeCategory, ZoneType
+from src.schemas.drone import Drone
+
+
+class BaseSolver(ABC):
+    """
+    Shared output pipeline for every routing engine.
+    Subclasses fill drone_paths with TimeNode sequences,
+    everything downstream (Drone objects, turn output) lives here.
+    """
+
+    def __init__(self, nb_drones: int) -> None:
+        self.nb_drones = nb_drones
+        self.drone_paths: Dict[int, List[TimeNode]] = {}
+        self.drones: Dict[int, Drone] = {}
+
+    @abstractmethod
+    def route_drones(self) -> List[int]:
+        """
+        Subclasses compute a path per drone, store it in
+        drone_paths, call _create_drones and return the ids of
+        the drones left without a path.
+        """
+        pass
+
+    def solve_all_drones(self) -> Dict[int, List[TimeNode]]:
+        """Routes every drone and reports the ones without a path."""
+        for drone_id in self.route_drones():
+            print(f"Drone {drone_id}: No valid path found!")
+
+        return self.drone_paths
+
+    def _create_drones(self) -> None:
+        """Creates Drone objects from solved paths."""
+        for drone_id, path in self.drone_paths.items():
+            if not path:
+                continue
+
+            start_node = path[0]
+            positions: List[Tuple[int, int, int]] = [
+                (node.time, node.hub.x, node.hub.y) for node in path
+            ]
+
+            self.drones[drone_id] = Drone(
+                drone_id=drone_id,
+                start_x=start_node.hub.x,
+                start_y=start_node.hub.y,
+                path=positions,
+            )
+
+    def _get_connection_name(self, source_name: str, target_name: str) -> str:
+        """Returns the connection name in format source-target."""
+        return f"{source_name}-{target_name}"
+
+    def _get_drone_movement_at_turn(
+        self, drone: Drone, path: List[TimeNode], turn: int
+    ) -> Optional[str]:
+        """
+        Gets the movement string for a drone at a specific turn.
+        Updates drone position as a side effect.
+        """
+        if drone.delivered:
+            return None
+
+        current_node: Optional[TimeNode] = None
+        next_node: Optional[TimeNode] = None
+
+        for i, node in enumerate(path):
+            if node.time == turn:
+                current_node = node
+                if i + 1 < len(path):
+                    next_node = path[i + 1]
+                break
+            elif node.time > turn:
+                if i > 0:
+                    prev_node = path[i - 1]
+                    if prev_node.time < turn < node.time:
+                        if node.hub.zone == ZoneType.RESTRICTED:
+                            connection = self._get_connection_name(
+                                prev_node.hub.name, node.hub.name
+                            )
+                            drone.in_flight_connection = connection
+                            drone.update_position(turn)
+                            return f"D{drone.id}-{connection}"
+                break
+
+        drone.in_flight_connection = None
+
+        if current_node is None:
+            return None
+
+        drone.update_position(turn)
+
+        if next_node and next_node.hub.name == current_node.hub.name:
+            return None
+
+        if next_node:
+            destination = next_node.hub.name
+
+            if next_node.hub.category == NodeCategory.END:
+                drone.delivered = True
+
+            if next_node.hub.zone == ZoneType.RESTRICTED:
+                connection = self._get_connection_name(
+                    current_node.hub.name, next_node.hub.name
+                )
+                return f"D{drone.id}-{connection}"
+            else:
+                return f"D{drone.id}-{destination}"
+
+        return None
+
+    def get_simulation_output(self) -> List[str]:
+        """
+        Generates the simulation output in the required format.
+        Updates drone positions during simulation.
+        Returns a list of strings, one per turn.
+        """
+        if not self.drone_paths or not self.drones:
+            return []
+
+        output_lines: List[str] = []
+
+        max_time = max(
+            path[-1].time for path in self.drone_paths.values() if path
+        )
+
+        for t in range(max_time):
+            movements: List[str] = []
+
+            for drone_id in sorted(self.drones.keys()):
+                drone = self.drones[drone_id]
+                path = self.drone_paths.get(drone_id, [])
+
+                movement = self._get_drone_movement_at_turn(drone, path, t)
+                if movement:
+                    movements.append(movement)
+
+            if movements:
+                output_lines.append(" ".join(movements))
+
+        return output_lines
+
+    def print_simulation_output(self) -> None:
+        """Prints the simulation output in the required format."""
+        output = self.get_simulation_output()
+        for line in output:
+            print(line)
+
+    def get_drones(self) -> Dict[int, Drone]:
+        """Returns the dictionary of Drone objects."""
+        return self.drones
@@ -0,0 +1,196 @@
+from __future__ import annotations
+from typing import Dict, List, Optional
+from src.schemas.definitions import ZoneType, NodeCategory
+from src.solver.models import TimeNode, TimeEdge
+from src.solver.time_graph import TimeGraph
+
+
+class BitsetSearch:
+    """
+    Reachability over the TEG with one Python int bitset per time layer.
+
+    Bit i of a layer is hub index i. The frontier advances with
+    neighbor masks precomputed from SimulationMap.connections, minus
+    the hubs that are full at the arrival turn and the targets whose
+    link is saturated at departure. Both masks are kept up to date
+    by record_path, so no per-node dict work happens during the sweep.
+    An END hub only gains drones, so once full it stays full: it is
+    kept as the first full turn rather than a bit in every later layer.
+    """
+
+    def __init__(self, time_graph: TimeGraph) -> None:
+        self.time_graph = time_graph
+        simulation = time_graph.simulation
+        hub_indexes = time_graph.hub_indexes
+        nb_hubs = len(hub_indexes)
+
+        self.one_turn: List[int] = [0] * nb_hubs
+        self.two_turns: List[int] = [0] * nb_hubs
+        self.predecessors: List[int] = [0] * nb_hubs
+        self.durations: List[int] = [1] * nb_hubs
+        self.end_bit = 0
+
+        for name, index in hub_indexes.items():
+            hub = simulation.hubs[name]
+            if hub.zone == ZoneType.RESTRICTED:
+                self.durations[index] = 2
+            if hub.category == NodeCategory.END:
+                self.end_bit |= 1 << index
+
+        for source, targets in simulation.connections.items():
+            source_index = hub_indexes.get(source)
+            if source_index is None:
+                continue
+            for target in targets:
+                target_index = hub_indexes.get(target)
+                if target_index is None:
+                    continue
+                if self.durations[target_index] == 2:
+                    self.two_turns[source_index] |= 1 << target_index
+                else:
+                    self.one_turn[source_index] |= 1 << target_index
+                self.predecessors[target_index] |= 1 << source_index
+
+        self._full: Dict[int, int] = {}
+        self._blocked: Dict[int, Dict[int, int]] = {}
+        self._end_full_from: Dict[int, int] = {}
+
+    def full_mask(self, time: int) -> int:
+        """Bitset of the hubs that cannot take one more drone at time."""
+        mask = self._full.get(time, 0)
+        for hub_index, first_full in self._end_full_from.items():
+            if time >= first_full:
+                mask |= 1 << hub_index
+        return mask
+
+    def reachable_layers(self, start_node: TimeNode) -> Optional[List[int]]:
+        """
+        Sweeps reachability layer by layer from start_node.
+        Returns the reachable hub bitset of every layer up to
+        the first one where END lights up, or None if END is
+        not reachable within the horizon.
+        """
+        max_time = self.time_graph.max_time
+        blocked = self._blocked
+        one_turn = self.one_turn
+        two_turns = self.two_turns
+        end_bit = self.end_bit
+
+        layers: List[int] = [0] * (max_time + 1)
+        layers[start_node.time] = 1 << start_node.hub_index
+
+        for time in range(start_node.time, max_time + 1):
+            frontier = layers[time]
+            if frontier & end_bit:
+                return layers[:time + 1]
+            if time == max_time:
+                break
+
+            blocked_now = blocked.get(time, {})
+            reach_one = frontier
+            reach_two = 0
+            bits = frontier
+            while bits:
+                low = bits & -bits
+                hub_index = low.bit_length() - 1
+                bits ^= low
+                mask = ~blocked_now.get(hub_index, 0)
+                reach_one |= one_turn[hub_index] & mask
+                reach_two |= two_turns[hub_index] & mask
+
+            layers[time + 1] |= reach_one & ~self.full_mask(time + 1)
+            if time + 2 <= max_time:
+                layers[time + 2] |= reach_two & ~self.full_mask(time + 2)
+
+        return None
+
+    def backtrack(self, layers: List[int]) -> List[int]:
+        """
+        Keeps, for each layer, the reachable hubs that still have a
+        static edge towards a state leading to END on the last layer.
+        Capacity is not rechecked, so this is a superset of the states
+        on optimal paths and the exact search only runs inside it.
+        """
+        arrival = len(layers) - 1
+        useful = [0] * len(layers)
+        useful[arrival] = self.end_bit & layers[arrival]
+
+        for time in range(arrival - 1, -1, -1):
+            predecessors = useful[time + 1]
+            for offset, step in ((1, 1), (2, 2)):
+                if time + offset > arrival:
+                    continue
+                bits = useful[time + offset]
+                while bits:
+                    low = bits & -bits
+                    hub_index = low.bit_length() - 1
+                    bits ^= low
+                    if self.durations[hub_index] == step:
+                        predecessors |= self.predecessors[hub_index]
+            useful[time] = layers[time] & predecessors & ~self.end_bit
+
+        return useful
+
+    def record_path(
+        self, path: List[TimeNode], edges: List[TimeEdge]
+    ) -> None:
+        """
+        Updates the full-hub and blocked-link masks after
+        a path has been written to the reservation table.
+        """
+        reservations = self.time_graph.reservations
+
+        for node in path:
+            if not node.can_enter(reservations):
+                self._full[node.time] = (
+                    self._full.get(node.time, 0) | 1 << node.hub_index
+                )
+
+        end_node = path[-1]
+        if end_node.is_end:
+            self._record_end(end_node.hub_index, end_node.time)
+
+        for edge in edges:
+            if edge.connection_id < 0:
+                continue
+            for turn in range(edge.source.time, edge.target.time):
+                if not reservations.link_has_room(
+                    edge.connection_id, turn, 1
+                ):
+                    self._block_link(
+                        edge.source.hub_index, edge.target.hub_index, turn
+                    )
+
+    def _record_end(self, hub_index: int, arrival: int) -> None:
+        """
+        Moves the first full turn of an END hub after an arrival.
+        Its occupancy only grows with time, so the turns where it is
+        full form a suffix, found by bisecting the arrival counter.
+        """
+        reservations = self.time_graph.reservations
+        low = arrival
+        high = min(
+            self._end_full_from.get(hub_index, self.time_graph.max_time + 1),
+            self.time_graph.max_time + 1,
+        )
+        while low < high:
+            middle = (low + high) // 2
+            if reservations.hub_has_room(hub_index, middle):
+                low = middle + 1
+            else:
+                high = middle
+        if low <= self.time_graph.max_time:
+            self._end_full_from[hub_index] = low
+
+    def _block_link(self, hub_a: int, hub_b: int, turn: int) -> None:
+        """
+        Marks both directions of a saturated link as unusable for
+        every departure whose traversal covers the given turn.
+        """
+        for source, target in ((hub_a, hub_b), (hub_b, hub_a)):
+            duration = self.durations[target]
+            for departure in range(turn - duration + 1, turn + 1):
+                if departure < 0:
+                    continue
+                by_source = self._blocked.setdefault(departure, {})
+                by_source[source] = by_source.get(source, 0) | 1 << target
@@ -0,0 +1,108 @@
+from __future__ import annotations
+import heapq
+from abc import ABC, abstractmethod
+from typing import Any, Generic, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class Frontier(ABC, Generic[T]):
+    """
+    Search frontier ordered by an integer primary cost (turns, or
+    turns plus an A* estimate), then by the item itself, which holds
+    the tie-breaking keys (priorities, not_start, hub index...).
+    """
+
+    @abstractmethod
+    def push(self, primary: int, item: T) -> None:
+        """Adds an item with its primary cost."""
+
+    @abstractmethod
+    def pop(self) -> Tuple[int, T]:
+        """Removes and returns the smallest (primary, item)."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of items queued."""
+
+
+class BucketQueue(Frontier[T]):
+    """
+    Monotone bucket (Dial) queue.
+
+    TEG edges last 1 or 2 turns and costs are whole turns, so a
+    search never pushes below the cost it last popped. A push to a
+    later cost appends the item to the bucket of that cost in O(1),
+    and popping walks the buckets forward, never back. The bucket
+    being read is a binary heap of items: it is heapified once, in
+    O(k) for k items, when it is reached, then pops and the pushes
+    landing in it (A* on an equal estimate) cost O(log k). The tie
+    order is the one of a global heap over (primary, item), and the
+    logarithm is over one bucket instead of the whole frontier. The
+    bucket lists are a fixed cost per search, so on searches of a
+    few hundred operations HeapQueue is as fast or faster; the
+    bucket queue pays off on large frontiers (bench_frontier.py).
+    """
+
+    def __init__(self) -> None:
+        self.buckets: List[List[Any]] = [[]]
+        self.current = 0
+        self.ready = False
+        self.size = 0
+
+    def push(self, primary: int, item: T) -> None:
+        """Adds an item; primary must not be below the last pop."""
+        if primary < self.current:
+            raise ValueError(
+                f"BucketQueue is monotone: cost {primary} pushed "
+                f"after popping {self.current}"
+            )
+        buckets = self.buckets
+        while len(buckets) <= primary:
+            buckets.append([])
+        if primary == self.current and self.ready:
+            heapq.heappush(buckets[primary], item)
+        else:
+            buckets[primary].append(item)
+        self.size += 1
+
+    def pop(self) -> Tuple[int, T]:
+        """Removes and returns the smallest (primary, item)."""
+        if self.size == 0:
+            raise IndexError("pop from an empty BucketQueue")
+        bucket = self.buckets[self.current]
+        while not bucket:
+            self.current += 1
+            self.ready = False
+            bucket = self.buckets[self.current]
+        if not self.ready:
+            heapq.heapify(bucket)
+            self.ready = True
+        self.size -= 1
+        return self.current, heapq.heappop(bucket)
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class HeapQueue(Frontier[T]):
+    """
+    The same frontier on one binary heap of (primary, item).
+    Does not need monotone costs; kept as the reference the
+    bucket queue is benchmarked against.
+    """
+
+    def __init__(self) -> None:
+        self.heap: List[Tuple[int, Any]] = []
+
+    def push(self, primary: int, item: T) -> None:
+        """Adds an item with its primary cost."""
+        heapq.heappush(self.heap, (primary, item))
+
+    def pop(self) -> Tuple[int, T]:
+        """Removes and returns the smallest (primary, item)."""
+        primary, item = heapq.heappop(self.heap)
+        return primary, item
+
+    def __len__(self) -> int:
+        return len(self.heap)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+from array import array
+from typing import Dict, List, Tuple
+from src.schemas.hubs import Hub
+from src.schemas.simulation_map import SimulationMap
+from src.schemas.definitions import ZoneType, NodeCategory
+from src.solver.models import TimeNode, ReservationTable
+
+
+class CompactTimeGraph:
+    """
+    Array-backed Time-Expanded Graph.
+
+    A node is the integer hub_index * (max_time + 1) + time, so no
+    per-(hub, turn) object is ever created. Move edges come from a
+    CSR copy of the static connections and wait edges are implicit
+    (node -> node + 1). Usage lives in a ReservationTable indexed
+    by the same hub indexes and link ids.
+    """
+
+    def __init__(self, simulation: SimulationMap, max_time: int) -> None:
+        self.simulation: SimulationMap = simulation
+        self.max_time = max_time
+        self.layer_size = max_time + 1
+
+        self.hubs: List[Hub] = [
+            hub for hub in simulation.hubs.values()
+            if hub.zone != ZoneType.BLOCKED
+        ]
+        self.hub_indexes: Dict[str, int] = {
+            hub.name: index for index, hub in enumerate(self.hubs)
+        }
+        self.hub_capacity = array("i", [hub.max_drones for hub in self.hubs])
+        self.hub_priority = array(
+            "b", [hub.zone == ZoneType.PRIORITY for hub in self.hubs]
+        )
+        self.hub_is_start = array(
+            "b", [hub.category == NodeCategory.START for hub in self.hubs]
+        )
+        self.start_index = self._find_category(NodeCategory.START)
+        self.end_index = self._find_category(NodeCategory.END)
+
+        self.offsets = array("i", [0])
+        self.targets = array("i")
+        self.durations = array("i")
+        self.link_ids = array("i")
+        self.link_capacity = array("i")
+        self._link_lookup: Dict[Tuple[int, int], int] = {}
+        self._build_csr()
+
+        self.reservations = ReservationTable(
+            list(self.hub_capacity),
+            list(self.link_capacity),
+            max_time,
+            [self.end_index] if self.end_index >= 0 else [],
+        )
+
+    def _find_category(self, category: NodeCategory) -> int:
+        """Returns the index of the first hub with the category, or -1."""
+        for index, hub in enumerate(self.hubs):
+            if hub.category == category:
+                return index
+        return -1
+
+    def _build_csr(self) -> None:
+        """
+        Flattens the static connections into CSR arrays.
+        Each undirected connection gets one link id shared by
+        both directions, as capacity is shared between them.
+        """
+        connections = self.simulation.connections
+
+        for hub in self.hubs:
+            source = self.hub_indexes[hub.name]
+            for target_name, connection in connections.get(
+                hub.name, {}
+            ).items():
+                target = self.hub_indexes.get(target_name)
+                if target is None:
+                    continue
+
+                key = (min(source, target), max(source, target))
+                link_id = self._link_lookup.get(key)
+                if link_id is None:
+                    link_id = len(self.link_capacity)
+                    self._link_lookup[key] = link_id
+                    self.link_capacity.append(connection.max_link_capacity)
+
+                target_hub = self.hubs[target]
+                duration = 2 if target_hub.zone == ZoneType.RESTRICTED else 1
+                self.targets.append(target)
+                self.durations.append(duration)
+                self.link_ids.append(link_id)
+
+            self.offsets.append(len(self.targets))
+
+    def node_id(self, hub_index: int, time: int) -> int:
+        """Returns the integer id of a (hub, time) state."""
+        return hub_index * self.layer_size + time
+
+    def hub_of(self, node: int) -> int:
+        """Returns the hub index of a node id."""
+        return node // self.layer_size
+
+    def time_of(self, node: int) -> int:
+        """Returns the time step of a node id."""
+        return node % self.layer_size
+
+    def can_enter(self, node: int) -> bool:
+        """Check if a drone can enter this node."""
+        return self.reservations.hub_has_room(
+            node // self.layer_size, node % self.layer_size
+        )
+
+    def is_link_free(self, link_id: int, time: int, duration: int) -> bool:
+        """
+        Checks if the link has room during every
+        turn of a traversal starting at time.
+        """
+        return self.reservations.link_has_room(link_id, time, duration)
+
+    def reserve_path(self, path: List[int]) -> None:
+        """Reserve all nodes and links in a path of node ids."""
+        reservations = self.reservations
+        for node in path:
+            reservations.add_hub_drone(
+                node // self.layer_size, node % self.layer_size
+            )
+
+        for source, target in zip(path, path[1:]):
+            source_hub = source // self.layer_size
+            target_hub = target // self.layer_size
+            if source_hub == target_hub:
+                continue
+
+            key = (min(source_hub, target_hub), max(source_hub, target_hub))
+            time = source % self.layer_size
+            reservations.add_link_drone(
+                self._link_lookup[key], time, target % self.layer_size - time
+            )
+
+    def to_time_nodes(self, path: List[int]) -> List[TimeNode]:
+        """Converts a path of node ids into TimeNode objects."""
+        return [
+            TimeNode(
+                self.hubs[node // self.layer_size],
+                node % self.layer_size,
+                node // self.layer_size,
+            )
+            for node in path
+        ]
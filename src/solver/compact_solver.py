@@ -0,0 +1,128 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+from src.solver.base_solver import BaseSolver
+from src.solver.bucket_queue import BucketQueue
+from src.solver.compact_graph import CompactTimeGraph
+
+
+class CompactFlowSolver(BaseSolver):
+    """
+    Runs the FlowSolver search on a CompactTimeGraph.
+    Same cost, tie-breaking and reservation rules as FlowSolver,
+    so both engines return the same paths.
+    """
+
+    def __init__(self, graph: CompactTimeGraph, nb_drones: int) -> None:
+        super().__init__(nb_drones)
+        self.graph = graph
+
+    def find_start_node(self) -> int:
+        """Returns the node id of the START hub at time=0."""
+        if self.graph.start_index < 0:
+            raise ValueError("No START node found at time=0")
+        return self.graph.node_id(self.graph.start_index, 0)
+
+    def solve_for_drone(
+        self, drone_id: int, start_node: int
+    ) -> Optional[List[int]]:
+        """
+        Finds the shortest path for a drone using modified Dijkstra
+        over node ids, ordered by (turns, -priorities).
+        """
+        graph = self.graph
+        layer_size = graph.layer_size
+        max_time = graph.max_time
+        start_hub = graph.hub_of(start_node)
+        start_priority = graph.hub_priority[start_hub]
+
+        best: Dict[int, int] = {start_node: start_priority}
+        came_from: Dict[int, int] = {}
+        pq: BucketQueue[Tuple[int, bool, int, int]] = BucketQueue()
+        pq.push(
+            0,
+            (
+                -start_priority,
+                not graph.hub_is_start[start_hub],
+                start_hub,
+                start_node,
+            ),
+        )
+        visited: set[int] = set()
+
+        while pq:
+            current_dist, (neg_priority, _, hub, current) = pq.pop()
+            if current in visited:
+                continue
+            visited.add(current)
+
+            if hub == graph.end_index:
+                return self._reconstruct_path(came_from, current)
+
+            time = current % layer_size
+            if time >= max_time:
+                continue
+
+            moves: List[Tuple[int, int]] = [(hub, 1)]
+            for k in range(graph.offsets[hub], graph.offsets[hub + 1]):
+                duration = graph.durations[k]
+                if time + duration > max_time:
+                    continue
+                if not graph.is_link_free(graph.link_ids[k], time, duration):
+                    continue
+                moves.append((graph.targets[k], duration))
+
+            for target, duration in moves:
+                neighbor = target * layer_size + time + duration
+                if neighbor in visited or not graph.can_enter(neighbor):
+                    continue
+
+                new_dist = current_dist + duration
+                new_priority = -neg_priority + graph.hub_priority[target]
+                current_best = best.get(neighbor)
+
+                if current_best is None or new_priority > current_best:
+                    best[neighbor] = new_priority
+                    came_from[neighbor] = current
+                    pq.push(
+                        new_dist,
+                        (
+                            -new_priority,
+                            not graph.hub_is_start[target],
+                            target,
+                            neighbor,
+                        ),
+                    )
+
+        return None
+
+    def _reconstruct_path(
+        self, came_from: Dict[int, int], end_node: int
+    ) -> List[int]:
+        """Reconstructs the path of node ids from start to end."""
+        path = [end_node]
+        while path[-1] in came_from:
+            path.append(came_from[path[-1]])
+        path.reverse()
+        return path
+
+    def route_drones(self) -> List[int]:
+        """
+        Solves paths for all drones sequentially,
+        respecting capacity constraints.
+        Returns the ids of the drones left without a path.
+        """
+        start_node = self.find_start_node()
+        unrouted: List[int] = []
+
+        for drone_id in range(1, self.nb_drones + 1):
+            path = self.solve_for_drone(drone_id, start_node)
+
+            if path:
+                self.graph.reserve_path(path)
+                self.drone_paths[drone_id] = self.graph.to_time_nodes(path)
+            else:
+                unrouted.append(drone_id)
+
+        self._create_drones()
+
+        return unrouted
@@ -0,0 +1,204 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+from src.schemas.simulation_map import SimulationMap
+from src.schemas.definitions import NodeCategory, ZoneType
+from src.solver.models import TimeNode
+from src.solver.time_graph import TimeGraph
+
+
+def find_interior_hubs(simulation: SimulationMap) -> Dict[str, List[str]]:
+    """
+    Returns the interior hubs of corridors, intermediate hubs with
+    exactly two non-blocked neighbors, mapped to those neighbors.
+    """
+    neighbors: Dict[str, List[str]] = {
+        name: [] for name, hub in simulation.hubs.items()
+        if hub.zone != ZoneType.BLOCKED
+    }
+    for source, targets in simulation.connections.items():
+        for target in targets:
+            if (
+                source in neighbors
+                and target in neighbors
+                and target not in neighbors[source]
+            ):
+                neighbors[source].append(target)
+
+    return {
+        name: targets for name, targets in neighbors.items()
+        if len(targets) == 2
+        and simulation.hubs[name].category == NodeCategory.INTERMEDIATE
+    }
+
+
+class CorridorSearch:
+    """
+    Exact layered sweep over the TEG with corridor hubs on move tables.
+
+    States are packed as turn * nb_hubs + hub_index. Hubs with more
+    or fewer than two neighbors are expanded through the TimeGraph
+    edges. An interior hub of a corridor only has three moves, wait
+    or step to either neighbor, so they are read from a
+    (target_index, duration, link_id) table and checked against the
+    reservations directly: no TimeNode or TimeEdge of an interior hub
+    is looked up until the path is rebuilt. Nothing is contracted:
+    waiting inside a corridor, one priority per turn spent on a
+    priority hub and stepping in and back out all change the labels,
+    so every interior state is labelled, and an eager TimeGraph still
+    builds every interior node. Labels and the predecessor tie rule
+    are the ones of FlowSolver, so paths are Dijkstra's.
+    bench_search.py compares the wall time with the other modes.
+    """
+
+    def __init__(self, time_graph: TimeGraph) -> None:
+        self.time_graph = time_graph
+        self.reservations = time_graph.reservations
+        self.expansions = 0
+        self.interior = find_interior_hubs(time_graph.simulation)
+        hub_indexes = time_graph.hub_indexes
+        hubs = time_graph.simulation.hubs
+        self.nb_hubs = max(1, len(hub_indexes))
+        self.is_interior = [name in self.interior for name in hub_indexes]
+        self.is_priority = [
+            hubs[name].zone == ZoneType.PRIORITY for name in hub_indexes
+        ]
+        self.moves: List[List[Tuple[int, int, int]]] = [
+            [(index, 1, -1)] for index in range(len(hub_indexes))
+        ]
+        for name, targets in self.interior.items():
+            for target in targets:
+                self.moves[hub_indexes[name]].append(
+                    (
+                        hub_indexes[target],
+                        2 if hubs[target].zone == ZoneType.RESTRICTED else 1,
+                        time_graph.connection_ids[
+                            (min(name, target), max(name, target))
+                        ],
+                    )
+                )
+
+    def _key(
+        self, state: int, priority: Dict[int, int]
+    ) -> Tuple[int, int, bool, int]:
+        """FlowSolver's tie key (turns, -priorities, not_start, hub)."""
+        hub_index = state % self.nb_hubs
+        return (
+            state // self.nb_hubs,
+            -priority[state],
+            hub_index != self.time_graph.start_index,
+            hub_index,
+        )
+
+    def find_path(self, start_node: TimeNode) -> Optional[List[TimeNode]]:
+        """
+        Finds the earliest arrival at END with the most priority
+        zones, sweeping one turn at a time, expanded back per hub.
+        """
+        graph = self.time_graph
+        reservations = self.reservations
+        nb_hubs = self.nb_hubs
+        hub_names = graph.hub_names
+        is_interior = self.is_interior
+        is_priority = self.is_priority
+        max_time = graph.max_time
+
+        start = start_node.time * nb_hubs + start_node.hub_index
+        priority: Dict[int, int] = {start: 1 if start_node.is_priority else 0}
+        parent: Dict[int, int] = {start: -1}
+        nodes: Dict[int, TimeNode] = {start: start_node}
+        layers: Dict[int, List[int]] = {start_node.time: [start]}
+        time = start_node.time
+
+        def offer(state: int, gained: int, current: int) -> bool:
+            """Labels state from current; True if it is new."""
+            new_priority = priority[current] + gained
+            best = priority.get(state)
+            if best is not None:
+                if new_priority < best or (
+                    new_priority == best
+                    and not self._key(current, priority)
+                    < self._key(parent[state], priority)
+                ):
+                    return False
+            priority[state] = new_priority
+            parent[state] = current
+            return best is None
+
+        while layers:
+            layer = layers.pop(time, [])
+            time += 1
+
+            ends = [
+                state for state in layer
+                if state in nodes and nodes[state].is_end
+            ]
+            if ends:
+                end = min(ends, key=lambda state: self._key(state, priority))
+                return self._reconstruct_path(parent, nodes, end)
+
+            for current in layer:
+                self.expansions += 1
+                hub_index = current % nb_hubs
+                turn = current // nb_hubs
+
+                if not is_interior[hub_index]:
+                    for edge in graph.get_edges(nodes[current]):
+                        neighbor = edge.target
+                        if not edge.is_traversable(reservations):
+                            continue
+                        if not neighbor.can_enter(reservations):
+                            continue
+                        state = neighbor.time * nb_hubs + neighbor.hub_index
+                        if offer(state, neighbor.is_priority, current):
+                            if not is_interior[neighbor.hub_index]:
+                                nodes[state] = neighbor
+                            layers.setdefault(neighbor.time, []).append(state)
+                    continue
+
+                for target, duration, link_id in self.moves[hub_index]:
+                    arrival = turn + duration
+                    if arrival > max_time:
+                        continue
+                    if not graph.has_node(hub_names[target], arrival):
+                        continue
+                    if link_id >= 0 and not reservations.link_has_room(
+                        link_id, turn, duration
+                    ):
+                        continue
+                    if not reservations.hub_has_room(target, arrival):
+                        continue
+                    state = arrival * nb_hubs + target
+                    if offer(state, is_priority[target], current):
+                        if not is_interior[target]:
+                            node = graph.get_node(hub_names[target], arrival)
+                            if node is not None:
+                                nodes[state] = node
+                        layers.setdefault(arrival, []).append(state)
+
+        return None
+
+    def _reconstruct_path(
+        self,
+        parent: Dict[int, int],
+        nodes: Dict[int, TimeNode],
+        end: int,
+    ) -> List[TimeNode]:
+        """
+        Rebuilds the path from the packed states, creating the
+        TimeNodes of the interior hubs it crosses.
+        """
+        graph = self.time_graph
+        path: List[TimeNode] = []
+        state = end
+        while state >= 0:
+            node = nodes.get(state)
+            if node is None:
+                node = graph.get_node(
+                    graph.hub_names[state % self.nb_hubs],
+                    state // self.nb_hubs,
+                )
+            if node is not None:
+                path.append(node)
+            state = parent[state]
+        path.reverse()
+        return path
@@ -1,135 +1,388 @@
 from __future__ import annotations
-import heapq
-from typing import Dict, List, Optional, Tuple
-from src.solver.models import TimeNode, TimeEdge, EdgeTracker
+from typing import Any, Dict, List, Optional, Tuple, Type
+from src.solver.base_solver import BaseSolver
+from src.solver.bitset_search import BitsetSearch
+from src.solver.bucket_queue import BucketQueue, Frontier
+from src.solver.corridor_search import CorridorSearch
+from src.solver.incremental_search import IncrementalSearch
+from src.solver.models import TimeNode, TimeEdge
+from src.solver.path_templates import PathTemplates, map_hash
+from src.solver.search_workspace import SearchWorkspace
 from src.solver.time_graph import TimeGraph
+from src.solver.time_estimator import (
+    distances_to_end,
+    estimate_min_path_length,
+    max_priority_by_arrival,
+)
+from src.schemas.simulation_map import SimulationMap
 from src.schemas.definitions import NodeCategory, ZoneType
-from src.schemas.drone import Drone
 
 
-class FlowSolver:
+class FlowSolver(BaseSolver):
     """
     Solves the multi-drone routing problem
-    using Dijkstra with capacity constraints.
-    Uses a pre-built TimeGraph with adjacency dictionary.
+    using Dijkstra (or A*, a layered, bitset or incremental sweep,
+    or a sweep reading corridor hubs from move tables) with capacity
+    constraints.
+    Reads edges through TimeGraph.get_edges, so eager
+    and lazy graphs are interchangeable.
     """
 
-    def __init__(self, time_graph: TimeGraph, nb_drones: int) -> None:
+    SEARCH_MODES = (
+        "dijkstra", "astar", "layered", "bitset", "incremental", "corridor"
+    )
+
+    def __init__(
+        self,
+        time_graph: TimeGraph,
+        nb_drones: int,
+        search: str = "dijkstra",
+        max_horizon: Optional[int] = None,
+        convoy: int = 0,
+        bulk: bool = False,
+        templates: Optional[PathTemplates] = None,
+    ) -> None:
+        if search not in self.SEARCH_MODES:
+            raise ValueError(
+                f"Unknown search mode '{search}'. "
+                f"Allowed: {self.SEARCH_MODES}"
+            )
+        if templates is not None and templates.key != map_hash(
+            time_graph.simulation
+        ):
+            raise ValueError("Path templates were built for another map")
+        super().__init__(nb_drones)
         self.time_graph = time_graph
-        self.nb_drones = nb_drones
-        self.tracker = EdgeTracker()
-        self.drone_paths: Dict[int, List[TimeNode]] = {}
-        self.drones: Dict[int, Drone] = {}
+        self.reservations = time_graph.reservations
+        self.search = search
+        self.expansions = 0
+        self.extensions = 0
+        self.max_horizon = max(
+            time_graph.max_time,
+            max_horizon
+            if max_horizon is not None
+            else nb_drones
+            * estimate_min_path_length(time_graph.simulation),
+        )
+        self._heuristic = self._build_heuristic()
+        self._workspace = SearchWorkspace(
+            len(time_graph.hub_indexes), time_graph.max_time
+        )
+        self._found: Optional[Tuple[List[TimeNode], List[TimeEdge]]] = None
+        self.frontier: Type[Frontier[Any]] = BucketQueue
+        self._bitset: Optional[BitsetSearch] = (
+            BitsetSearch(time_graph)
+            if search == "bitset" or convoy > 0
+            else None
+        )
+        self.convoy = convoy
+        self.bulk = bulk
+        self.groups = 0
+        self.convoy_hits = 0
+        self._recent_paths: List[List[TimeNode]] = []
+        self._priority_bounds: List[int] = []
+        self.templates = templates
+        self.template_hits = 0
+        self._incremental: Optional[IncrementalSearch] = (
+            IncrementalSearch(time_graph, self._precedes)
+            if search == "incremental"
+            else None
+        )
+        self._corridor: Optional[CorridorSearch] = (
+            CorridorSearch(time_graph)
+            if search == "corridor"
+            else None
+        )
 
     def _get_edge(
         self, source: TimeNode, target: TimeNode
     ) -> Optional[TimeEdge]:
         """Get the edge between two nodes."""
-        for edge in self.time_graph.adjacency.get(source, []):
+        for edge in self.time_graph.get_edges(source):
             if edge.target == target:
                 return edge
         return None
 
     def find_start_node(self) -> TimeNode:
         """Returns the TimeNode at time=0 that is the START hub."""
-        for node in self.time_graph.nodes:
-            if node.time == 0 and node.hub.category == NodeCategory.START:
+        graph = self.time_graph
+        if graph.start_index >= 0:
+            node = graph.get_node(graph.hub_names[graph.start_index], 0)
+            if node is not None:
                 return node
         raise ValueError("No START node found at time=0")
 
+    def _build_heuristic(self) -> Dict[int, int]:
+        """
+        Returns the lower bound on turns left to END for every hub index.
+        A* uses the exact static distance, other modes use 0.
+        Hubs that cannot reach END are left out.
+        """
+        hub_indexes = self.time_graph.hub_indexes
+        if self.search != "astar":
+            return {index: 0 for index in hub_indexes.values()}
+
+        distances = distances_to_end(self.time_graph.simulation)
+        return {
+            hub_indexes[name]: distance
+            for name, distance in distances.items()
+            if name in hub_indexes
+        }
+
+    def _precedes(
+        self,
+        node: TimeNode,
+        other: TimeNode,
+        best: Dict[TimeNode, Tuple[int, int]],
+    ) -> bool:
+        """
+        Returns True if node is popped before other by Dijkstra,
+        i.e. (turns, -priorities, not_start, hub_index) is smaller.
+        Used to pick the same predecessor whatever the pop order.
+        """
+        return (
+            node.time,
+            -best[node][1],
+            node.hub.category != NodeCategory.START,
+            node.hub_index,
+        ) < (
+            other.time,
+            -best[other][1],
+            other.hub.category != NodeCategory.START,
+            other.hub_index,
+        )
+
     def solve_for_drone(
         self, drone_id: int, start_node: TimeNode
     ) -> Optional[List[TimeNode]]:
         """
-        Finds the shortest path for a drone using modified Dijkstra.
+        Finds the best path for a drone with the configured search mode.
+        Every mode minimizes turns first and maximizes priority zones
+        second, with the same tie-breaking, so they return equal paths.
+        """
+        if self.search == "layered":
+            return self._layered_search(start_node)
+        if self.search == "bitset" and self._bitset is not None:
+            return self._bitset_search(start_node, self._bitset)
+        if self._incremental is not None:
+            expansions = self._incremental.expansions
+            path = self._incremental.find_path(start_node)
+            self.expansions += self._incremental.expansions - expansions
+            return path
+        if self._corridor is not None:
+            expansions = self._corridor.expansions
+            path = self._corridor.find_path(start_node)
+            self.expansions += self._corridor.expansions - expansions
+            return path
+        return self._heap_search(start_node)
+
+    def _bitset_search(
+        self, start_node: TimeNode, bitset: BitsetSearch
+    ) -> Optional[List[TimeNode]]:
+        """
+        Finds the earliest END layer with bitset reachability, then runs
+        the layered search only over the states that can still lead to it.
+        The pruned states cannot be on any path to END at that layer,
+        so labels and ties, hence paths, match Dijkstra.
+        """
+        layers = bitset.reachable_layers(start_node)
+        if layers is None:
+            return None
+        return self._layered_search(start_node, bitset.backtrack(layers))
+
+    def _layered_search(
+        self, start_node: TimeNode, allowed: Optional[List[int]] = None
+    ) -> Optional[List[TimeNode]]:
+        """
+        Sweeps the TEG one time layer at a time.
+
+        Every edge goes strictly forward in time, so the TEG is a DAG
+        ordered by turn: once the sweep reaches layer t, every label in
+        it is final. Labels only carry priorities, since the turns of a
+        node are its layer. The first layer holding END is the optimum.
+
+        If allowed is given, it holds one hub bitset per layer and
+        neighbors outside of it (or past its last layer) are skipped.
+        """
+        start_priority = 1 if start_node.hub.zone == ZoneType.PRIORITY else 0
+
+        best: Dict[TimeNode, Tuple[int, int]] = {
+            start_node: (start_node.time, start_priority)
+        }
+        came_from: Dict[TimeNode, Optional[TimeEdge]] = {start_node: None}
+        layers: Dict[int, List[TimeNode]] = {start_node.time: [start_node]}
+        time = start_node.time
+
+        while layers:
+            layer = layers.pop(time, [])
+            time += 1
+
+            for current_node in layer:
+                if current_node.hub.category == NodeCategory.END:
+                    return self._reconstruct_path(came_from, current_node)
+
+            for current_node in layer:
+                self.expansions += 1
+                current_priority = best[current_node][1]
+
+                for edge in self.time_graph.get_edges(current_node):
+                    neighbor = edge.target
+
+                    if allowed is not None and (
+                        neighbor.time >= len(allowed)
+                        or not allowed[neighbor.time] >> neighbor.hub_index & 1
+                    ):
+                        continue
+
+                    if not edge.is_traversable(self.reservations):
+                        continue
+
+                    if not neighbor.can_enter(self.reservations):
+                        continue
+
+                    new_priority = current_priority + (
+                        1 if neighbor.hub.zone == ZoneType.PRIORITY else 0
+                    )
+                    current_best = best.get(neighbor)
+
+                    if current_best is None:
+                        layers.setdefault(neighbor.time, []).append(neighbor)
+                    elif new_priority < current_best[1]:
+                        continue
+                    elif new_priority == current_best[1]:
+                        previous = came_from[neighbor]
+                        if previous is None or not self._precedes(
+                            current_node, previous.source, best
+                        ):
+                            continue
+
+                    best[neighbor] = (neighbor.time, new_priority)
+                    came_from[neighbor] = edge
+
+        return None
+
+    def _heap_search(
+        self, start_node: TimeNode
+    ) -> Optional[List[TimeNode]]:
+        """
+        Finds the shortest path for a drone using modified Dijkstra,
+        or A* when search is "astar".
 
         Uses tuple (turns, -priorities) for comparison:
         - Primary: minimize turns (time to reach destination)
         - Secondary: maximize priorities (prefer paths through priority zones)
 
         At equal turns, the path with more priority zones is selected.
+        Remaining ties are broken by hub index so runs are reproducible.
+
+        A* orders the queue by turns + static distance to END first.
+        Every predecessor of a node is still expanded before it, so
+        labels and tie-breaking, hence paths, match Dijkstra.
+        The queue is a frontier (BucketQueue unless replaced) keyed
+        by that integer cost.
         """
-        start_priority = 1 if start_node.hub.zone == ZoneType.PRIORITY else 0
+        heuristic = self._heuristic
+        start_estimate = heuristic.get(start_node.hub_index)
+        if start_estimate is None:
+            return None
 
-        best: Dict[TimeNode, Tuple[int, int]] = {
-            start_node: (0, start_priority)
-        }
-        came_from: Dict[TimeNode, Optional[TimeNode]] = {start_node: None}
-        pq: List[Tuple[Tuple[int, int], bool, int, TimeNode]] = [
-            (
-                (0, -start_priority),
-                start_node.hub.category != NodeCategory.START,
-                id(start_node),
-                start_node,
-            )
-        ]
-        visited: set[TimeNode] = set()
+        graph = self.time_graph
+        workspace = self._workspace
+        workspace.reset(graph.max_time, start_node.time)
+        start_order = workspace.label(
+            start_node,
+            1 if start_node.hub.zone == ZoneType.PRIORITY else 0,
+            None,
+        )
+        pq: Frontier[int] = self.frontier()
+        pq.push(start_estimate, start_order)
 
         while pq:
-            (current_dist, neg_priority), _, _, current_node = heapq.heappop(
-                pq
-            )
-            current_priority = -neg_priority
-
-            if current_node in visited:
+            current_id = workspace.node_of(pq.pop()[1])
+            if workspace.is_closed(current_id):
+                continue
+            workspace.close(current_id)
+            self.expansions += 1
+            current_node = workspace.nodes[current_id]
+            if current_node is None:
                 continue
-            visited.add(current_node)
 
             if current_node.hub.category == NodeCategory.END:
-                path = self._reconstruct_path(came_from, current_node)
+                path = workspace.path(current_id)
+                self._found = (path, workspace.path_edges(current_id))
                 return path
 
-            for edge in self.time_graph.adjacency.get(current_node, []):
+            current_priority = workspace.priority[current_id]
+            current_order = workspace.order[current_id]
+            for edge in graph.get_edges(current_node):
                 neighbor = edge.target
+                neighbor_id = workspace.node_id(
+                    neighbor.hub_index, neighbor.time
+                )
+                labelled = workspace.is_labelled(neighbor_id)
 
-                if neighbor in visited:
+                if labelled and workspace.is_closed(neighbor_id):
                     continue
 
-                if not edge.is_traversable(self.tracker):
+                estimate = heuristic.get(neighbor.hub_index)
+                if estimate is None:
                     continue
 
-                if not neighbor.can_enter():
+                if not edge.is_traversable(self.reservations):
                     continue
 
-                new_dist = current_dist + edge.duration
-                neighbor_priority = (
+                if not neighbor.can_enter(self.reservations):
+                    continue
+
+                new_priority = current_priority + (
                     1 if neighbor.hub.zone == ZoneType.PRIORITY else 0
                 )
-                new_priority = current_priority + neighbor_priority
-                not_start = neighbor.hub.category != NodeCategory.START
-
-                current_best = best.get(neighbor)
-                new_cost = (new_dist, -new_priority)
-                best_cost = (
-                    (current_best[0], -current_best[1])
-                    if current_best
-                    else None
-                )
-
-                if best_cost is None or new_cost < best_cost:
-                    best[neighbor] = (new_dist, new_priority)
-                    came_from[neighbor] = current_node
-                    heapq.heappush(
-                        pq,
-                        (new_cost, not_start, id(neighbor), neighbor),
-                    )
+                if labelled:
+                    best_priority = workspace.priority[neighbor_id]
+                    if new_priority < best_priority:
+                        continue
+                    if new_priority == best_priority:
+                        # same label: keep the predecessor popped first
+                        previous = workspace.parent[neighbor_id]
+                        if (
+                            previous >= 0
+                            and current_order < workspace.order[previous]
+                        ):
+                            workspace.relink(neighbor_id, edge)
+                        continue
+
+                order = workspace.label(neighbor, new_priority, edge)
+                pq.push(neighbor.time - start_node.time + estimate, order)
 
         return None
 
     def _reconstruct_path(
-        self, came_from: Dict[TimeNode, Optional[TimeNode]], end_node: TimeNode
+        self, came_from: Dict[TimeNode, Optional[TimeEdge]], end_node: TimeNode
     ) -> List[TimeNode]:
-        """Reconstructs the path from start to end."""
-        path = []
-        current: Optional[TimeNode] = end_node
-        while current is not None:
-            path.append(current)
-            current = came_from.get(current)
+        """
+        Reconstructs the path from start to end through the recorded
+        edges, which are kept for _get_path_edges.
+        """
+        path = [end_node]
+        edges: List[TimeEdge] = []
+        edge = came_from.get(end_node)
+        while edge is not None:
+            edges.append(edge)
+            path.append(edge.source)
+            edge = came_from.get(edge.source)
         path.reverse()
+        edges.reverse()
+        self._found = (path, edges)
         return path
 
     def _get_path_edges(self, path: List[TimeNode]) -> List[TimeEdge]:
-        """Get all edges used in a path."""
+        """
+        Get all edges used in a path. The edges of the last path
+        found by a search are already known; other paths (templates,
+        other engines) are matched against the adjacency.
+        """
+        if self._found is not None and self._found[0] is path:
+            return self._found[1]
         edges = []
         for i in range(len(path) - 1):
             edge = self._get_edge(path[i], path[i + 1])
@@ -137,160 +390,332 @@ class FlowSolver:
                 edges.append(edge)
         return edges
 
-    def _reserve_path(self, path: List[TimeNode]) -> None:
-        """Reserve all nodes and edges in a path."""
+    def _reserve_path(self, path: List[TimeNode], count: int = 1) -> None:
+        """Reserve all nodes and edges in a path for count drones."""
         edges = self._get_path_edges(path)
 
         for edge in edges:
-            edge.use_edge(self.tracker)
+            edge.use_edge(self.reservations, count)
 
         for node in path:
-            node.add_drone()
-
-        end_node = path[-1]
-        if end_node.hub.category == NodeCategory.END:
-            for t in range(end_node.time + 1, self.time_graph.max_time + 1):
-                future_end = self.time_graph.get_node(end_node.hub.name, t)
-                if future_end:
-                    future_end.add_drone()
-
-    def _create_drones(self) -> None:
-        """Creates Drone objects from solved paths."""
-        for drone_id, path in self.drone_paths.items():
-            if not path:
-                continue
+            node.add_drone(self.reservations, count)
 
-            start_node = path[0]
-            positions: List[Tuple[int, int, int]] = [
-                (node.time, node.hub.x, node.hub.y) for node in path
-            ]
+        if self._bitset is not None:
+            self._bitset.record_path(path, edges)
+        if self._incremental is not None:
+            self._incremental.record_path(path, edges)
 
-            self.drones[drone_id] = Drone(
-                drone_id=drone_id,
-                start_x=start_node.hub.x,
-                start_y=start_node.hub.y,
-                path=positions,
-            )
+    def _solve_growing(
+        self, drone_id: int, start_node: TimeNode
+    ) -> Optional[List[TimeNode]]:
+        """
+        Searches a path for a drone, appending time layers to the
+        graph while END is out of reach. Reserved paths are kept.
+        The horizon never grows past max_horizon, by default the
+        turns needed when drones leave START one after the other.
+        """
+        path = self.solve_for_drone(drone_id, start_node)
+
+        while path is None and self._grow_horizon():
+            path = self.solve_for_drone(drone_id, start_node)
+
+        return path
+
+    def _grow_horizon(self) -> bool:
+        """
+        Appends a quarter more time layers, up to max_horizon.
+        Returns False when the horizon cannot grow anymore.
+        """
+        max_time = self.time_graph.max_time
+        if max_time >= self.max_horizon:
+            return False
+        self.time_graph.extend_horizon(
+            min(self.max_horizon, max_time + max(1, max_time // 4))
+        )
+        self.extensions += 1
+        return True
 
-    def solve_all_drones(self) -> Dict[int, List[TimeNode]]:
+    def _widest_search(
+        self, start_node: TimeNode
+    ) -> Optional[Tuple[List[TimeNode], int]]:
+        """
+        Layered sweep returning an earliest-arrival path with the most
+        priority zones and, among those, the largest bottleneck room,
+        i.e. how many more drones every node and link of it can take.
+        Returns (path, room), or None if END is out of reach.
+
+        START and END are sized for the whole fleet, so they never
+        narrow the group below the drones still to route.
+        """
+        start_priority = 1 if start_node.hub.zone == ZoneType.PRIORITY else 0
+
+        best: Dict[TimeNode, Tuple[int, int]] = {
+            start_node: (start_node.time, start_priority)
+        }
+        width: Dict[TimeNode, int] = {
+            start_node: start_node.room(self.reservations)
+        }
+        came_from: Dict[TimeNode, Optional[TimeEdge]] = {start_node: None}
+        layers: Dict[int, List[TimeNode]] = {start_node.time: [start_node]}
+        time = start_node.time
+
+        while layers:
+            layer = layers.pop(time, [])
+            time += 1
+
+            for current_node in layer:
+                if current_node.hub.category == NodeCategory.END:
+                    path = self._reconstruct_path(came_from, current_node)
+                    return path, width[current_node]
+
+            for current_node in layer:
+                self.expansions += 1
+                current_priority = best[current_node][1]
+
+                for edge in self.time_graph.get_edges(current_node):
+                    neighbor = edge.target
+                    room = edge.room(self.reservations)
+                    if room <= 0:
+                        continue
+
+                    new_priority = current_priority + (
+                        1 if neighbor.hub.zone == ZoneType.PRIORITY else 0
+                    )
+                    new_width = min(width[current_node], room)
+                    current_best = best.get(neighbor)
+
+                    if current_best is None:
+                        layers.setdefault(neighbor.time, []).append(neighbor)
+                    else:
+                        new_label = (new_priority, new_width)
+                        old_label = (current_best[1], width[neighbor])
+                        if new_label < old_label:
+                            continue
+                        if new_label == old_label:
+                            previous = came_from[neighbor]
+                            if previous is None or not self._precedes(
+                                current_node, previous.source, best
+                            ):
+                                continue
+
+                    best[neighbor] = (neighbor.time, new_priority)
+                    width[neighbor] = new_width
+                    came_from[neighbor] = edge
+
+        return None
+
+    def _route_groups(self, start_node: TimeNode) -> List[int]:
+        """
+        Bulk routing: each widest search serves as many of the
+        remaining drones as its path has room for, and the path is
+        reserved for all of them in one update.
+        Returns the ids of the drones left without a path.
+        """
+        drone_id = 1
+        while drone_id <= self.nb_drones:
+            found = self._widest_search(start_node)
+            while found is None and self._grow_horizon():
+                found = self._widest_search(start_node)
+            if found is None:
+                return list(range(drone_id, self.nb_drones + 1))
+
+            path, room = found
+            group = min(room, self.nb_drones - drone_id + 1)
+            for member in range(drone_id, drone_id + group):
+                self.drone_paths[member] = path
+            self._reserve_path(path, group)
+            self.groups += 1
+            drone_id += group
+
+        return []
+
+    def route_drones(self) -> List[int]:
         """
         Solves paths for all drones sequentially,
         respecting capacity constraints.
+        Returns the ids of the drones left without a path.
         """
         start_node = self.find_start_node()
+        if self.bulk:
+            grouped = self._route_groups(start_node)
+            self._create_drones()
+            return grouped
 
+        unrouted: List[int] = []
         for drone_id in range(1, self.nb_drones + 1):
-            path = self.solve_for_drone(drone_id, start_node)
+            path = self._convoy_path(start_node) if self.convoy else None
+            if path is not None:
+                self.convoy_hits += 1
+            elif self.templates is not None:
+                path = self._template_path(start_node, self.templates)
+                if path is not None:
+                    self.template_hits += 1
+            if path is None:
+                path = self._solve_growing(drone_id, start_node)
 
             if path:
                 self.drone_paths[drone_id] = path
                 self._reserve_path(path)
+                self._recent_paths = (
+                    [path] + self._recent_paths
+                )[:self.convoy]
             else:
-                print(f"Drone {drone_id}: No valid path found!")
+                unrouted.append(drone_id)
 
         self._create_drones()
 
-        return self.drone_paths
+        return unrouted
 
-    def _get_connection_name(self, source_name: str, target_name: str) -> str:
-        """Returns the connection name in format source-target."""
-        return f"{source_name}-{target_name}"
+    def convoy_hit_ratio(self) -> float:
+        """Fraction of routed drones served by a shifted recent path."""
+        if not self.drone_paths:
+            return 0.0
+        return self.convoy_hits / len(self.drone_paths)
 
-    def _get_drone_movement_at_turn(
-        self, drone: Drone, path: List[TimeNode], turn: int
-    ) -> Optional[str]:
+    def _convoy_path(self, start_node: TimeNode) -> Optional[List[TimeNode]]:
         """
-        Gets the movement string for a drone at a specific turn.
-        Updates drone position as a side effect.
+        Tries the recent paths, delayed by waiting at START, so that
+        they reach END at the earliest feasible arrival. A shifted path
+        is only used when it is provably optimal: its arrival is the
+        bitset reachability bound and its priority count reaches the
+        capacity-free bound for that arrival.
         """
-        if drone.delivered:
+        if not self._recent_paths or self._bitset is None:
             return None
 
-        current_node: Optional[TimeNode] = None
-        next_node: Optional[TimeNode] = None
-
-        for i, node in enumerate(path):
-            if node.time == turn:
-                current_node = node
-                if i + 1 < len(path):
-                    next_node = path[i + 1]
-                break
-            elif node.time > turn:
-                if i > 0:
-                    prev_node = path[i - 1]
-                    if prev_node.time < turn < node.time:
-                        if node.hub.zone == ZoneType.RESTRICTED:
-                            connection = self._get_connection_name(
-                                prev_node.hub.name, node.hub.name
-                            )
-                            drone.in_flight_connection = connection
-                            drone.update_position(turn)
-                            return f"D{drone.id}-{connection}"
-                break
-
-        drone.in_flight_connection = None
-
-        if current_node is None:
+        layers = self._bitset.reachable_layers(start_node)
+        if layers is None:
             return None
+        arrival = len(layers) - 1
 
-        drone.update_position(turn)
-
-        if next_node and next_node.hub.name == current_node.hub.name:
-            return None
-
-        if next_node:
-            destination = next_node.hub.name
-
-            if next_node.hub.category == NodeCategory.END:
-                drone.delivered = True
-
-            if next_node.hub.zone == ZoneType.RESTRICTED:
-                connection = self._get_connection_name(
-                    current_node.hub.name, next_node.hub.name
-                )
-                return f"D{drone.id}-{connection}"
-            else:
-                return f"D{drone.id}-{destination}"
+        if len(self._priority_bounds) != self.time_graph.max_time + 1:
+            self._priority_bounds = max_priority_by_arrival(
+                self.time_graph.simulation, self.time_graph.max_time
+            )
+        priority_bound = self._priority_bounds[arrival]
 
+        for recent in self._recent_paths:
+            delay = arrival - recent[-1].time
+            if delay < 0:
+                continue
+            path = self._shift_path(start_node, recent, delay)
+            if (
+                path is not None
+                and sum(node.is_priority for node in path) >= priority_bound
+            ):
+                return path
         return None
 
-    def get_simulation_output(self) -> List[str]:
+    def _shift_path(
+        self, start_node: TimeNode, path: List[TimeNode], delay: int
+    ) -> Optional[List[TimeNode]]:
         """
-        Generates the simulation output in the required format.
-        Updates drone positions during simulation.
-        Returns a list of strings, one per turn.
+        Returns path delayed by delay turns of waiting at START,
+        or None if any node or link of it is out of capacity.
+        One pass over the path.
         """
-        if not self.drone_paths or not self.drones:
-            return []
-
-        output_lines: List[str] = []
-
-        max_time = max(
-            path[-1].time for path in self.drone_paths.values() if path
-        )
-
-        for t in range(max_time):
-            movements: List[str] = []
-
-            for drone_id in sorted(self.drones.keys()):
-                drone = self.drones[drone_id]
-                path = self.drone_paths.get(drone_id, [])
-
-                movement = self._get_drone_movement_at_turn(drone, path, t)
-                if movement:
-                    movements.append(movement)
-
-            if movements:
-                output_lines.append(" ".join(movements))
+        shifted: List[TimeNode] = []
+        for time in range(start_node.time, start_node.time + delay):
+            node = self.time_graph.get_node(start_node.hub.name, time)
+            if node is None:
+                return None
+            shifted.append(node)
+        for original in path:
+            node = self.time_graph.get_node(
+                original.hub.name, original.time + delay
+            )
+            if node is None:
+                return None
+            shifted.append(node)
+
+        previous: Optional[TimeNode] = None
+        for node in shifted:
+            if not node.can_enter(self.reservations):
+                return None
+            if previous is not None:
+                edge = self._get_edge(previous, node)
+                if edge is None or not edge.is_traversable(self.reservations):
+                    return None
+            previous = node
+        return shifted
+
+    def _template_path(
+        self, start_node: TimeNode, templates: PathTemplates
+    ) -> Optional[List[TimeNode]]:
+        """
+        Places the drone on the static route that reaches END first
+        once delayed by its earliest feasible wait at START (then most
+        priority zones, then template rank), or None if no route fits
+        within the horizon. Unlike a search this never waits on the
+        way, so the arrival may be later than the TEG optimum: it
+        trades path quality for one pass per tried shift.
+        """
+        hub_names = list(self.time_graph.hub_indexes)
+        best: Optional[Tuple[int, int, List[TimeNode]]] = None
 
-        return output_lines
+        for route in templates.routes:
+            if route[0] != start_node.hub_index:
+                continue
+            offsets = templates.offsets(route)
+            names = [hub_names[hub] for hub in route]
+            delay = 0
+            while start_node.time + delay + offsets[-1] <= (
+                self.time_graph.max_time
+            ):
+                arrival = start_node.time + delay + offsets[-1]
+                if best is not None and arrival > best[0]:
+                    break
+                path = self._place_route(start_node, names, offsets, delay)
+                if path is not None:
+                    priority = sum(node.is_priority for node in path)
+                    if best is None or (arrival, -priority) < best[:2]:
+                        best = (arrival, -priority, path)
+                    break
+                delay += 1
+
+        return best[2] if best is not None else None
+
+    def _place_route(
+        self,
+        start_node: TimeNode,
+        names: List[str],
+        offsets: List[int],
+        delay: int,
+    ) -> Optional[List[TimeNode]]:
+        """
+        Returns the static route reached at start_node.time + delay +
+        offsets, after waiting delay turns at START, or None if any
+        node or link of it is out of capacity.
+        """
+        path: List[TimeNode] = []
+        previous: Optional[TimeNode] = None
+        stops = [start_node.hub.name] * delay + names
+        times = list(range(start_node.time, start_node.time + delay)) + [
+            start_node.time + delay + offset for offset in offsets
+        ]
+        for name, time in zip(stops, times):
+            node = self.time_graph.get_node(name, time)
+            if node is None or not node.can_enter(self.reservations):
+                return None
+            if previous is not None:
+                edge = self._get_edge(previous, node)
+                if edge is None or not edge.is_traversable(self.reservations):
+                    return None
+            path.append(node)
+            previous = node
+        return path
 
-    def print_simulation_output(self) -> None:
-        """Prints the simulation output in the required format."""
-        output = self.get_simulation_output()
-        for line in output:
-            print(line)
 
-    def get_drones(self) -> Dict[int, Drone]:
-        """Returns the dictionary of Drone objects."""
-        return self.drones
+def count_saved_expansions(simulation: SimulationMap, max_time: int) -> int:
+    """
+    Routes the fleet twice on fresh graphs, with Dijkstra and with A*,
+    and returns how many node expansions A* avoided.
+    """
+    expansions: Dict[str, int] = {}
+    for search in ("dijkstra", "astar"):
+        solver = FlowSolver(
+            TimeGraph(simulation, max_time), simulation.nb_drones, search
+        )
+        solver.solve_all_drones()
+        expansions[search] = solver.expansions
+    return expansions["dijkstra"] - expansions["astar"]
@@ -0,0 +1,249 @@
+from __future__ import annotations
+import math
+from typing import Dict, List, Set, Tuple
+from src.schemas.simulation_map import SimulationMap
+from src.schemas.definitions import NodeCategory, ZoneType
+from src.solver.bucket_queue import BucketQueue
+from src.solver.flow_solver import FlowSolver
+from src.solver.time_estimator import NoPathError, estimate_horizon
+from src.solver.time_graph import TimeGraph
+
+Arcs = Dict[str, List[Tuple[str, int]]]
+
+
+def _shortest(arcs: Arcs, sources: List[str]) -> Dict[str, int]:
+    """
+    Dijkstra over weighted arcs from every source. Weights are
+    whole turns, so a BucketQueue indexed by cost is the frontier.
+    """
+    distances: Dict[str, int] = {}
+    queue: BucketQueue[str] = BucketQueue()
+    for source in sources:
+        queue.push(0, source)
+    while queue:
+        cost, current = queue.pop()
+        if current in distances:
+            continue
+        distances[current] = cost
+        for target, weight in arcs.get(current, []):
+            if target not in distances:
+                queue.push(cost + weight, target)
+    return distances
+
+
+class HierarchicalPlanner:
+    """
+    Two-level static planning for maps too large for a flat TEG.
+
+    Hubs are cut into clusters of about cluster_size hubs: a grid
+    over the coordinates, each cell then split into its connected
+    parts. Hubs linked to another cluster are boundary hubs. Inside
+    every cluster the travel times between its boundary hubs (and
+    START / END) are precomputed, which gives an abstract graph of
+    boundary hubs only. Entering a restricted hub costs 2 turns.
+
+    The fleet is planned on that graph: every cluster holding a
+    boundary hub within slack turns of the best START-END route is
+    kept, and the TEG is only built over those clusters (submap).
+    """
+
+    def __init__(
+        self,
+        simulation: SimulationMap,
+        cluster_size: int = 64,
+        slack: int = 2,
+    ) -> None:
+        if cluster_size < 1:
+            raise ValueError(
+                f"cluster_size must be at least 1, got {cluster_size}"
+            )
+        self.simulation = simulation
+        self.cluster_size = cluster_size
+        self.slack = slack
+        self.hubs = {
+            name: hub for name, hub in simulation.hubs.items()
+            if hub.zone != ZoneType.BLOCKED
+        }
+        self.durations = {
+            name: 2 if hub.zone == ZoneType.RESTRICTED else 1
+            for name, hub in self.hubs.items()
+        }
+        self.neighbors: Dict[str, List[str]] = {
+            name: [
+                target
+                for target in simulation.connections.get(name, {})
+                if target in self.hubs
+            ]
+            for name in self.hubs
+        }
+        self.clusters: List[List[str]] = self._partition()
+        self.cluster_of: Dict[str, int] = {
+            name: index
+            for index, members in enumerate(self.clusters)
+            for name in members
+        }
+        self.boundary: Set[str] = {
+            name for name, targets in self.neighbors.items()
+            if any(
+                self.cluster_of[target] != self.cluster_of[name]
+                for target in targets
+            )
+            or self.hubs[name].category != NodeCategory.INTERMEDIATE
+        }
+        self.arcs: Arcs = self._abstract_arcs()
+        self.best = -1
+        self.selected: Set[int] = set()
+
+    def _partition(self) -> List[List[str]]:
+        """
+        Grid cells over the hub coordinates sized for cluster_size
+        hubs each, split into the connected parts of every cell.
+        """
+        if not self.hubs:
+            return []
+        xs = [hub.x for hub in self.hubs.values()]
+        ys = [hub.y for hub in self.hubs.values()]
+        side = max(1, math.ceil(math.sqrt(len(self.hubs) / self.cluster_size)))
+        min_x, min_y = min(xs), min(ys)
+        width = (max(xs) - min_x) / side + 1e-9
+        height = (max(ys) - min_y) / side + 1e-9
+
+        def cell(name: str) -> Tuple[int, int]:
+            hub = self.hubs[name]
+            return (
+                min(side - 1, int((hub.x - min_x) / width)),
+                min(side - 1, int((hub.y - min_y) / height)),
+            )
+
+        cells = {name: cell(name) for name in self.hubs}
+        clusters: List[List[str]] = []
+        seen: Set[str] = set()
+        for name in self.hubs:
+            if name in seen:
+                continue
+            seen.add(name)
+            members = [name]
+            for current in members:
+                for target in self.neighbors[current]:
+                    if target not in seen and cells[target] == cells[name]:
+                        seen.add(target)
+                        members.append(target)
+            clusters.append(members)
+        return clusters
+
+    def _abstract_arcs(self) -> Arcs:
+        """
+        Boundary-to-boundary arcs: the precomputed travel time inside
+        each cluster, plus every connection between two clusters.
+        """
+        arcs: Arcs = {name: [] for name in self.boundary}
+        for members in self.clusters:
+            inside = set(members)
+            local: Arcs = {
+                name: [
+                    (target, self.durations[target])
+                    for target in self.neighbors[name]
+                    if target in inside
+                ]
+                for name in members
+            }
+            for source in members:
+                if source not in self.boundary:
+                    continue
+                distances = _shortest(local, [source])
+                for target, cost in distances.items():
+                    if target != source and target in self.boundary:
+                        arcs[source].append((target, cost))
+
+        for source in self.boundary:
+            for target in self.neighbors[source]:
+                if self.cluster_of[target] != self.cluster_of[source]:
+                    arcs[source].append((target, self.durations[target]))
+        return arcs
+
+    def plan(self) -> SimulationMap:
+        """
+        Picks the clusters of the abstract routes at most slack turns
+        longer than the best one and returns the map restricted to
+        them. The whole map is returned when END is unreachable, so
+        the flat solver reports it.
+        """
+        starts = [
+            name for name, hub in self.hubs.items()
+            if hub.category == NodeCategory.START
+        ]
+        ends = [
+            name for name, hub in self.hubs.items()
+            if hub.category == NodeCategory.END
+        ]
+        reverse: Arcs = {}
+        for source, targets in self.arcs.items():
+            for target, cost in targets:
+                reverse.setdefault(target, []).append((source, cost))
+
+        from_start = _shortest(self.arcs, starts)
+        to_end = _shortest(reverse, ends)
+        reachable = [
+            from_start[name] for name in ends if name in from_start
+        ]
+        if not reachable:
+            self.selected = set(range(len(self.clusters)))
+            return self.simulation
+
+        self.best = min(reachable)
+        self.selected = {
+            self.cluster_of[name]
+            for name in self.boundary
+            if name in from_start
+            and name in to_end
+            and from_start[name] + to_end[name] <= self.best + self.slack
+        }
+        return self.submap()
+
+    def submap(self) -> SimulationMap:
+        """The map restricted to the hubs of the selected clusters."""
+        kept = {
+            name for index in self.selected
+            for name in self.clusters[index]
+        }
+        return SimulationMap(
+            nb_drones=self.simulation.nb_drones,
+            hubs={
+                name: hub for name, hub in self.simulation.hubs.items()
+                if name in kept
+            },
+            connections={
+                source: {
+                    target: connection
+                    for target, connection in targets.items()
+                    if target in kept
+                }
+                for source, targets in self.simulation.connections.items()
+                if source in kept
+            },
+        )
+
+
+def solve_hierarchically(
+    simulation: SimulationMap,
+    cluster_size: int = 64,
+    slack: int = 2,
+    search: str = "dijkstra",
+) -> Tuple[FlowSolver, HierarchicalPlanner]:
+    """
+    Routes the fleet on a pruned TEG built over the cluster corridor
+    chosen by HierarchicalPlanner. The horizon grows on its own when
+    the corridor is too narrow for the fleet.
+    """
+    planner = HierarchicalPlanner(simulation, cluster_size, slack)
+    submap = planner.plan()
+    max_time = estimate_horizon(submap)
+    if max_time < 0:
+        raise NoPathError("No path exists from START to END")
+
+    solver = FlowSolver(
+        TimeGraph(submap, max_time, prune=True), simulation.nb_drones, search
+    )
+    solver.solve_all_drones()
+
+    return solver, planner
@@ -0,0 +1,164 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+from src.schemas.simulation_map import SimulationMap
+from src.schemas.definitions import NodeCategory, ZoneType
+from src.solver.flow_solver import FlowSolver
+from src.solver.max_flow import max_flow
+from src.solver.time_estimator import (
+    distances_from_start,
+    distances_to_end,
+    NoPathError,
+    estimate_min_path_length,
+)
+from src.solver.time_graph import TimeGraph
+
+
+class HorizonPlanner:
+    """
+    Finds the smallest horizon T for which the whole fleet can reach
+    END, by searching T and checking each candidate with a max-flow.
+
+    The flow network is a light TEG over plain integers: every
+    (hub, turn) is split into in and out vertices bounded by
+    max_drones, moves are arcs bounded by max_link_capacity and END
+    drains into a sink. States that cannot be on a START-END path of
+    length T are never created. The flow lets both directions of a
+    link use its full capacity and ignores the second turn of
+    restricted traversals, so it is a relaxation: the returned
+    makespan is a certificate no schedule can beat, and the TEG built
+    with it is the smallest one that can possibly hold every drone.
+    """
+
+    def __init__(self, simulation: SimulationMap) -> None:
+        self.simulation = simulation
+        self.nb_drones = simulation.nb_drones
+        self.min_path = estimate_min_path_length(simulation)
+        self.upper_bound = self.nb_drones * self.min_path
+        self.makespan = -1
+        self.checks = 0
+        self._from_start = distances_from_start(simulation)
+        self._to_end = distances_to_end(simulation)
+
+    def max_flow(self, max_time: int) -> int:
+        """
+        Returns how many drones (capped at nb_drones)
+        the relaxed TEG of horizon max_time can deliver.
+        """
+        self.checks += 1
+        network = self._build_network(max_time)
+        if network is None:
+            return 0
+        return max_flow(*network, self.nb_drones)
+
+    def plan(self) -> int:
+        """
+        Gallops up from the static shortest path until the fleet
+        fits, then binary searches the last gap.
+        Returns the smallest feasible horizon, or -1 without a path.
+        """
+        if self.min_path <= 0:
+            return -1
+
+        low = self.min_path
+        high = low
+        step = 1
+        while self.max_flow(high) < self.nb_drones:
+            low = high + 1
+            high = min(high + step, self.upper_bound)
+            step *= 2
+
+        while low < high:
+            middle = (low + high) // 2
+            if self.max_flow(middle) >= self.nb_drones:
+                high = middle
+            else:
+                low = middle + 1
+
+        self.makespan = high
+        return high
+
+    def _build_network(
+        self, max_time: int
+    ) -> Optional[Tuple[List[int], List[int], List[List[int]], int, int]]:
+        """
+        Builds (arc_to, arc_cap, out_arcs, source, sink) for a horizon.
+        Arc 2k + 1 is the residual twin of arc 2k.
+        """
+        simulation = self.simulation
+        vertices: Dict[Tuple[str, int], int] = {}
+        out_arcs: List[List[int]] = []
+        arc_to: List[int] = []
+        arc_cap: List[int] = []
+
+        def add_arc(source: int, target: int, capacity: int) -> None:
+            out_arcs[source].append(len(arc_to))
+            arc_to.append(target)
+            arc_cap.append(capacity)
+            out_arcs[target].append(len(arc_to))
+            arc_to.append(source)
+            arc_cap.append(0)
+
+        for name, hub in simulation.hubs.items():
+            if hub.zone == ZoneType.BLOCKED or name not in self._to_end:
+                continue
+            first = self._from_start.get(name)
+            if first is None:
+                continue
+            for time in range(first, max_time - self._to_end[name] + 1):
+                vertices[(name, time)] = len(out_arcs)
+                out_arcs.append([])
+                out_arcs.append([])
+
+        sink = len(out_arcs)
+        out_arcs.append([])
+        start: Optional[int] = None
+
+        for (name, time), vertex in vertices.items():
+            hub = simulation.hubs[name]
+            add_arc(vertex, vertex + 1, hub.max_drones)
+            if hub.category == NodeCategory.START and time == 0:
+                start = vertex
+            if hub.category == NodeCategory.END:
+                add_arc(vertex + 1, sink, hub.max_drones)
+                continue
+
+            wait = vertices.get((name, time + 1))
+            if wait is not None:
+                add_arc(vertex + 1, wait, hub.max_drones)
+            for target, connection in simulation.connections.get(
+                name, {}
+            ).items():
+                target_hub = simulation.hubs[target]
+                duration = 2 if target_hub.zone == ZoneType.RESTRICTED else 1
+                move = vertices.get((target, time + duration))
+                if move is not None:
+                    add_arc(vertex + 1, move, connection.max_link_capacity)
+
+        if start is None:
+            return None
+        return arc_to, arc_cap, out_arcs, start, sink
+
+
+def solve_within_horizon(
+    simulation: SimulationMap, search: str = "dijkstra"
+) -> Tuple[FlowSolver, HorizonPlanner]:
+    """
+    Routes the fleet on a TEG sized by HorizonPlanner.
+    The planned horizon is a lower bound for the sequential solver,
+    which appends time layers on its own when a drone needs more.
+    The graph is pruned to the static time windows of its hubs.
+    """
+    planner = HorizonPlanner(simulation)
+    max_time = planner.plan()
+    if max_time < 0:
+        raise NoPathError("No path exists from START to END")
+
+    solver = FlowSolver(
+        TimeGraph(simulation, max_time, prune=True),
+        simulation.nb_drones,
+        search,
+        planner.upper_bound,
+    )
+    solver.solve_all_drones()
+
+    return solver, planner
@@ -0,0 +1,264 @@
+from __future__ import annotations
+import heapq
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from src.schemas.definitions import NodeCategory, ZoneType
+from src.solver.models import TimeNode, TimeEdge
+from src.solver.time_graph import TimeGraph
+
+Labels = Dict[TimeNode, Tuple[int, int]]
+
+
+class IncrementalSearch:
+    """
+    Layered sweep whose labels survive from one drone to the next.
+
+    Labels are (turns, priorities) as in FlowSolver, each node keeps
+    its predecessor and the sweep stops at the first END layer. After
+    a path is reserved, only the labels that may have changed are
+    rebuilt: nodes that became full and targets whose chosen edge lost
+    its link, then, in time order, the children of every node whose
+    label really changed. The sweep then resumes past the layers it
+    already finalized. Reservations only remove capacity, so a label
+    whose predecessor is untouched stays exact.
+
+    A repair costs the nodes it rebuilds and their incoming edges.
+    When drones share capacity-1 chains most of the swept layers
+    change between drones, so the mode saves expansions more than
+    wall time; bench_search.py compares it with the other modes.
+    """
+
+    def __init__(
+        self,
+        time_graph: TimeGraph,
+        precedes: Callable[[TimeNode, TimeNode, Labels], bool],
+    ) -> None:
+        self.time_graph = time_graph
+        self.reservations = time_graph.reservations
+        self.precedes = precedes
+        self.expansions = 0
+        self.repairs = 0
+        self._horizon = -1
+        self._swept = -1
+        self.best: Labels = {}
+        self.came_from: Dict[TimeNode, Optional[TimeNode]] = {}
+        self._children: Dict[TimeNode, Set[TimeNode]] = {}
+        self._layers: Dict[int, Dict[TimeNode, None]] = {}
+        self._end_nodes: Dict[TimeNode, None] = {}
+        self._incoming: Dict[TimeNode, List[TimeEdge]] = {}
+        self._link_edges: Dict[Tuple[int, int], List[TimeEdge]] = {}
+
+    def _reset(self, start_node: TimeNode) -> None:
+        """Starts over from start_node."""
+        self._horizon = self.time_graph.max_time
+        self._swept = start_node.time - 1
+        self.best = {}
+        self.came_from = {}
+        self._children = {}
+        self._layers = {}
+        self._end_nodes = {}
+        self._incoming = {}
+        self._link_edges = {}
+
+        priority = 1 if start_node.hub.zone == ZoneType.PRIORITY else 0
+        self._set_label(start_node, priority, None)
+
+    def _set_label(
+        self,
+        node: TimeNode,
+        priority: int,
+        previous: Optional[TimeNode],
+    ) -> None:
+        """Stores a label and keeps the predecessor tree in sync."""
+        old_previous = self.came_from.get(node)
+        if old_previous is not None and old_previous in self._children:
+            self._children[old_previous].discard(node)
+        self.best[node] = (node.time, priority)
+        self.came_from[node] = previous
+        if previous is not None:
+            self._children.setdefault(previous, set()).add(node)
+        self._layers.setdefault(node.time, {})[node] = None
+        if node.hub.category == NodeCategory.END:
+            self._end_nodes[node] = None
+
+    def _drop_label(self, node: TimeNode) -> None:
+        """Forgets the label of node."""
+        previous = self.came_from.pop(node, None)
+        if previous is not None and previous in self._children:
+            self._children[previous].discard(node)
+        del self.best[node]
+        del self._layers[node.time][node]
+        self._end_nodes.pop(node, None)
+
+    def _index_edge(self, edge: TimeEdge) -> None:
+        """
+        Remembers an expanded edge by target and by link departure,
+        which is all a repair needs to look at.
+        """
+        self._incoming.setdefault(edge.target, []).append(edge)
+        if edge.connection_id >= 0:
+            self._link_edges.setdefault(
+                (edge.connection_id, edge.source.time), []
+            ).append(edge)
+
+    def _relax(self, edge: TimeEdge) -> None:
+        """Offers the label of edge.source to edge.target."""
+        if edge.target.can_enter(self.reservations):
+            self._offer(edge)
+
+    def _offer(self, edge: TimeEdge) -> None:
+        """
+        Offers the label of edge.source to edge.target,
+        which the caller knows has room.
+        """
+        current_node = edge.source
+        neighbor = edge.target
+        if not edge.is_traversable(self.reservations):
+            return
+
+        new_priority = self.best[current_node][1] + (
+            1 if neighbor.hub.zone == ZoneType.PRIORITY else 0
+        )
+        current_best = self.best.get(neighbor)
+        if current_best is not None:
+            if new_priority < current_best[1]:
+                return
+            if new_priority == current_best[1]:
+                previous = self.came_from[neighbor]
+                if previous is None or not self.precedes(
+                    current_node, previous, self.best
+                ):
+                    return
+        self._set_label(neighbor, new_priority, current_node)
+
+    def find_path(self, start_node: TimeNode) -> Optional[List[TimeNode]]:
+        """
+        Returns the path to the earliest END node, sweeping only
+        the layers that no previous drone has finalized yet.
+        """
+        if (
+            self._horizon != self.time_graph.max_time
+            or start_node not in self.best
+        ):
+            self._reset(start_node)
+
+        while True:
+            arrivals = [
+                node for node in self._end_nodes
+                if node.time <= self._swept + 1
+            ]
+            if arrivals:
+                end_node = min(arrivals, key=lambda node: node.time)
+                return self._reconstruct_path(end_node)
+
+            time = self._swept + 1
+            if time > self.time_graph.max_time:
+                return None
+
+            for current_node in list(self._layers.get(time, {})):
+                if current_node.hub.category == NodeCategory.END:
+                    continue
+                self.expansions += 1
+                for edge in self.time_graph.get_edges(current_node):
+                    self._index_edge(edge)
+                    self._relax(edge)
+            self._swept = time
+
+    def _reconstruct_path(self, end_node: TimeNode) -> List[TimeNode]:
+        """Reconstructs the path from start to end."""
+        path = []
+        current: Optional[TimeNode] = end_node
+        while current is not None:
+            path.append(current)
+            current = self.came_from.get(current)
+        path.reverse()
+        return path
+
+    def record_path(
+        self, path: List[TimeNode], edges: List[TimeEdge]
+    ) -> None:
+        """
+        Repairs the labels after path and edges have been
+        written to the reservation table.
+        """
+        if self._horizon != self.time_graph.max_time:
+            return
+
+        seeds: Set[TimeNode] = set()
+        for node in path:
+            if node in self.best and not node.can_enter(self.reservations):
+                seeds.add(node)
+
+        end_node = path[-1]
+        if end_node.hub.category == NodeCategory.END:
+            for node in list(self._end_nodes):
+                if not node.can_enter(self.reservations):
+                    seeds.add(node)
+
+        for edge in edges:
+            if edge.connection_id < 0:
+                continue
+            for turn in range(edge.source.time, edge.target.time):
+                if self.reservations.link_has_room(
+                    edge.connection_id, turn, 1
+                ):
+                    continue
+                for departure in (turn - 1, turn):
+                    for blocked in self._link_edges.get(
+                        (edge.connection_id, departure), []
+                    ):
+                        if (
+                            blocked.target.time > turn
+                            and self.came_from.get(blocked.target)
+                            == blocked.source
+                        ):
+                            seeds.add(blocked.target)
+
+        self._repair(seeds)
+
+    def _repair(self, seeds: Set[TimeNode]) -> None:
+        """
+        Rebuilds the labels of seeds from their incoming edges in time
+        order. A node whose label or predecessor changed passes the
+        repair on to its children in the predecessor tree; the others
+        stop it there.
+        """
+        dirty: Dict[int, Set[TimeNode]] = {}
+        for node in seeds:
+            dirty.setdefault(node.time, set()).add(node)
+
+        times = list(dirty)
+        heapq.heapify(times)
+        best = self.best
+        while times:
+            time = heapq.heappop(times)
+            for node in sorted(
+                dirty.pop(time), key=lambda node: node.hub_index
+            ):
+                old_label = best.get(node)
+                if old_label is None:
+                    continue
+                old_previous = self.came_from[node]
+                self.repairs += 1
+                self._drop_label(node)
+
+                if node.can_enter(self.reservations):
+                    for edge in self._incoming.get(node, ()):
+                        source = edge.source
+                        if (
+                            source.time <= self._swept
+                            and source in best
+                            and not source.is_end
+                        ):
+                            self._offer(edge)
+
+                    if (
+                        best.get(node) == old_label
+                        and self.came_from.get(node) == old_previous
+                    ):
+                        continue
+                for child in self._children.pop(node, ()):
+                    layer = dirty.get(child.time)
+                    if layer is None:
+                        layer = dirty[child.time] = set()
+                        heapq.heappush(times, child.time)
+                    layer.add(child)
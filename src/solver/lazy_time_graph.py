@@ -0,0 +1,136 @@
+from __future__ import annotations
+from typing import List, Optional
+from src.schemas.definitions import NodeCategory, ZoneType
+from src.solver.models import (
+    TimeNode,
+    TimeEdge,
+    ReservationTable,
+    SparseReservationTable,
+)
+from src.solver.time_graph import TimeGraph
+
+
+class LazyTimeGraph(TimeGraph):
+    """
+    Time-Expanded Graph that materializes states on demand.
+
+    Nothing is built upfront except the START node at time 0.
+    A TimeNode is created the first time it is looked up and its
+    outgoing edges are derived from SimulationMap.connections the
+    first time the search expands it. Drone counters live in a
+    SparseReservationTable, so memory follows the explored part
+    of the graph instead of hubs x horizon.
+    """
+
+    def _create_reservations(self) -> ReservationTable:
+        """Counters are only stored for touched states."""
+        hub_capacity = [
+            self.simulation.hubs[name].max_drones for name in self.hub_indexes
+        ]
+        return SparseReservationTable(
+            hub_capacity,
+            self._link_capacity,
+            self.max_time,
+            self.end_indexes,
+        )
+
+    def _build_graph(self) -> None:
+        """Only creates the START node at time 0."""
+        for hub in self.simulation.hubs.values():
+            if hub.category == NodeCategory.START:
+                self.get_node(hub.name, 0)
+
+    def extend_horizon(self, max_time: int) -> None:
+        """
+        Moves the horizon to max_time. Nodes are still created on
+        demand; only the cached edges of the last two turns, which
+        could not reach past the old horizon, are derived again.
+        """
+        if max_time <= self.max_time:
+            return
+
+        previous_max = self.max_time
+        self.max_time = max_time
+        self.reservations.extend(max_time)
+
+        stale = [
+            node for node in self.adjacency
+            if node.time >= previous_max - 1
+        ]
+        for node in stale:
+            del self.adjacency[node]
+        stale_nodes = set(stale)
+        self.edges = [
+            edge for edge in self.edges if edge.source not in stale_nodes
+        ]
+
+    def get_node(self, hub_name: str, time: int) -> Optional[TimeNode]:
+        """
+        Returns the TimeNode for a given hub name and time,
+        creating it on first touch. Returns None for blocked or
+        unknown hubs and for times outside the horizon.
+        """
+        node = self._node_lookup.get((hub_name, time))
+        if node is not None:
+            return node
+
+        hub = self.simulation.hubs.get(hub_name)
+        if hub is None or not 0 <= time <= self.max_time:
+            return None
+
+        self._add_node(hub, time)
+        return self._node_lookup.get((hub_name, time))
+
+    def has_node(self, hub_name: str, time: int) -> bool:
+        """Check if get_node would return a node, without creating it."""
+        if (hub_name, time) in self._node_lookup:
+            return True
+        hub = self.simulation.hubs.get(hub_name)
+        return (
+            hub is not None
+            and hub.zone != ZoneType.BLOCKED
+            and 0 <= time <= self.max_time
+            and self._in_window(hub, time)
+        )
+
+    def get_edges(self, node: TimeNode) -> List[TimeEdge]:
+        """
+        Returns the outgoing edges of a TimeNode,
+        deriving them from the static connections on first call.
+        """
+        edges = self.adjacency.get(node)
+        if edges is not None:
+            return edges
+
+        edges = []
+        self.adjacency[node] = edges
+        if node.time >= self.max_time:
+            return edges
+
+        connections = self.simulation.connections.get(node.hub.name, {})
+        for target_name, connection in connections.items():
+            target_hub = self.simulation.hubs.get(target_name)
+            if target_hub is None:
+                continue
+
+            arrival_time = node.time + self._get_travel_time(target_hub)
+            target_node = self.get_node(target_name, arrival_time)
+            if target_node is not None:
+                connection_id = self.connection_ids[
+                    self._connection_key(node.hub.name, target_name)
+                ]
+                edges.append(
+                    TimeEdge(
+                        node,
+                        target_node,
+                        connection.max_link_capacity,
+                        connection_id,
+                    )
+                )
+
+        wait_target = self.get_node(node.hub.name, node.time + 1)
+        if wait_target is not None:
+            edges.append(TimeEdge(node, wait_target, node.hub.max_drones))
+
+        self.edges.extend(edges)
+        return edges
@@ -0,0 +1,230 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Set, Tuple
+from src.schemas.simulation_map import SimulationMap
+from src.schemas.definitions import NodeCategory, ZoneType
+
+
+class MapReduction:
+    """
+    A map stripped of the dead ends no drone gains from visiting.
+
+    A hub lies on a simple START-END path exactly when it belongs to
+    one of the biconnected blocks met on the block-cut tree path from
+    START to END. Every other block hangs off that path at a single
+    cut hub, so entering it means leaving through the same hub again.
+    Those blocks are dead ends and are dropped together with their
+    connections, as are blocked hubs. A dead end still pays when it
+    holds a priority hub: a drone detours out and back through it
+    instead of waiting and lands with the same turn and one more
+    priority. The branches of the block-cut tree leading to a
+    priority hub are therefore kept. What is still given up is a
+    dead end used as a parking bay when a drone can neither wait
+    nor move on; on random maps this changes about one schedule in
+    a thousand. The original map is kept in original for drawing.
+    """
+
+    def __init__(self, simulation: SimulationMap) -> None:
+        self.original = simulation
+        self.kept: Set[str] = self._useful_hubs()
+        self.removed_hubs: List[str] = [
+            name for name in simulation.hubs if name not in self.kept
+        ]
+        self.removed_connections: List[Tuple[str, str]] = sorted(
+            {
+                (min(source, target), max(source, target))
+                for source, targets in simulation.connections.items()
+                for target in targets
+                if source not in self.kept or target not in self.kept
+            }
+        )
+        self.simulation = SimulationMap(
+            nb_drones=simulation.nb_drones,
+            hubs={
+                name: hub for name, hub in simulation.hubs.items()
+                if name in self.kept
+            },
+            connections={
+                source: {
+                    target: connection
+                    for target, connection in targets.items()
+                    if target in self.kept
+                }
+                for source, targets in simulation.connections.items()
+                if source in self.kept
+            },
+        )
+
+    def report(self) -> List[str]:
+        """Human readable summary of what was removed."""
+        if not self.removed_hubs:
+            return ["No hub removed"]
+        return [
+            f"Removed {len(self.removed_hubs)} hubs: "
+            + ", ".join(self.removed_hubs),
+            f"Removed {len(self.removed_connections)} connections: "
+            + ", ".join(
+                f"{source}-{target}"
+                for source, target in self.removed_connections
+            ),
+        ]
+
+    def _useful_hubs(self) -> Set[str]:
+        """
+        Hubs of the blocks on the block-cut tree path from START
+        to END. Every hub is kept when END cannot be reached, so
+        the solver still reports the missing path itself.
+        """
+        simulation = self.original
+        hubs = simulation.hubs
+        start = self._find(NodeCategory.START)
+        end = self._find(NodeCategory.END)
+        if start is None or end is None:
+            return set(hubs)
+
+        neighbors: Dict[str, List[str]] = {
+            name: [] for name, hub in hubs.items()
+            if hub.zone != ZoneType.BLOCKED
+        }
+        for source, targets in simulation.connections.items():
+            for target in targets:
+                if source in neighbors and target in neighbors:
+                    if target not in neighbors[source]:
+                        neighbors[source].append(target)
+                    if source not in neighbors[target]:
+                        neighbors[target].append(source)
+        if start not in neighbors or end not in neighbors:
+            return set(hubs)
+        if start == end:
+            return {start}
+
+        blocks = _biconnected_blocks(neighbors, start)
+        path = _block_path(blocks, start, end)
+        if path is None:
+            return set(hubs)
+        priority_hubs = {
+            name for name, hub in hubs.items()
+            if hub.zone == ZoneType.PRIORITY
+        }
+        kept = _branches_to(blocks, path, priority_hubs)
+        return set().union(*(blocks[index] for index in kept))
+
+    def _find(self, category: NodeCategory) -> Optional[str]:
+        """Name of the first hub of a category, or None."""
+        for name, hub in self.original.hubs.items():
+            if hub.category == category:
+                return name
+        return None
+
+
+def _biconnected_blocks(
+    neighbors: Dict[str, List[str]], root: str
+) -> List[Set[str]]:
+    """
+    Hopcroft-Tarjan over the component of root, iterative so deep
+    maps do not hit the recursion limit. Returns the hub sets of the
+    biconnected blocks; a bridge is a block of two hubs.
+    """
+    order: Dict[str, int] = {root: 0}
+    low: Dict[str, int] = {root: 0}
+    blocks: List[Set[str]] = []
+    edge_stack: List[Tuple[str, str]] = []
+    stack: List[Tuple[str, Optional[str], int]] = [(root, None, 0)]
+
+    while stack:
+        hub, parent, position = stack.pop()
+        if position < len(neighbors[hub]):
+            stack.append((hub, parent, position + 1))
+            neighbor = neighbors[hub][position]
+            if neighbor == parent:
+                continue
+            if neighbor not in order:
+                order[neighbor] = low[neighbor] = len(order)
+                edge_stack.append((hub, neighbor))
+                stack.append((neighbor, hub, 0))
+            elif order[neighbor] < order[hub]:
+                low[hub] = min(low[hub], order[neighbor])
+                edge_stack.append((hub, neighbor))
+            continue
+
+        if parent is None:
+            continue
+        low[parent] = min(low[parent], low[hub])
+        if low[hub] >= order[parent]:
+            block: Set[str] = set()
+            while True:
+                source, target = edge_stack.pop()
+                block.update((source, target))
+                if (source, target) == (parent, hub):
+                    break
+            blocks.append(block)
+
+    return blocks
+
+
+def _block_path(
+    blocks: List[Set[str]], start: str, end: str
+) -> Optional[List[int]]:
+    """
+    Indexes of the blocks on the block-cut tree path from START
+    to END, found with a breadth-first search where two blocks are
+    adjacent when they share a cut hub. In a tree the first path
+    found is the only one.
+    """
+    members = _members(blocks)
+    came_from: Dict[int, Optional[int]] = {
+        index: None for index in members.get(start, [])
+    }
+    queue = list(came_from)
+    for index in queue:
+        if end in blocks[index]:
+            path = [index]
+            previous = came_from[index]
+            while previous is not None:
+                path.append(previous)
+                previous = came_from[previous]
+            return path
+        for hub in blocks[index]:
+            for other in members[hub]:
+                if other not in came_from:
+                    came_from[other] = index
+                    queue.append(other)
+    return None
+
+
+def _branches_to(
+    blocks: List[Set[str]], path: List[int], targets: Set[str]
+) -> Set[int]:
+    """
+    Indexes of the path blocks plus every block on the block-cut
+    tree branch from the path to a target hub. The cut hub a block
+    is entered through already belongs to its parent, so it does
+    not count as a reason to keep the block.
+    """
+    members = _members(blocks)
+    kept = set(path)
+    came_from: Dict[int, Tuple[Optional[int], str]] = {
+        index: (None, "") for index in path
+    }
+    queue = list(path)
+    for index in queue:
+        entry = came_from[index][1]
+        if index not in kept and (blocks[index] - {entry}) & targets:
+            previous: Optional[int] = index
+            while previous is not None and previous not in kept:
+                kept.add(previous)
+                previous = came_from[previous][0]
+        for hub in blocks[index]:
+            for other in members[hub]:
+                if other not in came_from:
+                    came_from[other] = (index, hub)
+                    queue.append(other)
+    return kept
+
+
+def _members(blocks: List[Set[str]]) -> Dict[str, List[int]]:
+    """Indexes of the blocks each hub belongs to."""
+    members: Dict[str, List[int]] = {}
+    for index, block in enumerate(blocks):
+        for hub in block:
+            members.setdefault(hub, []).append(index)
+    return members
@@ -0,0 +1,93 @@
+from __future__ import annotations
+from collections import deque
+from typing import List
+
+
+def max_flow(
+    arc_to: List[int],
+    arc_cap: List[int],
+    out_arcs: List[List[int]],
+    source: int,
+    sink: int,
+    limit: int,
+) -> int:
+    """
+    Dinic max-flow on an arc-list network, stopping once limit
+    units are sent. Arc 2k + 1 must be the residual twin of arc 2k.
+    arc_cap is updated in place.
+    """
+    flow = 0
+    nb_vertices = len(out_arcs)
+
+    while flow < limit:
+        level = [-1] * nb_vertices
+        level[source] = 0
+        queue = deque([source])
+        while queue:
+            vertex = queue.popleft()
+            for arc in out_arcs[vertex]:
+                target = arc_to[arc]
+                if arc_cap[arc] > 0 and level[target] < 0:
+                    level[target] = level[vertex] + 1
+                    queue.append(target)
+        if level[sink] < 0:
+            break
+
+        cursor = [0] * nb_vertices
+        while flow < limit:
+            pushed = _blocking_path(
+                arc_to, arc_cap, out_arcs, level, cursor, source, sink,
+                limit - flow,
+            )
+            if pushed == 0:
+                break
+            flow += pushed
+
+    return flow
+
+
+def _blocking_path(
+    arc_to: List[int],
+    arc_cap: List[int],
+    out_arcs: List[List[int]],
+    level: List[int],
+    cursor: List[int],
+    source: int,
+    sink: int,
+    limit: int,
+) -> int:
+    """
+    Finds one augmenting path in the level graph with an explicit
+    stack and pushes its bottleneck. Dead ends advance their cursor
+    so they are never scanned twice in the same phase.
+    """
+    stack: List[int] = []
+    vertex = source
+    while True:
+        if vertex == sink:
+            pushed = min([limit] + [arc_cap[arc] for arc in stack])
+            for arc in stack:
+                arc_cap[arc] -= pushed
+                arc_cap[arc ^ 1] += pushed
+            return pushed
+
+        arcs = out_arcs[vertex]
+        while cursor[vertex] < len(arcs):
+            arc = arcs[cursor[vertex]]
+            target = arc_to[arc]
+            if arc_cap[arc] > 0 and level[target] == level[vertex] + 1:
+                break
+            cursor[vertex] += 1
+
+        if cursor[vertex] < len(arcs):
+            arc = arcs[cursor[vertex]]
+            stack.append(arc)
+            vertex = arc_to[arc]
+            continue
+
+        if not stack:
+            return 0
+        level[vertex] = -1
+        arc = stack.pop()
+        vertex = arc_to[arc ^ 1]
+        cursor[vertex] += 1
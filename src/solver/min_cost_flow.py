@@ -0,0 +1,259 @@
+from __future__ import annotations
+import heapq
+from typing import Dict, List, Optional, Tuple
+from src.solver.flow_solver import FlowSolver
+from src.solver.models import TimeNode
+from src.solver.time_graph import TimeGraph
+from src.schemas.definitions import NodeCategory, ZoneType
+
+
+class MinCostFlowSolver(FlowSolver):
+    """
+    Routes the whole fleet with one min-cost flow over the TEG.
+
+    Every TimeNode is split into an in and an out vertex joined by
+    an arc of capacity max_drones. TEG edges become arcs from out to
+    in with the edge capacity, costing weight * duration minus 1 when
+    entering a priority zone, so the total cost ranks arrival turns
+    first and priority zones second. END nodes drain into a sink.
+    nb_drones units are sent with successive shortest paths using
+    Dijkstra on reduced costs, and the flow is decomposed into paths.
+
+    A link is one capacity shared by both directions and by every
+    turn of a restricted traversal, which a plain flow cannot express.
+    Paths are therefore reserved one by one and a path that no longer
+    fits is rerouted with the FlowSolver search; see repaired.
+    """
+
+    def __init__(self, time_graph: TimeGraph, nb_drones: int) -> None:
+        super().__init__(time_graph, nb_drones)
+        self.weight = time_graph.max_time + 2
+        self.repaired = 0
+        self.augmentations = 0
+        self._vertex_nodes: List[TimeNode] = []
+        self._arc_to: List[int] = []
+        self._arc_cap: List[int] = []
+        self._arc_cost: List[int] = []
+        self._arc_initial: List[int] = []
+        self._out_arcs: List[List[int]] = []
+
+    def _add_vertex(self, node: Optional[TimeNode]) -> int:
+        """Adds a vertex to the flow network and returns its id."""
+        self._out_arcs.append([])
+        if node is not None:
+            self._vertex_nodes.append(node)
+        return len(self._out_arcs) - 1
+
+    def _add_arc(self, source: int, target: int, cap: int, cost: int) -> None:
+        """Adds an arc and its residual twin (id ^ 1)."""
+        for tail, head, capacity, weight in (
+            (source, target, cap, cost),
+            (target, source, 0, -cost),
+        ):
+            self._out_arcs[tail].append(len(self._arc_to))
+            self._arc_to.append(head)
+            self._arc_cap.append(capacity)
+            self._arc_cost.append(weight)
+            self._arc_initial.append(capacity)
+
+    def _build_network(self, start_node: TimeNode) -> Tuple[int, int]:
+        """
+        Builds the split network over the states reachable from
+        start_node, in time order. Returns (source, sink) vertex ids.
+        Vertex 2k is the in side and 2k + 1 the out side of node k.
+        """
+        reachable: Dict[TimeNode, int] = {start_node: 0}
+        order: List[TimeNode] = [start_node]
+        for node in order:
+            if node.hub.category == NodeCategory.END:
+                continue
+            for edge in self.time_graph.get_edges(node):
+                if edge.target not in reachable:
+                    reachable[edge.target] = 0
+                    order.append(edge.target)
+
+        order.sort(key=lambda node: (node.time, node.hub_index))
+        for index, node in enumerate(order):
+            reachable[node] = index
+            self._add_vertex(node)
+            self._add_vertex(None)
+
+        sink = self._add_vertex(None)
+        for index, node in enumerate(order):
+            vertex = 2 * index
+            self._add_arc(vertex, vertex + 1, node.hub.max_drones, 0)
+            if node.hub.category == NodeCategory.END:
+                self._add_arc(vertex + 1, sink, node.hub.max_drones, 0)
+                continue
+            for edge in self.time_graph.get_edges(node):
+                bonus = 1 if edge.target.hub.zone == ZoneType.PRIORITY else 0
+                self._add_arc(
+                    vertex + 1,
+                    2 * reachable[edge.target],
+                    edge.max_capacity,
+                    self.weight * edge.duration - bonus,
+                )
+
+        return 0, sink
+
+    def _initial_potentials(self, source: int) -> List[int]:
+        """
+        Exact distances from source on the initial network.
+        Vertex ids follow time order, so one forward pass is enough
+        despite the negative priority costs.
+        """
+        unreached = self.weight * (self.time_graph.max_time + 2) ** 2
+        potentials = [unreached] * len(self._out_arcs)
+        potentials[source] = 0
+        for vertex in range(len(self._out_arcs)):
+            if potentials[vertex] == unreached:
+                continue
+            for arc in self._out_arcs[vertex]:
+                if self._arc_cap[arc] <= 0:
+                    continue
+                target = self._arc_to[arc]
+                cost = potentials[vertex] + self._arc_cost[arc]
+                if cost < potentials[target]:
+                    potentials[target] = cost
+        return potentials
+
+    def _augment(
+        self, source: int, sink: int, potentials: List[int], units: int
+    ) -> int:
+        """
+        Sends flow along one cheapest residual path.
+        Returns the amount pushed, 0 when sink is unreachable.
+        The frontier stays a binary heap rather than a BucketQueue:
+        a turn costs weight (max_time + 2), so reduced costs spread
+        over up to weight * max_time values and one bucket per cost
+        would mostly hold empty lists.
+        """
+        dist: Dict[int, int] = {source: 0}
+        via: Dict[int, int] = {}
+        pq: List[Tuple[int, int]] = [(0, source)]
+        done: set[int] = set()
+
+        while pq:
+            cost, vertex = heapq.heappop(pq)
+            if vertex in done:
+                continue
+            done.add(vertex)
+            for arc in self._out_arcs[vertex]:
+                if self._arc_cap[arc] <= 0:
+                    continue
+                target = self._arc_to[arc]
+                reduced = (
+                    self._arc_cost[arc] + potentials[vertex]
+                    - potentials[target]
+                )
+                new_cost = cost + reduced
+                if new_cost < dist.get(target, new_cost + 1):
+                    dist[target] = new_cost
+                    via[target] = arc
+                    heapq.heappush(pq, (new_cost, target))
+
+        if sink not in done:
+            return 0
+
+        for vertex, cost in dist.items():
+            potentials[vertex] += cost
+
+        pushed = units
+        vertex = sink
+        while vertex != source:
+            arc = via[vertex]
+            pushed = min(pushed, self._arc_cap[arc])
+            vertex = self._arc_to[arc ^ 1]
+
+        vertex = sink
+        while vertex != source:
+            arc = via[vertex]
+            self._arc_cap[arc] -= pushed
+            self._arc_cap[arc ^ 1] += pushed
+            vertex = self._arc_to[arc ^ 1]
+
+        self.augmentations += 1
+        return pushed
+
+    def _decompose(self, source: int, sink: int) -> List[List[TimeNode]]:
+        """Splits the flow into one TimeNode path per unit."""
+        flow = [
+            initial - cap
+            for initial, cap in zip(self._arc_initial, self._arc_cap)
+        ]
+        paths: List[List[TimeNode]] = []
+
+        while True:
+            path: List[TimeNode] = []
+            vertex = source
+            while vertex != sink:
+                if vertex % 2 == 0:
+                    path.append(self._vertex_nodes[vertex // 2])
+                arc = next(
+                    (
+                        arc for arc in self._out_arcs[vertex]
+                        if arc % 2 == 0 and flow[arc] > 0
+                    ),
+                    None,
+                )
+                if arc is None:
+                    return paths
+                flow[arc] -= 1
+                vertex = self._arc_to[arc]
+            paths.append(path)
+
+    def _fits(self, path: List[TimeNode]) -> bool:
+        """Checks a path against the current reservations."""
+        if not all(node.can_enter(self.reservations) for node in path):
+            return False
+        edges = self._get_path_edges(path)
+        if len(edges) != len(path) - 1:
+            return False
+        return all(edge.is_traversable(self.reservations) for edge in edges)
+
+    def route_drones(self) -> List[int]:
+        """
+        Computes the flow for all drones at once, then hands paths
+        out by arrival turn (then priority zones) to drones 1..N.
+        Returns the ids of the drones left without a path.
+        """
+        start_node = self.find_start_node()
+        source, sink = self._build_network(start_node)
+        potentials = self._initial_potentials(source)
+
+        sent = 0
+        while sent < self.nb_drones:
+            pushed = self._augment(
+                source, sink, potentials, self.nb_drones - sent
+            )
+            if pushed == 0:
+                break
+            sent += pushed
+
+        paths = self._decompose(source, sink)
+        paths.sort(
+            key=lambda path: (
+                path[-1].time,
+                -sum(node.is_priority for node in path),
+            )
+        )
+        unrouted: List[int] = []
+
+        for drone_id in range(1, self.nb_drones + 1):
+            path: Optional[List[TimeNode]] = (
+                paths[drone_id - 1] if drone_id <= len(paths) else None
+            )
+            if path is None or not self._fits(path):
+                if path is not None:
+                    self.repaired += 1
+                path = self._solve_growing(drone_id, start_node)
+
+            if path:
+                self.drone_paths[drone_id] = path
+                self._reserve_path(path)
+            else:
+                unrouted.append(drone_id)
+
+        self._create_drones()
+
+        return unrouted
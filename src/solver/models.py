@@ -1,29 +1,228 @@
 from __future__ import annotations
+from array import array
 from collections import defaultdict
+from typing import Dict, List, Sequence
 from src.schemas.hubs import Hub
 from src.schemas.definitions import ZoneType, NodeCategory
 
 
-class EdgeTracker:
-    """Tracks edge usage across time for capacity management."""
+class ArrivalCounter:
+    """
+    Fenwick tree over turns counting the drones that reached an
+    absorbing hub. A drone that arrives at turn t stays there, so the
+    occupancy at t is the number of arrivals up to t: one O(log T)
+    prefix sum, whatever the horizon.
+    """
+
+    def __init__(self, max_time: int) -> None:
+        self.arrivals = array("i", [0]) * (max_time + 1)
+        self.tree = array("i", [0]) * (max_time + 2)
+
+    def add(self, time: int, count: int = 1) -> None:
+        """Register count drones arriving at time."""
+        self.arrivals[time] += count
+        position = time + 1
+        tree = self.tree
+        while position < len(tree):
+            tree[position] += count
+            position += position & -position
+
+    def arrived_by(self, time: int) -> int:
+        """Number of drones that arrived at time or before."""
+        total = 0
+        position = min(time + 1, len(self.tree) - 1)
+        tree = self.tree
+        while position > 0:
+            total += tree[position]
+            position -= position & -position
+        return total
+
+    def extend(self, max_time: int) -> None:
+        """Grows the tree up to max_time, keeping every arrival."""
+        arrivals = self.arrivals
+        self.arrivals = array("i", [0]) * (max_time + 1)
+        self.tree = array("i", [0]) * (max_time + 2)
+        for time, count in enumerate(arrivals):
+            if count:
+                self.add(time, count)
+
+
+class ReservationTable:
+    """
+    Tracks hub and connection usage across time for capacity management.
+
+    Hubs and undirected connections are identified by integer ids
+    assigned when the graph is built. Usage is stored in one
+    preallocated integer row per hub / connection, indexed by turn.
+    Hubs listed in absorbing (END) keep every drone that reaches them,
+    so they only count arrivals, in an ArrivalCounter.
+    """
+
+    def __init__(
+        self,
+        hub_capacity: List[int],
+        link_capacity: List[int],
+        max_time: int,
+        absorbing: Sequence[int] = (),
+    ) -> None:
+        self.max_time = max_time
+        self.hub_capacity = array("i", hub_capacity)
+        self.link_capacity = array("i", link_capacity)
+        self.hub_drones: List[array[int]] = [
+            array("i", [0]) * (max_time + 1) for _ in hub_capacity
+        ]
+        self.link_drones: List[array[int]] = [
+            array("i", [0]) * (max_time + 1) for _ in link_capacity
+        ]
+        self.absorbed: Dict[int, ArrivalCounter] = {
+            hub_index: ArrivalCounter(max_time) for hub_index in absorbing
+        }
+
+    def hub_count(self, hub_index: int, time: int) -> int:
+        """Number of drones at the hub at a specific time."""
+        counter = self.absorbed.get(hub_index)
+        if counter is not None:
+            return counter.arrived_by(time)
+        return self.hub_drones[hub_index][time]
+
+    def hub_has_room(self, hub_index: int, time: int) -> bool:
+        """Check if a drone can be at the hub at a specific time."""
+        return self.hub_count(hub_index, time) < self.hub_capacity[hub_index]
+
+    def hub_room(self, hub_index: int, time: int) -> int:
+        """Number of drones the hub can still take at a specific time."""
+        return self.hub_capacity[hub_index] - self.hub_count(hub_index, time)
+
+    def add_hub_drone(self, hub_index: int, time: int, count: int = 1) -> None:
+        """
+        Register count drones at the hub at a specific time.
+        At an absorbing hub this is their arrival turn.
+        """
+        counter = self.absorbed.get(hub_index)
+        if counter is not None:
+            counter.add(time, count)
+            return
+        self.hub_drones[hub_index][time] += count
+
+    def link_has_room(self, link_id: int, time: int, duration: int) -> bool:
+        """
+        Check if the connection has room during every
+        turn of a traversal starting at time.
+        """
+        row = self.link_drones[link_id]
+        return max(row[time:time + duration]) < self.link_capacity[link_id]
+
+    def link_room(self, link_id: int, time: int, duration: int) -> int:
+        """
+        Number of drones that can still start a traversal
+        of the connection at time.
+        """
+        row = self.link_drones[link_id]
+        return self.link_capacity[link_id] - max(row[time:time + duration])
+
+    def add_link_drone(
+        self, link_id: int, time: int, duration: int, count: int = 1
+    ) -> None:
+        """Register count drones on the connection for every turn."""
+        row = self.link_drones[link_id]
+        for turn in range(time, time + duration):
+            row[turn] += count
+
+    def extend(self, max_time: int) -> None:
+        """
+        Grows every row up to max_time. Drones absorbed before
+        stay counted on the new turns.
+        """
+        extra = max_time - self.max_time
+        if extra <= 0:
+            return
+        for row in self.hub_drones:
+            row.extend(array("i", [0]) * extra)
+        for row in self.link_drones:
+            row.extend(array("i", [0]) * extra)
+        for counter in self.absorbed.values():
+            counter.extend(max_time)
+        self.max_time = max_time
+
+
+class SparseReservationTable(ReservationTable):
+    """
+    ReservationTable storing only non-zero counters.
+    Used by graphs whose states are created on demand.
+    """
+
+    def __init__(
+        self,
+        hub_capacity: List[int],
+        link_capacity: List[int],
+        max_time: int,
+        absorbing: Sequence[int] = (),
+    ) -> None:
+        self.max_time = max_time
+        self.hub_capacity = array("i", hub_capacity)
+        self.link_capacity = array("i", link_capacity)
+        self.hub_counts: dict[tuple[int, int], int] = defaultdict(int)
+        self.link_counts: dict[tuple[int, int], int] = defaultdict(int)
+        self.absorbed = {
+            hub_index: ArrivalCounter(max_time) for hub_index in absorbing
+        }
 
-    def __init__(self) -> None:
-        self.edge_drones: dict[tuple[str, int], int] = defaultdict(int)
+    def hub_count(self, hub_index: int, time: int) -> int:
+        """Number of drones at the hub at a specific time."""
+        counter = self.absorbed.get(hub_index)
+        if counter is not None:
+            return counter.arrived_by(time)
+        return self.hub_counts.get((hub_index, time), 0)
+
+    def add_hub_drone(self, hub_index: int, time: int, count: int = 1) -> None:
+        """
+        Register count drones at the hub at a specific time.
+        At an absorbing hub this is their arrival turn.
+        """
+        counter = self.absorbed.get(hub_index)
+        if counter is not None:
+            counter.add(time, count)
+            return
+        self.hub_counts[(hub_index, time)] += count
+
+    def link_has_room(self, link_id: int, time: int, duration: int) -> bool:
+        """
+        Check if the connection has room during every
+        turn of a traversal starting at time.
+        """
+        capacity = self.link_capacity[link_id]
+        for turn in range(time, time + duration):
+            if self.link_counts.get((link_id, turn), 0) >= capacity:
+                return False
+        return True
 
-    def _get_connection_key(self, edge: TimeEdge) -> str:
-        """Creates a normalized key that's the same for both directions."""
-        names = sorted([edge.source.hub.name, edge.target.hub.name])
-        return f"{names[0]}-{names[1]}"
+    def link_room(self, link_id: int, time: int, duration: int) -> int:
+        """
+        Number of drones that can still start a traversal
+        of the connection at time.
+        """
+        return self.link_capacity[link_id] - max(
+            self.link_counts.get((link_id, turn), 0)
+            for turn in range(time, time + duration)
+        )
 
-    def get_current_drones(self, edge: TimeEdge, time: int) -> int:
-        """Get current drone count on edge at specific time."""
-        key = self._get_connection_key(edge)
-        return self.edge_drones[(key, time)]
+    def add_link_drone(
+        self, link_id: int, time: int, duration: int, count: int = 1
+    ) -> None:
+        """Register count drones on the connection for every turn."""
+        for turn in range(time, time + duration):
+            self.link_counts[(link_id, turn)] += count
 
-    def add_drone(self, edge: TimeEdge, time: int) -> None:
-        """Register a drone using the edge at specific time."""
-        key = self._get_connection_key(edge)
-        self.edge_drones[(key, time)] += 1
+    def extend(self, max_time: int) -> None:
+        """
+        Moves the horizon to max_time. Only the arrival
+        counters of absorbing hubs have to grow.
+        """
+        if max_time <= self.max_time:
+            return
+        for counter in self.absorbed.values():
+            counter.extend(max_time)
+        self.max_time = max_time
 
 
 class TimeNode:
@@ -31,20 +230,27 @@ class TimeNode:
     Represents a specific physical Hub at a specific simulation time step.
     """
 
-    def __init__(self, hub: Hub, time: int, initial_drones: int = 0) -> None:
+    def __init__(self, hub: Hub, time: int, hub_index: int = 0) -> None:
         self.hub: Hub = hub
         self.time: int = time
+        self.hub_index: int = hub_index
         self.is_priority: bool = self.hub.zone == ZoneType.PRIORITY
         self.is_end: bool = hub.category == NodeCategory.END
-        self.current_drones: int = initial_drones
+        self._hash = hash((hub.name, time))
 
-    def can_enter(self) -> bool:
+    def can_enter(self, reservations: ReservationTable) -> bool:
         """Check if a drone can enter this node."""
-        return self.current_drones < self.hub.max_drones
+        return reservations.hub_has_room(self.hub_index, self.time)
 
-    def add_drone(self) -> None:
-        """Register a drone entering this node."""
-        self.current_drones += 1
+    def room(self, reservations: ReservationTable) -> int:
+        """Number of drones that can still enter this node."""
+        return reservations.hub_room(self.hub_index, self.time)
+
+    def add_drone(
+        self, reservations: ReservationTable, count: int = 1
+    ) -> None:
+        """Register count drones entering this node."""
+        reservations.add_hub_drone(self.hub_index, self.time, count)
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, TimeNode):
@@ -52,7 +258,7 @@ class TimeNode:
         return False
 
     def __hash__(self) -> int:
-        return hash((self.hub.name, self.time))
+        return self._hash
 
     def __repr__(self) -> str:
         return f"TimeNode({self.hub.name}, t={self.time})"
@@ -62,35 +268,59 @@ class TimeEdge:
     """
     Represents a directed edge between two
     TimeNodes in the Time-Expanded Graph.
+    Wait edges have no connection id: their usage is bounded
+    by the occupancy of their target node.
     """
 
     def __init__(
-        self, source: TimeNode, target: TimeNode, max_capacity: int = 1
+        self,
+        source: TimeNode,
+        target: TimeNode,
+        max_capacity: int = 1,
+        connection_id: int = -1,
     ) -> None:
         self.source = source
         self.target = target
         self.duration = target.time - source.time
         self.max_capacity = max_capacity
+        self.connection_id = connection_id
 
     def __hash__(self) -> int:
         return hash((self.source, self.target))
 
-    def is_traversable(self, tracker: EdgeTracker) -> bool:
+    def is_traversable(self, reservations: ReservationTable) -> bool:
         """
         Checks if the edge has sufficient capacity
         for the entire duration of the traversal.
         """
-        for turn in range(self.duration):
-            current_drones = tracker.get_current_drones(
-                self, self.source.time + turn
+        if self.connection_id < 0:
+            return True
+        return reservations.link_has_room(
+            self.connection_id, self.source.time, self.duration
+        )
+
+    def room(self, reservations: ReservationTable) -> int:
+        """
+        Number of drones that can still traverse this edge,
+        counting the link and the target node.
+        """
+        room = self.target.room(reservations)
+        if self.connection_id >= 0:
+            room = min(
+                room,
+                reservations.link_room(
+                    self.connection_id, self.source.time, self.duration
+                ),
             )
-            if current_drones >= self.max_capacity:
-                return False
-        return True
+        return room
 
-    def use_edge(self, tracker: EdgeTracker) -> None:
+    def use_edge(
+        self, reservations: ReservationTable, count: int = 1
+    ) -> None:
         """
         Registers the occupation of this edge for all turns of traversal.
         """
-        for turn in range(self.duration):
-            tracker.add_drone(self, self.source.time + turn)
+        if self.connection_id >= 0:
+            reservations.add_link_drone(
+                self.connection_id, self.source.time, self.duration, count
+            )
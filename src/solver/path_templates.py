@@ -0,0 +1,227 @@
+from __future__ import annotations
+import hashlib
+import heapq
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from src.schemas.simulation_map import SimulationMap
+from src.schemas.definitions import NodeCategory, ZoneType
+from src.solver.bucket_queue import BucketQueue
+
+Cost = Tuple[int, int]
+
+
+def map_hash(simulation: SimulationMap) -> str:
+    """
+    Fingerprint of everything the static routes depend on: hubs in
+    declaration order (which fixes the hub indexes) with their category,
+    zone and capacity, and every connection with its capacity.
+    The fleet size is left out, routes do not depend on it.
+    """
+    payload = {
+        "hubs": [
+            [name, hub.category.value, hub.zone.value, hub.max_drones]
+            for name, hub in simulation.hubs.items()
+        ],
+        "connections": sorted(
+            [source, target, connection.max_link_capacity]
+            for source, targets in simulation.connections.items()
+            for target, connection in targets.items()
+        ),
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class PathTemplates:
+    """
+    The k best static START-END routes of a map, as hub-index arrays.
+
+    Routes are ranked like FlowSolver paths: fewest turns first
+    (entering a restricted hub costs 2), most priority zones second.
+    They are simple paths found with Yen's algorithm over the static
+    graph, so they hold no waits: FlowSolver places them in the TEG
+    by delaying their departure from START.
+
+    Hub indexes follow TimeGraph.hub_indexes, i.e. non-blocked hubs
+    in declaration order. When cache_dir is given, routes are stored
+    there as JSON under the map hash and reused by later runs.
+    """
+
+    def __init__(
+        self,
+        simulation: SimulationMap,
+        k: int = 8,
+        cache_dir: Optional[Path] = None,
+    ) -> None:
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        self.key = map_hash(simulation)
+        self.k = k
+        self.hubs = [
+            hub for hub in simulation.hubs.values()
+            if hub.zone != ZoneType.BLOCKED
+        ]
+        hub_indexes = {hub.name: index for index, hub in enumerate(self.hubs)}
+        self.neighbors: List[List[int]] = [[] for _ in self.hubs]
+        for source, targets in simulation.connections.items():
+            if source not in hub_indexes:
+                continue
+            for target in targets:
+                if target in hub_indexes:
+                    self.neighbors[hub_indexes[source]].append(
+                        hub_indexes[target]
+                    )
+        self.durations = [
+            2 if hub.zone == ZoneType.RESTRICTED else 1 for hub in self.hubs
+        ]
+        self.bonus = [
+            1 if hub.zone == ZoneType.PRIORITY else 0 for hub in self.hubs
+        ]
+        self.loaded = False
+
+        cache_file = (
+            cache_dir / f"{self.key}.json" if cache_dir is not None else None
+        )
+        cached = self._load(cache_file) if cache_file is not None else None
+        if cached is not None:
+            self.routes = cached
+            self.loaded = True
+        else:
+            self.routes = self._k_best_routes()
+            if cache_file is not None:
+                self._save(cache_file)
+
+    def cost(self, route: List[int]) -> Cost:
+        """Returns (turns, -priorities) of a route."""
+        return (
+            sum(self.durations[hub] for hub in route[1:]),
+            -sum(self.bonus[hub] for hub in route),
+        )
+
+    def offsets(self, route: List[int]) -> List[int]:
+        """Turn at which each hub of the route is reached."""
+        times = [0]
+        for hub in route[1:]:
+            times.append(times[-1] + self.durations[hub])
+        return times
+
+    def _load(self, cache_file: Path) -> Optional[List[List[int]]]:
+        """
+        Reads routes stored by an earlier run, or None if the file is
+        missing, belongs to another map or holds fewer than k routes
+        while more may exist.
+        """
+        if not cache_file.is_file():
+            return None
+        try:
+            data = json.loads(cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("map") != self.key:
+            return None
+        routes: List[List[int]] = data.get("routes", [])
+        if len(routes) < self.k and data.get("k", 0) < self.k:
+            return None
+        return routes[:self.k]
+
+    def _save(self, cache_file: Path) -> None:
+        """Writes the routes as JSON, keyed by the map hash."""
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(
+            json.dumps({"map": self.key, "k": self.k, "routes": self.routes}),
+            encoding="utf-8",
+        )
+
+    def _best_route(
+        self,
+        source: int,
+        banned_hubs: Set[int],
+        banned_moves: Set[Tuple[int, int]],
+    ) -> Optional[List[int]]:
+        """
+        Dijkstra on (turns, -priorities) from source to END, avoiding
+        banned hubs and moves. Every move costs at least one turn, so
+        the lexicographic cost is still monotone along a route.
+        """
+        start_cost: Cost = (0, -self.bonus[source])
+        best: Dict[int, Cost] = {source: start_cost}
+        came_from: Dict[int, int] = {}
+        pq: BucketQueue[Tuple[int, int]] = BucketQueue()
+        pq.push(0, (start_cost[1], source))
+        done: Set[int] = set()
+
+        while pq:
+            turns, (neg_priority, hub) = pq.pop()
+            if hub in done:
+                continue
+            done.add(hub)
+
+            if self.hubs[hub].category == NodeCategory.END:
+                route = [hub]
+                while route[-1] != source:
+                    route.append(came_from[route[-1]])
+                route.reverse()
+                return route
+
+            for target in self.neighbors[hub]:
+                if (
+                    target in done
+                    or target in banned_hubs
+                    or (hub, target) in banned_moves
+                ):
+                    continue
+                new_cost = (
+                    turns + self.durations[target],
+                    neg_priority - self.bonus[target],
+                )
+                if target not in best or new_cost < best[target]:
+                    best[target] = new_cost
+                    came_from[target] = hub
+                    pq.push(new_cost[0], (new_cost[1], target))
+
+        return None
+
+    def _k_best_routes(self) -> List[List[int]]:
+        """Yen's algorithm: the k best loopless START-END routes."""
+        start = next(
+            (
+                index for index, hub in enumerate(self.hubs)
+                if hub.category == NodeCategory.START
+            ),
+            None,
+        )
+        if start is None:
+            return []
+        first = self._best_route(start, set(), set())
+        if first is None:
+            return []
+
+        routes = [first]
+        candidates: List[Tuple[Cost, List[int]]] = []
+        seen = {tuple(first)}
+
+        while len(routes) < self.k:
+            previous = routes[-1]
+            for position in range(len(previous) - 1):
+                root = previous[:position + 1]
+                banned_moves = {
+                    (route[position], route[position + 1])
+                    for route in routes
+                    if route[:position + 1] == root
+                }
+                spur = self._best_route(
+                    root[-1], set(root[:-1]), banned_moves
+                )
+                if spur is None:
+                    continue
+                route = root[:-1] + spur
+                if tuple(route) not in seen:
+                    seen.add(tuple(route))
+                    heapq.heappush(candidates, (self.cost(route), route))
+
+            if not candidates:
+                break
+            routes.append(heapq.heappop(candidates)[1])
+
+        return routes
@@ -0,0 +1,248 @@
+from __future__ import annotations
+import os
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection, wait
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.schemas.simulation_map import SimulationMap
+from src.schemas.definitions import ZoneType
+from src.solver.base_solver import BaseSolver
+from src.solver.flow_solver import FlowSolver
+from src.solver.horizon_planner import HorizonPlanner
+from src.solver.min_cost_flow import MinCostFlowSolver
+from src.solver.models import TimeNode
+from src.solver.sipp_solver import SippSolver
+from src.solver.time_estimator import NoPathError
+from src.solver.time_graph import TimeGraph
+from src.solver.twin_hubs import TwinHubSolver
+
+# drone id -> (hub name, turn) steps, the picklable form of a schedule
+Schedule = Dict[int, List[Tuple[str, int]]]
+Job = Tuple[SimulationMap, str, int, int]
+
+
+def run_strategy(job: Job) -> Tuple[str, Schedule]:
+    """
+    Routes the fleet with one strategy on its own graph and returns
+    (strategy, schedule). Runs in a worker process and prints
+    nothing: PortfolioSolver reports the winner's unrouted drones.
+    """
+    simulation, strategy, max_time, max_horizon = job
+    nb_drones = simulation.nb_drones
+    solver: BaseSolver
+    if strategy == "sequential":
+        solver = FlowSolver(
+            TimeGraph(simulation, max_time, prune=True),
+            nb_drones,
+            max_horizon=max_horizon,
+        )
+    elif strategy == "bulk":
+        solver = FlowSolver(
+            TimeGraph(simulation, max_time),
+            nb_drones,
+            max_horizon=max_horizon,
+            bulk=True,
+        )
+    elif strategy == "min_cost_flow":
+        solver = MinCostFlowSolver(TimeGraph(simulation, max_time), nb_drones)
+    elif strategy == "sipp":
+        solver = SippSolver(simulation, nb_drones, max_horizon)
+    else:
+        solver = TwinHubSolver(simulation, max_time)
+
+    solver.route_drones()
+    return strategy, {
+        drone_id: [(node.hub.name, node.time) for node in path]
+        for drone_id, path in solver.drone_paths.items()
+    }
+
+
+def _work(job: Job, connection: Connection) -> None:
+    """
+    Body of a worker process: sends back (result, None), or
+    (None, error) when the strategy raised.
+    """
+    try:
+        connection.send((run_strategy(job), None))
+    except Exception as error:
+        connection.send((None, error))
+    finally:
+        connection.close()
+
+
+def _stop(running: Dict[Connection, Tuple[Process, str]]) -> None:
+    """
+    Kills the workers still routing once the race is decided,
+    then reaps them and closes their pipes.
+    """
+    for process, _ in running.values():
+        if process.is_alive():
+            process.terminate()
+    for reader, (process, _) in running.items():
+        process.join()
+        reader.close()
+
+
+class PortfolioSolver(BaseSolver):
+    """
+    Races several routing strategies in worker processes and keeps
+    the schedule with the smallest final turn.
+
+    Every strategy builds its own graph from the map. HorizonPlanner
+    gives a makespan no schedule can beat (lower_bound): as soon as
+    a strategy routes the whole fleet by then, the strategies not
+    started yet are dropped and the running ones killed. Otherwise
+    the best schedule wins, ties going to the strategy listed first.
+    Drones are interchangeable, so the strategies differ by engine
+    rather than by drone order.
+    """
+
+    STRATEGIES = ("sequential", "bulk", "min_cost_flow", "sipp", "twin")
+
+    def __init__(
+        self,
+        simulation: SimulationMap,
+        strategies: Sequence[str] = STRATEGIES,
+        workers: Optional[int] = None,
+    ) -> None:
+        for strategy in strategies:
+            if strategy not in self.STRATEGIES:
+                raise ValueError(
+                    f"Unknown strategy '{strategy}'. "
+                    f"Allowed: {self.STRATEGIES}"
+                )
+        if not strategies:
+            raise ValueError("The portfolio needs at least one strategy")
+        super().__init__(simulation.nb_drones)
+        self.simulation = simulation
+        self.strategies = tuple(strategies)
+        self.workers = (
+            workers
+            if workers is not None
+            else min(len(self.strategies), os.cpu_count() or 1)
+        )
+        self.lower_bound = -1
+        self.winner: Optional[str] = None
+        self.makespans: Dict[str, int] = {}
+
+    def _score(self, strategy: str, schedule: Schedule) -> Tuple[int, ...]:
+        """Unrouted drones, then final turn, then portfolio order."""
+        makespan = max(
+            (steps[-1][1] for steps in schedule.values() if steps),
+            default=0,
+        )
+        return (
+            self.nb_drones - len(schedule),
+            makespan,
+            self.strategies.index(strategy),
+        )
+
+    def _results(self, jobs: List[Job]) -> List[Tuple[str, Schedule]]:
+        """
+        Runs the jobs, in process when there is a single worker,
+        and stops at the first schedule reaching lower_bound.
+        """
+        results: List[Tuple[str, Schedule]] = []
+        if self.workers <= 1:
+            for job in jobs:
+                results.append(run_strategy(job))
+                if self._optimal(*results[-1]):
+                    break
+            return results
+
+        # one process per job, at most workers at once, each sending
+        # its schedule back through its own pipe
+        running: Dict[Connection, Tuple[Process, str]] = {}
+        pending = list(jobs)
+        try:
+            while pending or running:
+                while pending and len(running) < self.workers:
+                    job = pending.pop(0)
+                    reader, writer = Pipe(duplex=False)
+                    process = Process(
+                        target=_work, args=(job, writer), daemon=True
+                    )
+                    process.start()
+                    writer.close()
+                    running[reader] = (process, job[1])
+
+                ready = wait(list(running))
+                for reader in [conn for conn in running if conn in ready]:
+                    process, strategy = running.pop(reader)
+                    try:
+                        result, error = reader.recv()
+                    except EOFError:
+                        process.join()
+                        raise RuntimeError(
+                            f"Strategy '{strategy}' exited with code "
+                            f"{process.exitcode} without a schedule"
+                        ) from None
+                    finally:
+                        reader.close()
+                        process.join()
+                    if error is not None:
+                        raise error
+                    results.append(result)
+                    if self._optimal(*result):
+                        return results
+        finally:
+            _stop(running)
+        return results
+
+    def _optimal(self, strategy: str, schedule: Schedule) -> bool:
+        """
+        Records the final turn of a schedule and checks if it
+        routes everyone by lower_bound.
+        """
+        unrouted, makespan, _ = self._score(strategy, schedule)
+        self.makespans[strategy] = makespan
+        return unrouted == 0 and makespan <= self.lower_bound
+
+    def route_drones(self) -> List[int]:
+        """
+        Races the strategies and keeps the best schedule.
+        Returns the ids of the drones it leaves without a path.
+        """
+        planner = HorizonPlanner(self.simulation)
+        self.lower_bound = planner.plan()
+        if self.lower_bound < 0:
+            raise NoPathError("No path exists from START to END")
+
+        jobs: List[Job] = [
+            (self.simulation, strategy, self.lower_bound, planner.upper_bound)
+            for strategy in self.strategies
+        ]
+        self.winner, schedule = min(
+            self._results(jobs),
+            key=lambda result: self._score(*result),
+        )
+
+        hubs = self.simulation.hubs
+        hub_indexes = {
+            name: index
+            for index, name in enumerate(
+                name for name, hub in hubs.items()
+                if hub.zone != ZoneType.BLOCKED
+            )
+        }
+        for drone_id, steps in schedule.items():
+            self.drone_paths[drone_id] = [
+                TimeNode(hubs[name], time, hub_indexes[name])
+                for name, time in steps
+            ]
+        self._create_drones()
+
+        return [
+            drone_id for drone_id in range(1, self.nb_drones + 1)
+            if drone_id not in schedule
+        ]
+
+
+def solve_with_portfolio(
+    simulation: SimulationMap,
+    strategies: Sequence[str] = PortfolioSolver.STRATEGIES,
+    workers: Optional[int] = None,
+) -> PortfolioSolver:
+    """Routes the fleet with the best schedule of the portfolio."""
+    solver = PortfolioSolver(simulation, strategies, workers)
+    solver.solve_all_drones()
+    return solver
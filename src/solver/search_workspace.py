@@ -0,0 +1,137 @@
+from __future__ import annotations
+from array import array
+from typing import List, Optional
+from src.schemas.definitions import NodeCategory
+from src.solver.models import TimeEdge, TimeNode
+
+
+class SearchWorkspace:
+    """
+    Label storage reused by every search of a FlowSolver.
+
+    A state (hub, turn) is the integer id turn * nb_hubs + hub_index,
+    so appending time layers only appends to the arrays. Each search
+    starts a new generation: a slot whose stamp is older than the
+    generation is free, so reset is O(1) whatever the graph size.
+    nodes keeps the TimeNode of every state met so far (a state always
+    maps to the same node, so it is never cleared) and edges the edge
+    each labelled state was reached through, so a found path comes
+    with its edges.
+
+    Queue items are single integers: order packs
+    (turns, -priorities, not_start, hub_index), the tie key of
+    FlowSolver._precedes, and the state id can be read back from it.
+    """
+
+    def __init__(self, nb_hubs: int, max_time: int) -> None:
+        self.nb_hubs = max(1, nb_hubs)
+        self.max_time = -1
+        self.generation = 0
+        self.width = 1
+        self.start_time = 0
+        self.stamp = array("i")
+        self.priority = array("i")
+        self.parent = array("i")
+        self.order = array("q")
+        self.nodes: List[Optional[TimeNode]] = []
+        self.edges: List[Optional[TimeEdge]] = []
+        self.ensure(max_time)
+
+    def ensure(self, max_time: int) -> None:
+        """Grows the arrays to hold every state up to max_time."""
+        if max_time <= self.max_time:
+            return
+        extra = (max_time - self.max_time) * self.nb_hubs
+        self.stamp.extend(array("i", [0]) * extra)
+        self.priority.extend(array("i", [0]) * extra)
+        self.parent.extend(array("i", [-1]) * extra)
+        self.order.extend(array("q", [0]) * extra)
+        self.nodes.extend([None] * extra)
+        self.edges.extend([None] * extra)
+        self.max_time = max_time
+
+    def reset(self, max_time: int, start_time: int) -> None:
+        """Forgets every label, for a search starting at start_time."""
+        self.ensure(max_time)
+        self.generation += 1
+        self.start_time = start_time
+        self.width = max_time - start_time + 2
+
+    def node_id(self, hub_index: int, time: int) -> int:
+        """Id of the state of a hub at a turn."""
+        return time * self.nb_hubs + hub_index
+
+    def is_labelled(self, node_id: int) -> bool:
+        """Check if the state got a label in the current search."""
+        return self.stamp[node_id] >= 2 * self.generation
+
+    def is_closed(self, node_id: int) -> bool:
+        """Check if the state was expanded in the current search."""
+        return self.stamp[node_id] == 2 * self.generation + 1
+
+    def close(self, node_id: int) -> None:
+        """Marks the state as expanded."""
+        self.stamp[node_id] = 2 * self.generation + 1
+
+    def label(
+        self, node: TimeNode, priority: int, edge: Optional[TimeEdge]
+    ) -> int:
+        """
+        Sets the label of a node reached through edge (None for the
+        start) with priority zones, and returns its order.
+        """
+        node_id = node.time * self.nb_hubs + node.hub_index
+        parent = -1
+        if edge is not None:
+            parent = edge.source.time * self.nb_hubs + edge.source.hub_index
+        not_start = node.hub.category != NodeCategory.START
+        order = (
+            (
+                (node.time - self.start_time) * self.width
+                + self.width - 1 - priority
+            ) * 2
+            + not_start
+        ) * self.nb_hubs + node.hub_index
+        self.nodes[node_id] = node
+        self.stamp[node_id] = 2 * self.generation
+        self.priority[node_id] = priority
+        self.parent[node_id] = parent
+        self.order[node_id] = order
+        self.edges[node_id] = edge
+        return order
+
+    def relink(self, node_id: int, edge: TimeEdge) -> None:
+        """Keeps the label of the state but reaches it through edge."""
+        source = edge.source
+        self.parent[node_id] = source.time * self.nb_hubs + source.hub_index
+        self.edges[node_id] = edge
+
+    def node_of(self, order: int) -> int:
+        """Id of the state an order was built for."""
+        turns = order // (2 * self.width * self.nb_hubs)
+        return (
+            (turns + self.start_time) * self.nb_hubs
+            + order % self.nb_hubs
+        )
+
+    def path(self, node_id: int) -> List[TimeNode]:
+        """Nodes from the start to the state node_id, following parents."""
+        path: List[TimeNode] = []
+        while node_id >= 0:
+            node = self.nodes[node_id]
+            if node is not None:
+                path.append(node)
+            node_id = self.parent[node_id]
+        path.reverse()
+        return path
+
+    def path_edges(self, node_id: int) -> List[TimeEdge]:
+        """Edges from the start to the state node_id."""
+        edges: List[TimeEdge] = []
+        edge = self.edges[node_id]
+        while edge is not None:
+            edges.append(edge)
+            source = edge.source
+            edge = self.edges[source.time * self.nb_hubs + source.hub_index]
+        edges.reverse()
+        return edges
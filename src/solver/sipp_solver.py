@@ -0,0 +1,424 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+from src.schemas.simulation_map import SimulationMap
+from src.schemas.definitions import NodeCategory, ZoneType
+from src.solver.base_solver import BaseSolver
+from src.solver.bucket_queue import BucketQueue
+from src.solver.models import TimeNode
+from src.solver.time_estimator import estimate_min_path_length
+
+
+class IntervalReservations:
+    """
+    Hub and connection usage stored per reservation, not per turn.
+
+    Counters only exist for turns some drone actually uses, and each
+    hub / connection keeps the sorted list of its full turns, from
+    which safe intervals are read with bisect. END absorbs drones, so
+    it only stores the turn from which it is full.
+    """
+
+    def __init__(
+        self,
+        hub_capacity: List[int],
+        link_capacity: List[int],
+        absorbing: List[bool],
+    ) -> None:
+        self.hub_capacity = hub_capacity
+        self.link_capacity = link_capacity
+        self.absorbing = absorbing
+        self.hub_counts: Dict[Tuple[int, int], int] = {}
+        self.link_counts: Dict[Tuple[int, int], int] = {}
+        self.hub_full: List[List[int]] = [[] for _ in hub_capacity]
+        self.link_full: List[List[int]] = [[] for _ in link_capacity]
+        self.arrivals: List[List[int]] = [[] for _ in hub_capacity]
+        self.full_from: List[Optional[int]] = [None] * len(hub_capacity)
+
+    def is_hub_full(self, hub_index: int, time: int) -> bool:
+        """Check if no drone can be added at the hub at time."""
+        full_from = self.full_from[hub_index]
+        if full_from is not None and time >= full_from:
+            return True
+        full = self.hub_full[hub_index]
+        position = bisect_left(full, time)
+        return position < len(full) and full[position] == time
+
+    def safe_interval(
+        self, hub_index: int, time: int, max_time: int
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Returns the maximal run of free turns (first, last)
+        around time, or None if the hub is full at time.
+        """
+        if self.is_hub_full(hub_index, time):
+            return None
+        full = self.hub_full[hub_index]
+        position = bisect_left(full, time)
+        first = full[position - 1] + 1 if position > 0 else 0
+        last = full[position] - 1 if position < len(full) else max_time
+        full_from = self.full_from[hub_index]
+        if full_from is not None:
+            last = min(last, full_from - 1)
+        return first, min(last, max_time)
+
+    def next_free_turn(self, hub_index: int, time: int) -> Optional[int]:
+        """Returns the first turn >= time with room at the hub."""
+        full = self.hub_full[hub_index]
+        position = bisect_left(full, time)
+        while position < len(full) and full[position] == time:
+            time += 1
+            position += 1
+        full_from = self.full_from[hub_index]
+        if full_from is not None and time >= full_from:
+            return None
+        return time
+
+    def blocked_link_turn(
+        self, link_id: int, time: int, duration: int
+    ) -> Optional[int]:
+        """
+        Returns the first full turn of the link during a traversal
+        starting at time, or None if the link has room throughout.
+        """
+        full = self.link_full[link_id]
+        position = bisect_left(full, time)
+        if position < len(full) and full[position] < time + duration:
+            return full[position]
+        return None
+
+    def add_hub_drone(self, hub_index: int, time: int) -> None:
+        """Register a drone at the hub at a specific time."""
+        if self.absorbing[hub_index]:
+            arrivals = self.arrivals[hub_index]
+            insort(arrivals, time)
+            capacity = self.hub_capacity[hub_index]
+            if len(arrivals) >= capacity:
+                self.full_from[hub_index] = arrivals[capacity - 1]
+            return
+
+        key = (hub_index, time)
+        count = self.hub_counts.get(key, 0) + 1
+        self.hub_counts[key] = count
+        if count == self.hub_capacity[hub_index]:
+            insort(self.hub_full[hub_index], time)
+
+    def add_link_drone(self, link_id: int, time: int, duration: int) -> None:
+        """Register a drone on the connection for every turn of traversal."""
+        for turn in range(time, time + duration):
+            key = (link_id, turn)
+            count = self.link_counts.get(key, 0) + 1
+            self.link_counts[key] = count
+            if count == self.link_capacity[link_id]:
+                insort(self.link_full[link_id], turn)
+
+    def hub_drones(self, hub_index: int, time: int) -> int:
+        """Number of drones at the hub at time."""
+        if self.absorbing[hub_index]:
+            return bisect_right(self.arrivals[hub_index], time)
+        return self.hub_counts.get((hub_index, time), 0)
+
+
+class SippSolver(BaseSolver):
+    """
+    Safe-interval path planning: routes drones without a TEG.
+
+    A search state is (hub, safe interval), the maximal run of turns
+    where the hub has room, entered at some turn with some priority
+    count. Waiting at a normal hub adds nothing, so it collapses into
+    a single jump to the first departure that fits the link and the
+    target interval. Waiting at a priority hub earns one priority per
+    turn, so those waits are expanded turn by turn. At a normal hub a
+    label is dropped when an earlier label of the same interval has at
+    least as many priorities, since it can wait into it. Labels pop by
+    (turns, -priorities) as in FlowSolver, so arrival turn and priority
+    count match its result.
+
+    The expanded labels give the best priority count of every
+    (hub, turn) the search went through. The path is then traced back
+    from END turn by turn, taking the predecessor FlowSolver._precedes
+    would keep: earliest turn, then START, then lowest hub index. A
+    drone therefore waits where FlowSolver makes it wait, and both
+    engines give the same paths to the whole fleet.
+    Memory follows reservations: the horizon is just a bound.
+    """
+
+    def __init__(
+        self,
+        simulation: SimulationMap,
+        nb_drones: int,
+        max_time: Optional[int] = None,
+    ) -> None:
+        super().__init__(nb_drones)
+        self.simulation = simulation
+        self.max_time = (
+            max_time
+            if max_time is not None
+            else nb_drones * estimate_min_path_length(simulation)
+        )
+        self.expansions = 0
+
+        self.hubs = [
+            hub for hub in simulation.hubs.values()
+            if hub.zone != ZoneType.BLOCKED
+        ]
+        self.hub_indexes: Dict[str, int] = {
+            hub.name: index for index, hub in enumerate(self.hubs)
+        }
+        self.is_priority = [hub.zone == ZoneType.PRIORITY for hub in self.hubs]
+        self.neighbors: List[List[Tuple[int, int, int]]] = [
+            [] for _ in self.hubs
+        ]
+        self.predecessors: List[List[Tuple[int, int, int]]] = [
+            [] for _ in self.hubs
+        ]
+        link_ids: Dict[Tuple[int, int], int] = {}
+        link_capacity: List[int] = []
+
+        for source, targets in simulation.connections.items():
+            source_index = self.hub_indexes.get(source)
+            if source_index is None:
+                continue
+            for target, connection in targets.items():
+                target_index = self.hub_indexes.get(target)
+                if target_index is None:
+                    continue
+                key = (
+                    min(source_index, target_index),
+                    max(source_index, target_index),
+                )
+                if key not in link_ids:
+                    link_ids[key] = len(link_capacity)
+                    link_capacity.append(connection.max_link_capacity)
+                duration = (
+                    2 if self.hubs[target_index].zone == ZoneType.RESTRICTED
+                    else 1
+                )
+                self.neighbors[source_index].append(
+                    (target_index, duration, link_ids[key])
+                )
+                self.predecessors[target_index].append(
+                    (source_index, duration, link_ids[key])
+                )
+
+        # (hub, interval start) -> expanded (turn, priorities), sorted
+        self._reached: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        self.reservations = IntervalReservations(
+            [hub.max_drones for hub in self.hubs],
+            link_capacity,
+            [hub.category == NodeCategory.END for hub in self.hubs],
+        )
+
+    def find_start_index(self) -> int:
+        """Returns the hub index of START."""
+        for index, hub in enumerate(self.hubs):
+            if hub.category == NodeCategory.START:
+                return index
+        raise ValueError("No START node found at time=0")
+
+    def solve_for_drone(
+        self, drone_id: int, start_index: int
+    ) -> Optional[List[TimeNode]]:
+        """
+        Finds the earliest arrival at END with the most priority zones,
+        searching over (hub, safe interval) states.
+        """
+        reservations = self.reservations
+        max_time = self.max_time
+        start_interval = reservations.safe_interval(start_index, 0, max_time)
+        if start_interval is None:
+            return None
+
+        start_priority = 1 if self.is_priority[start_index] else 0
+        # label: (hub, interval, turn, priorities)
+        labels: List[Tuple[int, Tuple[int, int], int, int]] = [
+            (start_index, start_interval, 0, start_priority)
+        ]
+        pq: BucketQueue[Tuple[int, int, int]] = BucketQueue()
+        pq.push(0, (-start_priority, start_index, 0))
+        best: Dict[Tuple[int, int, int], int] = {}
+        self._reached = {}
+
+        while pq:
+            _, (_, _, label_id) = pq.pop()
+            hub, interval, time, priority = labels[label_id]
+            is_priority = self.is_priority[hub]
+
+            state = (hub, interval[0], time if is_priority else -1)
+            if best.get(state, -1) >= priority:
+                continue
+            best[state] = priority
+            self.expansions += 1
+
+            if self.hubs[hub].category == NodeCategory.END:
+                return self._trace_back(hub, time, priority)
+            self._reached.setdefault((hub, interval[0]), []).append(
+                (time, priority)
+            )
+
+            successors: List[Tuple[int, Tuple[int, int], int, int]] = []
+            if is_priority:
+                if time + 1 <= interval[1]:
+                    successors.append(
+                        (hub, interval, time + 1, priority + 1)
+                    )
+                last_departure = time
+            else:
+                last_departure = interval[1]
+
+            for target, duration, link_id in self.neighbors[hub]:
+                self._add_moves(
+                    successors, time, last_departure, priority,
+                    target, duration, link_id,
+                )
+
+            for successor in successors:
+                labels.append(successor)
+                target, _, arrival, new_priority = successor
+                pq.push(arrival, (-new_priority, target, len(labels) - 1))
+
+        return None
+
+    def _add_moves(
+        self,
+        successors: List[Tuple[int, Tuple[int, int], int, int]],
+        first_departure: int,
+        last_departure: int,
+        priority: int,
+        target: int,
+        duration: int,
+        link_id: int,
+    ) -> None:
+        """
+        Appends one move per safe interval of target, departing at the
+        earliest turn of the window whose link turns have room.
+        """
+        reservations = self.reservations
+        max_time = self.max_time
+        bonus = 1 if self.is_priority[target] else 0
+        arrival = first_departure + duration
+        last_arrival = min(last_departure + duration, max_time)
+
+        while arrival <= last_arrival:
+            free = reservations.next_free_turn(target, arrival)
+            if free is None or free > last_arrival:
+                return
+            arrival = free
+
+            blocked = reservations.blocked_link_turn(
+                link_id, arrival - duration, duration
+            )
+            if blocked is not None:
+                arrival = blocked + 1 + duration
+                continue
+
+            interval = reservations.safe_interval(target, arrival, max_time)
+            if interval is None:
+                return
+            successors.append((target, interval, arrival, priority + bonus))
+            arrival = interval[1] + 1
+
+    def _priority_at(self, hub: int, time: int) -> Optional[int]:
+        """
+        Best priority count of (hub, time) in the last search, or None
+        if the search did not reach it. At a normal hub the drone may
+        have waited since the last label of the interval before time.
+        """
+        if time < 0:
+            return None
+        interval = self.reservations.safe_interval(hub, time, self.max_time)
+        if interval is None:
+            return None
+        reached = self._reached.get((hub, interval[0]))
+        if not reached:
+            return None
+        position = bisect_left(reached, (time + 1,))
+        if position == 0:
+            return None
+        turn, priority = reached[position - 1]
+        if self.is_priority[hub] and turn != time:
+            return None
+        return priority
+
+    def _trace_back(
+        self, hub: int, time: int, priority: int
+    ) -> Optional[List[TimeNode]]:
+        """
+        Rebuilds the turn-by-turn path ending at (hub, time). Among the
+        predecessors holding the label minus the bonus of the current
+        hub, keeps the one FlowSolver pops first: (turn, not START,
+        hub index), through a link with room for the whole traversal.
+        """
+        hubs = self.hubs
+        path = [TimeNode(self.hubs[hub], time, hub)]
+        while time > 0:
+            wanted = priority - (1 if self.is_priority[hub] else 0)
+            best: Optional[Tuple[int, bool, int]] = None
+            if self._priority_at(hub, time - 1) == wanted:
+                best = (
+                    time - 1,
+                    hubs[hub].category != NodeCategory.START,
+                    hub,
+                )
+            for source, duration, link_id in self.predecessors[hub]:
+                departure = time - duration
+                key = (
+                    departure,
+                    hubs[source].category != NodeCategory.START,
+                    source,
+                )
+                if best is not None and best <= key:
+                    continue
+                if self._priority_at(source, departure) != wanted:
+                    continue
+                if self.reservations.blocked_link_turn(
+                    link_id, departure, duration
+                ) is not None:
+                    continue
+                best = key
+            if best is None:
+                return None
+            time, _, hub = best
+            priority = wanted
+            path.append(TimeNode(self.hubs[hub], time, hub))
+        path.reverse()
+        return path
+
+    def _reserve_path(self, path: List[TimeNode]) -> None:
+        """Reserve all hubs and links in a path."""
+        reservations = self.reservations
+        for node in path:
+            reservations.add_hub_drone(node.hub_index, node.time)
+
+        for source, target in zip(path, path[1:]):
+            if source.hub_index == target.hub_index:
+                continue
+            for neighbor, duration, link_id in self.neighbors[
+                source.hub_index
+            ]:
+                if neighbor == target.hub_index:
+                    reservations.add_link_drone(
+                        link_id, source.time, duration
+                    )
+                    break
+
+    def route_drones(self) -> List[int]:
+        """
+        Solves paths for all drones sequentially.
+        Returns the ids of the drones left without a path.
+        """
+        start_index = self.find_start_index()
+        unrouted: List[int] = []
+
+        for drone_id in range(1, self.nb_drones + 1):
+            path = self.solve_for_drone(drone_id, start_index)
+
+            if path:
+                self.drone_paths[drone_id] = path
+                self._reserve_path(path)
+            else:
+                unrouted.append(drone_id)
+
+        self._create_drones()
+
+        return unrouted
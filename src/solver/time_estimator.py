@@ -1,14 +1,21 @@
-from collections import deque
+import math
 from typing import Optional
 from src.schemas.simulation_map import SimulationMap
 from src.schemas.definitions import ZoneType, NodeCategory
+from src.solver.bucket_queue import BucketQueue
+from src.solver.max_flow import max_flow
+
+
+class NoPathError(ValueError):
+    """Raised when no drone can reach END from START."""
 
 
 def estimate_min_path_length(simulation: SimulationMap) -> int:
     """
-    Estimates minimum path length using BFS on static graph.
-    Accounts for restricted zones costing 2 turns.
-    Returns -1 if no path available
+    Exact minimum path length on the static graph.
+    Entering a restricted zone costs 2 turns, any other hub 1, so a
+    BucketQueue indexed by cost pops hubs in cost order without a
+    global heap. Returns -1 if no path available
     """
     start_hub: Optional[str] = None
     for hub in simulation.hubs.values():
@@ -24,50 +31,245 @@ def estimate_min_path_length(simulation: SimulationMap) -> int:
         if hub.category == NodeCategory.END
     )
 
-    visited: dict[str, int] = {}
-    queue = deque([(start_hub, 0)])
+    visited: set[str] = set()
+    queue: BucketQueue[str] = BucketQueue()
+    queue.push(0, start_hub)
 
     while queue:
-        current, cost_accumulated = queue.popleft()
-
+        cost_accumulated, current = queue.pop()
+        if current in visited:
+            continue
         if current in end_hubs:
             return cost_accumulated
+        visited.add(current)
 
-        if current in visited:
+        for neighbor in simulation.connections.get(current, {}):
+            hub_obj = simulation.hubs.get(neighbor)
+            if (
+                neighbor in visited
+                or hub_obj is None
+                or hub_obj.zone == ZoneType.BLOCKED
+            ):
+                continue
+            cost = 2 if hub_obj.zone == ZoneType.RESTRICTED else 1
+            queue.push(cost_accumulated + cost, neighbor)
+
+    return -1
+
+
+def static_min_cut(simulation: SimulationMap) -> float:
+    """
+    Drones per turn that can cross the static graph from START to END,
+    i.e. the START-END min-cut computed as a max-flow.
+
+    Hubs are split in two to count max_drones, START and END are
+    unbounded. A connection carries max_link_capacity drones in each
+    direction, but a drone entering a restricted zone holds its link
+    for 2 turns, so those links count for half. Capacities are doubled
+    to stay integral. Returns 0 if END is unreachable.
+    """
+    names = [
+        name for name, hub in simulation.hubs.items()
+        if hub.zone != ZoneType.BLOCKED
+    ]
+    index = {name: position for position, name in enumerate(names)}
+    out_arcs: list[list[int]] = [[] for _ in range(2 * len(names))]
+    arc_to: list[int] = []
+    arc_cap: list[int] = []
+    unbounded = 2 * sum(
+        connection.max_link_capacity
+        for targets in simulation.connections.values()
+        for connection in targets.values()
+    )
+
+    def add_arc(source: int, target: int, capacity: int) -> None:
+        out_arcs[source].append(len(arc_to))
+        arc_to.append(target)
+        arc_cap.append(capacity)
+        out_arcs[target].append(len(arc_to))
+        arc_to.append(source)
+        arc_cap.append(0)
+
+    source = sink = -1
+    for name in names:
+        hub = simulation.hubs[name]
+        vertex = 2 * index[name]
+        if hub.category == NodeCategory.START:
+            source = vertex
+        if hub.category == NodeCategory.END:
+            sink = vertex
+        if hub.category in (NodeCategory.START, NodeCategory.END):
+            add_arc(vertex, vertex + 1, unbounded)
+        else:
+            add_arc(vertex, vertex + 1, 2 * hub.max_drones)
+
+        for target, connection in simulation.connections.get(
+            name, {}
+        ).items():
+            if target not in index:
+                continue
+            capacity = 2 * connection.max_link_capacity
+            if simulation.hubs[target].zone == ZoneType.RESTRICTED:
+                capacity //= 2
+            add_arc(vertex + 1, 2 * index[target], capacity)
+
+    if source < 0 or sink < 0:
+        return 0
+    return max_flow(arc_to, arc_cap, out_arcs, source, sink, unbounded) / 2
+
+
+def _static_distances(
+    simulation: SimulationMap, category: NodeCategory, forward: bool
+) -> dict[str, int]:
+    """
+    Dijkstra over the static graph from every hub of a category.
+    Entering a restricted hub costs 2 turns, blocked hubs are
+    excluded. When forward is False connections are walked
+    backwards, so the cost is the one of the hub left behind.
+    """
+    neighbors: dict[str, list[str]] = {}
+    for source, targets in simulation.connections.items():
+        for target in targets:
+            if forward:
+                neighbors.setdefault(source, []).append(target)
+            else:
+                neighbors.setdefault(target, []).append(source)
+
+    distances: dict[str, int] = {}
+    queue: BucketQueue[str] = BucketQueue()
+    for name, hub in simulation.hubs.items():
+        if hub.category == category and hub.zone != ZoneType.BLOCKED:
+            queue.push(0, name)
+
+    while queue:
+        cost_accumulated, current = queue.pop()
+        if current in distances:
             continue
+        distances[current] = cost_accumulated
 
-        visited[current] = cost_accumulated
+        for neighbor in neighbors.get(current, []):
+            hub_obj = simulation.hubs.get(neighbor)
+            if (
+                neighbor in distances
+                or hub_obj is None
+                or hub_obj.zone == ZoneType.BLOCKED
+            ):
+                continue
+            entered = hub_obj if forward else simulation.hubs[current]
+            cost = 2 if entered.zone == ZoneType.RESTRICTED else 1
+            queue.push(cost_accumulated + cost, neighbor)
 
-        if current in simulation.connections:
-            for neighbor in simulation.connections[current]:
-                if neighbor not in visited:
-                    hub_obj = simulation.hubs.get(neighbor)
-                    if (
-                        hub_obj is not None
-                        and hub_obj.zone != ZoneType.BLOCKED
-                    ):
-                        cost = 2 if hub_obj.zone == ZoneType.RESTRICTED else 1
-                        queue.append((neighbor, cost_accumulated + cost))
+    return distances
 
-    return -1
 
+def distances_to_end(simulation: SimulationMap) -> dict[str, int]:
+    """
+    Exact static turns needed to reach END from every hub.
+    Runs Dijkstra from END on reversed connections, with the same
+    rules as estimate_min_path_length: entering a restricted hub
+    costs 2 turns, blocked hubs are excluded.
+    Hubs that cannot reach END are absent from the result.
+    """
+    return _static_distances(simulation, NodeCategory.END, forward=False)
 
-def estimate_max_time(simulation: SimulationMap) -> int:
+
+def distances_from_start(simulation: SimulationMap) -> dict[str, int]:
+    """
+    Exact static turns needed to reach every hub from START.
+    Hubs that START cannot reach are absent from the result.
+    """
+    return _static_distances(simulation, NodeCategory.START, forward=True)
+
+
+def max_priority_by_arrival(
+    simulation: SimulationMap, max_time: int
+) -> list[int]:
+    """
+    For every turn t up to max_time, the most priority zones a path
+    from START at 0 can count when it reaches END exactly at t,
+    ignoring capacities (-1 if END cannot be reached at t).
+    Reservations only remove paths, so this bounds any search.
+    """
+    unreached = -1
+    hubs = {
+        name: hub for name, hub in simulation.hubs.items()
+        if hub.zone != ZoneType.BLOCKED
+    }
+    bonus = {
+        name: 1 if hub.zone == ZoneType.PRIORITY else 0
+        for name, hub in hubs.items()
+    }
+    layers: list[dict[str, int]] = [{} for _ in range(max_time + 1)]
+    for name, hub in hubs.items():
+        if hub.category == NodeCategory.START:
+            layers[0][name] = bonus[name]
+
+    arrivals = [unreached] * (max_time + 1)
+    for time, layer in enumerate(layers):
+        for name, priority in layer.items():
+            if hubs[name].category == NodeCategory.END:
+                arrivals[time] = max(arrivals[time], priority)
+                continue
+            moves = [(name, 1)] + [
+                (target, 2 if hubs[target].zone == ZoneType.RESTRICTED else 1)
+                for target in simulation.connections.get(name, {})
+                if target in hubs
+            ]
+            for target, duration in moves:
+                if time + duration > max_time:
+                    continue
+                following = layers[time + duration]
+                new_priority = priority + bonus[target]
+                if following.get(target, unreached) < new_priority:
+                    following[target] = new_priority
+
+    return arrivals
+
+
+def estimate_horizon(simulation: SimulationMap, slack: int = 0) -> int:
     """
     Estimates time needed for all drones to reach END.
 
-    Formula: min_path_length + (nb_drones - 1)
+    Formula: min_path_length + ceil(nb_drones / min_cut) + slack
 
     Reasoning:
-    - In worst case (bottleneck with capacity=1), drones go one by one
     - Drone 1 arrives at: min_path
-    - Drone 2 arrives at: min_path + 1
-    - Drone N arrives at: min_path + (N-1)
+    - At most min_cut drones cross the START-END bottleneck per turn
+    - So the fleet needs about ceil(nb_drones / min_cut) more turns
+    - With a capacity-1 bottleneck this is min_path + nb_drones
+
+    This is an estimate, not a bound: it sizes the first TEG of an
+    engine that appends layers when a drone misses END (FlowSolver).
+    Fixed-horizon engines take estimate_max_time.
+    """
+    min_path = estimate_min_path_length(simulation)
+    if min_path <= 0:
+        return -1
+
+    cut = static_min_cut(simulation)
+    if cut <= 0:
+        return -1
+
+    return min_path + math.ceil(simulation.nb_drones / cut) + slack
+
+
+def estimate_max_time(simulation: SimulationMap) -> int:
+    """
+    Horizon within which every drone is guaranteed to reach END.
+
+    Formula: nb_drones * min_path_length
+
+    Reasoning:
+    - Drones are routed one after the other, each at its earliest
+    - Once the drones before it are absorbed by END, the graph is
+      empty and a drone waiting at START needs min_path turns
+    - So drone N arrives by N * min_path, by induction
 
-    This guarantees solution on first attempt.
+    min_path + nb_drones - 1 is not enough: a capacity-1 link into
+    a restricted zone lets a drone through every other turn only.
     """
     min_path = estimate_min_path_length(simulation)
     if min_path <= 0:
         return -1
 
-    return min_path + simulation.nb_drones - 1
+    return simulation.nb_drones * min_path
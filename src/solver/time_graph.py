@@ -2,8 +2,9 @@ from __future__ import annotations
 from typing import Dict, List, Optional, Set
 from src.schemas.hubs import Hub
 from src.schemas.simulation_map import SimulationMap
-from src.schemas.definitions import ZoneType
-from src.solver.models import TimeNode, TimeEdge
+from src.schemas.definitions import NodeCategory, ZoneType
+from src.solver.models import TimeNode, TimeEdge, ReservationTable
+from src.solver.time_estimator import distances_from_start, distances_to_end
 
 
 class TimeGraph:
@@ -11,40 +12,174 @@ class TimeGraph:
     Constructs and manages the Time-Expanded Graph by
     connecting nodes across time steps.
     Builds itself automatically upon instantiation.
+    hub_names lists the hubs by index; start_index (-1 without START)
+    and end_indexes are found once here.
+
+    With prune=True, (hub, t) is only created inside the hub's time
+    window: START cannot reach it before its static distance from
+    START, and it cannot reach END by max_time if t plus its static
+    distance to END is larger. Edges touching a pruned node are never
+    created either. pruned_nodes and pruned_edges count what the
+    full graph would have held on top of this one.
     """
 
-    def __init__(self, simulation: SimulationMap, max_time: int) -> None:
+    def __init__(
+        self, simulation: SimulationMap, max_time: int, prune: bool = False
+    ) -> None:
         self.max_time = max_time
         self.nodes: Set[TimeNode] = set()
         self._node_lookup: Dict[tuple[str, int], TimeNode] = {}
         self.edges: List[TimeEdge] = []
         self.simulation: SimulationMap = simulation
         self.adjacency: Dict[TimeNode, List[TimeEdge]] = {}
+        self.hub_indexes: Dict[str, int] = {
+            name: index
+            for index, name in enumerate(
+                name for name, hub in simulation.hubs.items()
+                if hub.zone != ZoneType.BLOCKED
+            )
+        }
+        self.hub_names: List[str] = list(self.hub_indexes)
+        self.start_index = next(
+            (
+                index for index, name in enumerate(self.hub_names)
+                if simulation.hubs[name].category == NodeCategory.START
+            ),
+            -1,
+        )
+        self.end_indexes: List[int] = [
+            index for index, name in enumerate(self.hub_names)
+            if simulation.hubs[name].category == NodeCategory.END
+        ]
+        self.connection_ids: Dict[tuple[str, str], int] = {}
+        self._link_capacity: List[int] = []
+        self.prune = prune
+        self.pruned_nodes = 0
+        self.pruned_edges = 0
+        self._from_start: Dict[str, int] = (
+            distances_from_start(simulation) if prune else {}
+        )
+        self._to_end: Dict[str, int] = (
+            distances_to_end(simulation) if prune else {}
+        )
+        self._index_connections()
+        self.reservations = self._create_reservations()
         self._build_graph()
 
+    def _index_connections(self) -> None:
+        """
+        Assigns an integer id to every undirected connection
+        between non-blocked hubs. Both directions share the id,
+        as they share the link capacity.
+        """
+        for source_name, targets in self.simulation.connections.items():
+            if source_name not in self.hub_indexes:
+                continue
+            for target_name, connection in targets.items():
+                if target_name not in self.hub_indexes:
+                    continue
+                key = self._connection_key(source_name, target_name)
+                if key not in self.connection_ids:
+                    self.connection_ids[key] = len(self._link_capacity)
+                    self._link_capacity.append(connection.max_link_capacity)
+
+    def _connection_key(
+        self, source_name: str, target_name: str
+    ) -> tuple[str, str]:
+        """Creates a normalized key that's the same for both directions."""
+        if source_name < target_name:
+            return (source_name, target_name)
+        return (target_name, source_name)
+
+    def _create_reservations(self) -> ReservationTable:
+        """Creates the dense hub x turn and connection x turn table."""
+        hub_capacity = [
+            self.simulation.hubs[name].max_drones for name in self.hub_indexes
+        ]
+        return ReservationTable(
+            hub_capacity,
+            self._link_capacity,
+            self.max_time,
+            self.end_indexes,
+        )
+
     def get_node(self, hub_name: str, time: int) -> Optional[TimeNode]:
         """Returns the TimeNode for a given hub name and time, or None."""
         return self._node_lookup.get((hub_name, time))
 
+    def has_node(self, hub_name: str, time: int) -> bool:
+        """Check if the graph holds (hub, time), without creating it."""
+        return (hub_name, time) in self._node_lookup
+
+    def get_edges(self, node: TimeNode) -> List[TimeEdge]:
+        """Returns the outgoing edges of a TimeNode."""
+        return self.adjacency.get(node, [])
+
     def _add_node(self, hub: Hub, turn: int) -> None:
         """
         Creates and stores a TimeNode if it does not already exist.
         Drone counts are tracked via _reserve_path, not initialization.
         """
         key = (hub.name, turn)
-        if key not in self._node_lookup and hub.zone != ZoneType.BLOCKED:
-            node = TimeNode(hub, turn, 0)
+        if (
+            key not in self._node_lookup
+            and hub.zone != ZoneType.BLOCKED
+            and self._in_window(hub, turn)
+        ):
+            node = TimeNode(hub, turn, self.hub_indexes[hub.name])
             self.nodes.add(node)
             self._node_lookup[key] = node
 
+    def _in_window(self, hub: Hub, turn: int) -> bool:
+        """
+        Check if (hub, turn) can lie on a START-END path within
+        max_time. Always True without pruning. START at time 0 is
+        kept so that searches have an origin even when END is out of
+        reach, which lets the horizon grow.
+        """
+        if not self.prune:
+            return True
+        if hub.category == NodeCategory.START and turn == 0:
+            return True
+        first = self._from_start.get(hub.name)
+        left = self._to_end.get(hub.name)
+        if first is None or left is None:
+            return False
+        return first <= turn and turn + left <= self.max_time
+
+    def _count_pruned(self) -> None:
+        """
+        Updates pruned_nodes and pruned_edges against the full graph:
+        one node per hub and turn, one wait per hub and turn but the
+        last, one move per connection direction and fitting departure.
+        """
+        hubs = self.simulation.hubs
+        full_edges = len(self.hub_indexes) * self.max_time
+        for source_name, targets in self.simulation.connections.items():
+            if source_name not in self.hub_indexes:
+                continue
+            for target_name in targets:
+                if target_name not in self.hub_indexes:
+                    continue
+                travel_time = self._get_travel_time(hubs[target_name])
+                full_edges += max(0, self.max_time - travel_time + 1)
+
+        full_nodes = len(self.hub_indexes) * (self.max_time + 1)
+        self.pruned_nodes = full_nodes - len(self.nodes)
+        self.pruned_edges = full_edges - len(self.edges)
+
     def _add_edge(
-        self, source: TimeNode, target: TimeNode, max_capacity: int = 1
+        self,
+        source: TimeNode,
+        target: TimeNode,
+        max_capacity: int = 1,
+        connection_id: int = -1,
     ) -> None:
         """
         Creates a TimeEdge between two TimeNodes
         and stores it in the edge list.
         """
-        new_edge = TimeEdge(source, target, max_capacity)
+        new_edge = TimeEdge(source, target, max_capacity, connection_id)
         self.edges.append(new_edge)
 
     def _get_travel_time(self, target_hub: Hub) -> int:
@@ -63,6 +198,120 @@ class TimeGraph:
         RESTRICTED zones require 2 time steps to traverse.
         Also builds the adjacency dictionary.
         """
+        self._add_layers(-1)
+        self._build_adjacency()
+        self._count_pruned()
+
+    def extend_horizon(self, max_time: int) -> None:
+        """
+        Appends time layers up to max_time in place.
+        Existing nodes, edges and reservations are kept, and drones
+        already absorbed by END stay counted there on the new layers.
+        """
+        if max_time <= self.max_time:
+            return
+
+        previous_max = self.max_time
+        first_edge = len(self.edges)
+        self.max_time = max_time
+        self.reservations.extend(max_time)
+        reopened = self._reopen_windows(previous_max)
+        self._add_layers(previous_max)
+        self._link_reopened(reopened, previous_max)
+
+        for edge in self.edges[first_edge:]:
+            self.adjacency.setdefault(edge.source, []).append(edge)
+        self._count_pruned()
+
+    def _reopen_windows(self, previous_max: int) -> List[TimeNode]:
+        """
+        Creates the nodes up to previous_max that were pruned because
+        END was out of reach by the old horizon but is not anymore.
+        """
+        reopened: List[TimeNode] = []
+        if not self.prune:
+            return reopened
+        for name in self.hub_indexes:
+            hub = self.simulation.hubs[name]
+            for t in range(previous_max + 1):
+                if (name, t) in self._node_lookup:
+                    continue
+                self._add_node(hub, t)
+                node = self.get_node(name, t)
+                if node is not None:
+                    reopened.append(node)
+        return reopened
+
+    def _link_reopened(
+        self, reopened: List[TimeNode], previous_max: int
+    ) -> None:
+        """
+        Adds the move and wait edges of reopened nodes that arrive
+        in the old layers. Edges into the new layers are left to
+        _add_layers. Edges between two reopened nodes are added once,
+        as incoming edges of their target.
+        """
+        created = set(reopened)
+        hubs = self.simulation.hubs
+        incoming: Dict[str, List[str]] = {}
+        for source_name, targets in self.simulation.connections.items():
+            for target_name in targets:
+                incoming.setdefault(target_name, []).append(source_name)
+
+        for node in reopened:
+            name = node.hub.name
+            arrivals = [
+                (target, node.time + self._get_travel_time(hubs[target]))
+                for target in self.simulation.connections.get(name, {})
+            ]
+            departures = [
+                (source, node.time - self._get_travel_time(node.hub))
+                for source in incoming.get(name, [])
+            ]
+
+            for target_name, arrival_time in arrivals:
+                target = self.get_node(target_name, arrival_time)
+                if (
+                    target is not None
+                    and target not in created
+                    and arrival_time <= previous_max
+                ):
+                    self._add_move(node, target)
+            for source_name, departure_time in departures:
+                source = self.get_node(source_name, departure_time)
+                if source is not None:
+                    self._add_move(source, node)
+
+            following = self.get_node(name, node.time + 1)
+            if (
+                following is not None
+                and following not in created
+                and node.time < previous_max
+            ):
+                self._add_edge(node, following, node.hub.max_drones)
+            preceding = self.get_node(name, node.time - 1)
+            if preceding is not None:
+                self._add_edge(preceding, node, node.hub.max_drones)
+
+    def _add_move(self, source: TimeNode, target: TimeNode) -> None:
+        """Adds the move edge between two nodes of connected hubs."""
+        source_name = source.hub.name
+        target_name = target.hub.name
+        connection = self.simulation.connections[source_name][target_name]
+        self._add_edge(
+            source,
+            target,
+            connection.max_link_capacity,
+            self.connection_ids[
+                self._connection_key(source_name, target_name)
+            ],
+        )
+
+    def _add_layers(self, previous_max: int) -> None:
+        """
+        Adds the nodes of turns previous_max + 1 .. max_time and
+        every move / wait edge arriving in one of those turns.
+        """
         hubs_dict = self.simulation.hubs
         connections = self.simulation.connections
         valid_hubs: Dict[str, Hub] = {
@@ -70,11 +319,11 @@ class TimeGraph:
             if hub.zone != ZoneType.BLOCKED
         }
 
-        for t in range(self.max_time + 1):
+        for t in range(previous_max + 1, self.max_time + 1):
             for hub in valid_hubs.values():
                 self._add_node(hub, t)
 
-        for t in range(self.max_time):
+        for t in range(max(previous_max - 1, 0), self.max_time):
             for source_name, targets in connections.items():
                 for target_name, connection in targets.items():
                     if (
@@ -87,7 +336,7 @@ class TimeGraph:
                     travel_time = self._get_travel_time(target_hub)
                     arrival_time = t + travel_time
 
-                    if arrival_time > self.max_time:
+                    if not previous_max < arrival_time <= self.max_time:
                         continue
 
                     source_node = self.get_node(source_name, t)
@@ -98,8 +347,14 @@ class TimeGraph:
                             source_node,
                             target_node,
                             connection.max_link_capacity,
+                            self.connection_ids[
+                                self._connection_key(source_name, target_name)
+                            ],
                         )
 
+            if t < previous_max:
+                continue
+
             for hub in valid_hubs.values():
                 wait_source = self.get_node(hub.name, t)
                 wait_target = self.get_node(hub.name, t + 1)
@@ -109,8 +364,6 @@ class TimeGraph:
                         wait_source, wait_target, wait_source.hub.max_drones
                     )
 
-        self._build_adjacency()
-
     def _build_adjacency(self) -> None:
         """Builds the adjacency dictionary from the graph edges."""
         self.adjacency = {node: [] for node in self.nodes}
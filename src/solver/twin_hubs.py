@@ -0,0 +1,236 @@
+from __future__ import annotations
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from src.schemas.connection import Connection
+from src.schemas.simulation_map import SimulationMap
+from src.schemas.definitions import NodeCategory, ZoneType
+from src.solver.base_solver import BaseSolver
+from src.solver.flow_solver import FlowSolver
+from src.solver.lazy_time_graph import LazyTimeGraph
+from src.solver.models import TimeNode
+from src.solver.time_graph import TimeGraph
+
+
+class TwinCompression:
+    """
+    Merges interchangeable hubs into one aggregated hub.
+
+    Intermediate hubs are twins when they have the same zone, the same
+    max_drones and the same neighbors through connections of the same
+    capacity: a drone can take any of them for the same turns and
+    priorities. Each class is replaced by its first hub with the
+    summed max_drones, and the connections between two groups carry
+    the summed link capacity. Hubs without a twin are kept as they are.
+    """
+
+    def __init__(self, simulation: SimulationMap) -> None:
+        self.original = simulation
+        classes: Dict[
+            Tuple[ZoneType, int, FrozenSet[Tuple[str, int]]], List[str]
+        ] = {}
+        for name, hub in simulation.hubs.items():
+            if (
+                hub.category != NodeCategory.INTERMEDIATE
+                or hub.zone == ZoneType.BLOCKED
+            ):
+                continue
+            neighborhood = frozenset(
+                (target, connection.max_link_capacity)
+                for target, connection in simulation.connections.get(
+                    name, {}
+                ).items()
+            )
+            classes.setdefault(
+                (hub.zone, hub.max_drones, neighborhood), []
+            ).append(name)
+
+        self.members: Dict[str, List[str]] = {
+            names[0]: names for names in classes.values() if len(names) > 1
+        }
+        self.group: Dict[str, str] = {
+            name: name for name in simulation.hubs
+        }
+        for representative, names in self.members.items():
+            for name in names:
+                self.group[name] = representative
+
+        self.simulation = SimulationMap(
+            nb_drones=simulation.nb_drones,
+            hubs={
+                name: (
+                    hub.model_copy(
+                        update={
+                            "max_drones": hub.max_drones
+                            * len(self.members[name])
+                        }
+                    )
+                    if name in self.members
+                    else hub
+                )
+                for name, hub in simulation.hubs.items()
+                if self.group[name] == name
+            },
+            connections=self._merge_connections(),
+        )
+
+    def merged_hubs(self) -> int:
+        """Number of hubs folded into another one."""
+        return sum(len(names) - 1 for names in self.members.values())
+
+    def _merge_connections(self) -> Dict[str, Dict[str, Connection]]:
+        """Sums the link capacities between every two groups."""
+        merged: Dict[str, Dict[str, Connection]] = {}
+        for source, targets in self.original.connections.items():
+            group_source = self.group[source]
+            merged.setdefault(group_source, {})
+            for target, connection in targets.items():
+                group_target = self.group[target]
+                current = merged[group_source].get(group_target)
+                capacity = connection.max_link_capacity + (
+                    current.max_link_capacity if current is not None else 0
+                )
+                merged[group_source][group_target] = Connection(
+                    source=group_source,
+                    target=group_target,
+                    max_link_capacity=capacity,
+                )
+        return merged
+
+
+class TwinHubSolver(BaseSolver):
+    """
+    Routes drones on the twin-compressed map, then assigns hubs.
+
+    Every drone is searched on the compressed TEG, where a twin class
+    is one node with the summed capacity, so search branching and
+    memory shrink with the classes. Each stay in a class is then given
+    the first member hub that has room on every turn of the stay and
+    whose links are free, checked against the real reservations kept
+    in a LazyTimeGraph of the original map. Summed capacities are a
+    relaxation: when no member fits, the drone is searched again on
+    the original map (see fallbacks). Both tables are updated with
+    every routed path, so they stay consistent.
+    """
+
+    def __init__(
+        self,
+        simulation: SimulationMap,
+        max_time: int,
+        search: str = "dijkstra",
+    ) -> None:
+        super().__init__(simulation.nb_drones)
+        self.compression = TwinCompression(simulation)
+        self.compressed = FlowSolver(
+            TimeGraph(self.compression.simulation, max_time),
+            simulation.nb_drones,
+            search,
+        )
+        self.concrete = FlowSolver(
+            LazyTimeGraph(simulation, max_time),
+            simulation.nb_drones,
+            max_horizon=self.compressed.max_horizon,
+        )
+        self.fallbacks = 0
+
+    def _assign(self, path: List[TimeNode]) -> Optional[List[TimeNode]]:
+        """
+        Maps a compressed path onto concrete hubs, one member per stay
+        in a class, or returns None if some stay fits no member.
+        """
+        graph = self.concrete.time_graph
+        reservations = self.concrete.reservations
+        assigned: List[TimeNode] = []
+        position = 0
+        while position < len(path):
+            name = path[position].hub.name
+            stay = position
+            while stay < len(path) and path[stay].hub.name == name:
+                stay += 1
+
+            for member in self.compression.members.get(name, [name]):
+                nodes = [
+                    graph.get_node(member, node.time)
+                    for node in path[position:stay]
+                ]
+                if self._fits(assigned, nodes):
+                    assigned.extend(
+                        node for node in nodes if node is not None
+                    )
+                    break
+            else:
+                return None
+            position = stay
+
+        for source, target in zip(assigned, assigned[1:]):
+            edge = self.concrete._get_edge(source, target)
+            if edge is None or not edge.is_traversable(reservations):
+                return None
+        return assigned
+
+    def _fits(
+        self, assigned: List[TimeNode], nodes: List[Optional[TimeNode]]
+    ) -> bool:
+        """
+        Check if a stay can use these concrete nodes after the
+        nodes assigned so far: room at every turn, and a free link
+        from the previous hub.
+        """
+        reservations = self.concrete.reservations
+        for node in nodes:
+            if node is None or not node.can_enter(reservations):
+                return False
+        if not assigned:
+            return True
+        first = nodes[0]
+        if first is None:
+            return False
+        edge = self.concrete._get_edge(assigned[-1], first)
+        return edge is not None and edge.is_traversable(reservations)
+
+    def _project(self, path: List[TimeNode]) -> List[TimeNode]:
+        """The compressed nodes a concrete path goes through."""
+        graph = self.compressed.time_graph
+        projected: List[TimeNode] = []
+        for node in path:
+            group_node = graph.get_node(
+                self.compression.group[node.hub.name], node.time
+            )
+            if group_node is not None:
+                projected.append(group_node)
+        return projected
+
+    def route_drones(self) -> List[int]:
+        """
+        Solves paths for all drones sequentially.
+        Returns the ids of the drones left without a path.
+        """
+        start_node = self.compressed.find_start_node()
+        concrete_start = self.concrete.find_start_node()
+        unrouted: List[int] = []
+
+        for drone_id in range(1, self.nb_drones + 1):
+            path = self.compressed._solve_growing(drone_id, start_node)
+            self.concrete.time_graph.extend_horizon(
+                self.compressed.time_graph.max_time
+            )
+            concrete = self._assign(path) if path else None
+            if path and concrete is None:
+                self.fallbacks += 1
+                concrete = self.concrete._solve_growing(
+                    drone_id, concrete_start
+                )
+                self.compressed.time_graph.extend_horizon(
+                    self.concrete.time_graph.max_time
+                )
+                if concrete:
+                    path = self._project(concrete)
+
+            if path and concrete:
+                self.drone_paths[drone_id] = concrete
+                self.concrete._reserve_path(concrete)
+                self.compressed._reserve_path(path)
+            else:
+                unrouted.append(drone_id)
+
+        self._create_drones()
+
+        return unrouted
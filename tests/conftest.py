@@ -0,0 +1,26 @@
+from pathlib import Path
+from typing import Callable, Union
+import pytest
+from src.parser.file_parser import FileParser
+from src.schemas.simulation_map import SimulationMap
+
+MAPS_DIR = Path(__file__).resolve().parent.parent / "maps"
+MAP_FILES = sorted(MAPS_DIR.rglob("*.txt"))
+
+MapLoader = Callable[[Union[str, Path]], SimulationMap]
+
+
+@pytest.fixture
+def load_map() -> MapLoader:
+    """Parses a map given relative to maps/ (or by an absolute path)."""
+    def load(path: Union[str, Path]) -> SimulationMap:
+        return FileParser().parse(str(MAPS_DIR / path))
+
+    return load
+
+
+@pytest.fixture(params=MAP_FILES, ids=lambda path: path.name)
+def map_file(request: pytest.FixtureRequest) -> Path:
+    """Each bundled map in turn."""
+    path: Path = request.param
+    return path
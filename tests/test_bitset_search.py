@@ -0,0 +1,126 @@
+from pathlib import Path
+from src.solver.bitset_search import BitsetSearch
+from src.solver.flow_solver import FlowSolver
+from src.solver.lazy_time_graph import LazyTimeGraph
+from src.solver.time_estimator import estimate_horizon
+from src.solver.time_graph import TimeGraph
+from conftest import MapLoader
+
+
+def test_neighbor_masks_split_by_travel_time(load_map: MapLoader) -> None:
+    """Verify that restricted targets land in the two-turn mask."""
+    simulation = load_map("medium/03_priority_puzzle.txt")
+    graph = TimeGraph(simulation, 10)
+    bitset = BitsetSearch(graph)
+    index = graph.hub_indexes
+
+    for name, hub_index in index.items():
+        overlap = bitset.one_turn[hub_index] & bitset.two_turns[hub_index]
+        assert overlap == 0
+        for target in simulation.connections.get(name, {}):
+            if target not in index:
+                continue
+            target_bit = 1 << index[target]
+            duration = bitset.durations[index[target]]
+            mask = bitset.two_turns if duration == 2 else bitset.one_turn
+            assert mask[hub_index] & target_bit
+            assert bitset.predecessors[index[target]] >> hub_index & 1
+
+
+def test_sweep_lights_end_at_shortest_layer(load_map: MapLoader) -> None:
+    """Verify that END appears on the layer of the shortest path."""
+    simulation = load_map("easy/01_linear_path.txt")
+    graph = TimeGraph(simulation, 10)
+    bitset = BitsetSearch(graph)
+    start_node = graph.get_node("start", 0)
+    assert start_node is not None
+
+    layers = bitset.reachable_layers(start_node)
+
+    assert layers is not None
+    assert len(layers) == 4
+    assert layers[3] & bitset.end_bit
+    useful = bitset.backtrack(layers)
+    assert [bin(mask).count("1") for mask in useful] == [1, 1, 1, 1]
+
+
+def test_full_hub_is_masked_out(load_map: MapLoader) -> None:
+    """Verify that a reserved hub disappears from the frontier."""
+    simulation = load_map("easy/01_linear_path.txt")
+    graph = TimeGraph(simulation, 3)
+    solver = FlowSolver(graph, 1, "bitset")
+    start_node = solver.find_start_node()
+
+    path = solver.solve_for_drone(1, start_node)
+    assert path is not None
+    solver._reserve_path(path)
+
+    bitset = solver._bitset
+    assert bitset is not None
+    waypoint = graph.hub_indexes["waypoint1"]
+    assert bitset._full[1] >> waypoint & 1
+    assert bitset.reachable_layers(start_node) is None
+
+
+def test_full_end_is_masked_from_its_first_full_turn(
+    tmp_path: Path, load_map: MapLoader
+) -> None:
+    """Verify that a full END is stored once, as a suffix of turns."""
+    map_file = tmp_path / "map.txt"
+    map_file.write_text(
+        """nb_drones: 2
+        start_hub: start 0 0 [max_drones=2]
+        hub: middle 1 0
+        end_hub: goal 2 0 [max_drones=2]
+        connection: start-middle
+        connection: middle-goal
+        """,
+        encoding="utf-8",
+    )
+    simulation = load_map(map_file)
+    graph = TimeGraph(simulation, 12)
+    solver = FlowSolver(graph, 2, "bitset")
+    solver.solve_all_drones()
+
+    bitset = solver._bitset
+    assert bitset is not None
+    goal = graph.hub_indexes["goal"]
+    assert bitset._end_full_from == {goal: 3}
+    assert not bitset.full_mask(2) >> goal & 1
+    assert all(bitset.full_mask(time) >> goal & 1 for time in range(3, 13))
+    assert not any(
+        bitset._full.get(time, 0) >> goal & 1 for time in range(4, 13)
+    )
+
+
+def test_saturated_link_is_masked_out(load_map: MapLoader) -> None:
+    """Verify that a saturated link blocks both directions."""
+    simulation = load_map("easy/01_linear_path.txt")
+    graph = TimeGraph(simulation, 5)
+    bitset = BitsetSearch(graph)
+    start = graph.hub_indexes["start"]
+    waypoint = graph.hub_indexes["waypoint1"]
+
+    bitset._block_link(start, waypoint, 2)
+
+    assert bitset._blocked[2][start] >> waypoint & 1
+    assert bitset._blocked[2][waypoint] >> start & 1
+    assert 1 not in bitset._blocked
+
+
+def test_bitset_matches_dijkstra(map_file: Path, load_map: MapLoader) -> None:
+    """Verify that the bitset sweep returns Dijkstra's paths."""
+    simulation = load_map(map_file)
+    max_time = estimate_horizon(simulation)
+    paths = []
+
+    for graph, search in (
+        (TimeGraph(simulation, max_time), "dijkstra"),
+        (TimeGraph(simulation, max_time), "bitset"),
+        (LazyTimeGraph(simulation, max_time), "bitset"),
+    ):
+        solver = FlowSolver(graph, simulation.nb_drones, search)
+        solver.solve_all_drones()
+        paths.append(solver.drone_paths)
+
+    assert paths[0] == paths[1] == paths[2]
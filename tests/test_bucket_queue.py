@@ -0,0 +1,51 @@
+import random
+import pytest
+from src.solver.bucket_queue import BucketQueue, HeapQueue
+
+
+def test_pops_follow_primary_then_item() -> None:
+    """Verify that the bucket queue pops in global heap order."""
+    generator = random.Random(7)
+    bucket: BucketQueue[tuple[int, int]] = BucketQueue()
+    heap: HeapQueue[tuple[int, int]] = HeapQueue()
+    popped = 0
+    for _ in range(500):
+        if bucket and generator.random() < 0.4:
+            assert bucket.pop() == heap.pop()
+            popped += 1
+            continue
+        primary = max(
+            bucket.current, popped // 3 + generator.randint(0, 2)
+        )
+        item = (generator.randint(-3, 0), generator.randint(0, 50))
+        bucket.push(primary, item)
+        heap.push(primary, item)
+
+    while heap:
+        assert bucket.pop() == heap.pop()
+    assert len(bucket) == 0
+
+
+def test_push_into_current_bucket_keeps_order() -> None:
+    """Verify that an equal-cost push lands before larger items."""
+    queue: BucketQueue[int] = BucketQueue()
+    queue.push(1, 5)
+    queue.push(1, 9)
+    assert queue.pop() == (1, 5)
+
+    queue.push(1, 7)
+    queue.push(2, 0)
+
+    assert [queue.pop() for _ in range(3)] == [(1, 7), (1, 9), (2, 0)]
+
+
+def test_bucket_queue_is_monotone() -> None:
+    """Verify that pushing below the last popped cost is refused."""
+    queue: BucketQueue[int] = BucketQueue()
+    queue.push(3, 0)
+    queue.pop()
+
+    with pytest.raises(ValueError, match="monotone"):
+        queue.push(2, 0)
+    with pytest.raises(IndexError):
+        queue.pop()
@@ -0,0 +1,65 @@
+from pathlib import Path
+from src.solver.compact_graph import CompactTimeGraph
+from src.solver.compact_solver import CompactFlowSolver
+from src.solver.flow_solver import FlowSolver
+from src.solver.time_estimator import estimate_max_time
+from src.solver.time_graph import TimeGraph
+from conftest import MapLoader
+
+
+def test_node_ids_follow_hub_major_layout(load_map: MapLoader) -> None:
+    """Verify that node ids are hub_index * (T + 1) + t."""
+    simulation = load_map("easy/01_linear_path.txt")
+    graph = CompactTimeGraph(simulation, 4)
+
+    node = graph.node_id(2, 3)
+    assert node == 2 * 5 + 3
+    assert graph.hub_of(node) == 2
+    assert graph.time_of(node) == 3
+
+
+def test_csr_shares_link_ids_between_directions(load_map: MapLoader) -> None:
+    """Verify that both directions of a connection use the same link."""
+    simulation = load_map("easy/01_linear_path.txt")
+    graph = CompactTimeGraph(simulation, 4)
+
+    assert len(graph.link_capacity) == 3
+    assert len(graph.targets) == 6
+    assert sorted(graph.link_ids) == [0, 0, 1, 1, 2, 2]
+
+
+def test_restricted_targets_take_two_turns(load_map: MapLoader) -> None:
+    """Verify that CSR durations follow the target zone."""
+    simulation = load_map("medium/03_priority_puzzle.txt")
+    graph = CompactTimeGraph(simulation, 7)
+
+    for hub_index, hub in enumerate(graph.hubs):
+        for k in range(graph.offsets[hub_index], graph.offsets[hub_index + 1]):
+            target = graph.hubs[graph.targets[k]]
+            expected = 2 if target.zone.value == "restricted" else 1
+            assert graph.durations[k] == expected
+
+
+def test_compact_solver_matches_object_graph(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that both TEG representations route drones identically."""
+    simulation = load_map(map_file)
+    max_time = estimate_max_time(simulation)
+
+    object_solver = FlowSolver(TimeGraph(simulation, max_time),
+                               simulation.nb_drones)
+    compact_solver = CompactFlowSolver(
+        CompactTimeGraph(simulation, max_time), simulation.nb_drones
+    )
+    object_paths = object_solver.solve_all_drones()
+    compact_paths = compact_solver.solve_all_drones()
+
+    assert object_paths.keys() == compact_paths.keys()
+    for drone_id, path in object_paths.items():
+        assert [(n.hub.name, n.time) for n in path] == [
+            (n.hub.name, n.time) for n in compact_paths[drone_id]
+        ]
+    assert (object_solver.get_simulation_output()
+            == compact_solver.get_simulation_output())
@@ -0,0 +1,147 @@
+import random
+from pathlib import Path
+from src.parser.file_parser import FileParser
+from src.schemas.simulation_map import SimulationMap
+from src.solver.corridor_search import find_interior_hubs
+from src.solver.flow_solver import FlowSolver
+from src.solver.lazy_time_graph import LazyTimeGraph
+from src.solver.time_estimator import estimate_horizon
+from src.solver.time_graph import TimeGraph
+from conftest import MapLoader
+
+
+def solve(simulation: SimulationMap, search: str) -> FlowSolver:
+    solver = FlowSolver(
+        TimeGraph(simulation, estimate_horizon(simulation)),
+        simulation.nb_drones,
+        search,
+    )
+    solver.solve_all_drones()
+    return solver
+
+
+def write_random_map(tmp_path: Path, seed: int) -> SimulationMap:
+    generator = random.Random(seed)
+    nb_hubs = generator.randint(3, 9)
+    nb_drones = generator.randint(1, 6)
+    lines = [
+        f"nb_drones: {nb_drones}",
+        f"start_hub: s 0 0 [max_drones={nb_drones}]",
+        f"end_hub: e {nb_hubs + 1} 0 [max_drones={nb_drones}]",
+    ]
+    names = [f"h{index}" for index in range(nb_hubs)]
+    for index, name in enumerate(names):
+        zone = generator.choice(
+            ["normal", "normal", "restricted", "priority", "priority"]
+        )
+        capacity = generator.choice([1, 1, 2, 3])
+        lines.append(
+            f"hub: {name} {index + 1} {generator.randint(-3, 3)}"
+            f" [zone={zone} max_drones={capacity}]"
+        )
+    order = ["s"] + generator.sample(names, nb_hubs)
+    links = {
+        tuple(sorted((hub, generator.choice(order[:index]))))
+        for index, hub in enumerate(order)
+        if index > 0
+    }
+    links.add(tuple(sorted(("e", generator.choice(order)))))
+    for _ in range(generator.randint(0, nb_hubs)):
+        links.add(tuple(sorted(generator.sample(order + ["e"], 2))))
+    for source, target in sorted(links):
+        capacity = generator.choice([1, 1, 2, 3])
+        lines.append(
+            f"connection: {source}-{target} [max_link_capacity={capacity}]"
+        )
+    map_file = tmp_path / f"map_{seed}.txt"
+    map_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return FileParser().parse(str(map_file))
+
+
+def test_interior_hubs_are_the_degree_two_waypoints(
+    load_map: MapLoader,
+) -> None:
+    """Verify that only intermediate hubs with two neighbors are interior."""
+    simulation = load_map("easy/01_linear_path.txt")
+
+    interior = find_interior_hubs(simulation)
+
+    assert interior == {
+        "waypoint1": ["start", "waypoint2"],
+        "waypoint2": ["waypoint1", "goal"],
+    }
+
+
+def test_corridor_search_gives_same_output(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that expanded macro-edge paths print identical turns."""
+    simulation = load_map(map_file)
+
+    corridor = solve(simulation, "corridor")
+    dijkstra = solve(simulation, "dijkstra")
+
+    assert len(corridor.drone_paths) == simulation.nb_drones
+    assert corridor.expansions <= dijkstra.expansions
+    assert (
+        corridor.get_simulation_output() == dijkstra.get_simulation_output()
+    )
+
+
+def test_corridor_search_on_lazy_graph_skips_interior_states(
+    load_map: MapLoader,
+) -> None:
+    """Verify that interior hubs are only materialized when crossed."""
+    simulation = load_map("challenger/01_the_impossible_dream.txt")
+    max_time = estimate_horizon(simulation)
+    graph = LazyTimeGraph(simulation, max_time)
+
+    solver = FlowSolver(graph, simulation.nb_drones, "corridor")
+    solver.solve_all_drones()
+
+    assert solver.drone_paths == solve(simulation, "dijkstra").drone_paths
+    assert len(graph.nodes) < len(TimeGraph(simulation, max_time).nodes)
+
+
+def test_loop_corridor_is_followed(tmp_path: Path) -> None:
+    """Verify that a corridor back to its entry hub is followed."""
+    map_file = tmp_path / "map.txt"
+    map_file.write_text(
+        """nb_drones: 4
+        start_hub: s 0 0 [max_drones=4]
+        hub: p0 1 1 [zone=priority]
+        hub: p1 1 -1 [zone=priority]
+        end_hub: e 2 0 [max_drones=4]
+        connection: s-e
+        connection: s-p0
+        connection: p0-p1
+        connection: p1-s
+        """,
+        encoding="utf-8",
+    )
+    simulation = FileParser().parse(str(map_file))
+
+    assert set(find_interior_hubs(simulation)) == {"p0", "p1"}
+    corridor = solve(simulation, "corridor")
+    assert corridor.drone_paths == solve(simulation, "dijkstra").drone_paths
+    assert any(
+        node.hub.name == "p1" for node in corridor.drone_paths[4]
+    )
+
+
+def test_corridor_search_matches_dijkstra_on_random_maps(
+    tmp_path: Path,
+) -> None:
+    """Verify that corridor paths equal Dijkstra's on random maps."""
+    for seed in range(150):
+        simulation = write_random_map(tmp_path, seed)
+
+        corridor = solve(simulation, "corridor")
+        dijkstra = solve(simulation, "dijkstra")
+
+        assert corridor.drone_paths == dijkstra.drone_paths, seed
+        assert (
+            corridor.get_simulation_output()
+            == dijkstra.get_simulation_output()
+        ), seed
@@ -0,0 +1,296 @@
+from pathlib import Path
+from typing import Any
+import pytest
+from src.schemas.simulation_map import SimulationMap
+from src.solver.flow_solver import FlowSolver, count_saved_expansions
+from src.solver.lazy_time_graph import LazyTimeGraph
+from src.solver.time_estimator import (
+    distances_to_end,
+    estimate_horizon,
+    max_priority_by_arrival,
+)
+from src.solver.time_graph import TimeGraph
+from conftest import MapLoader
+
+
+def solve(simulation: SimulationMap, **options: Any) -> FlowSolver:
+    max_time = estimate_horizon(simulation)
+    solver = FlowSolver(
+        TimeGraph(simulation, max_time), simulation.nb_drones, **options
+    )
+    solver.solve_all_drones()
+    return solver
+
+
+def test_unknown_search_mode_is_rejected(load_map: MapLoader) -> None:
+    """Verify that FlowSolver refuses unknown search modes."""
+    simulation = load_map("easy/01_linear_path.txt")
+
+    with pytest.raises(ValueError, match="Unknown search mode"):
+        FlowSolver(TimeGraph(simulation, 4), 2, "bogus")
+
+
+def test_distances_to_end_count_restricted_twice(load_map: MapLoader) -> None:
+    """Verify that the reverse distances follow the static travel rules."""
+    simulation = load_map("medium/03_priority_puzzle.txt")
+
+    distances = distances_to_end(simulation)
+
+    assert distances["goal"] == 0
+    assert distances["merge_point"] == 1
+    assert distances["slow_path3"] == 2
+    assert distances["start"] == 4
+
+
+def test_distances_to_end_skip_dead_ends(load_map: MapLoader) -> None:
+    """Verify that dead ends get their exact detour distance."""
+    simulation = load_map("medium/01_dead_end_trap.txt")
+
+    distances = distances_to_end(simulation)
+
+    assert distances["junction"] == 3
+    assert distances["dead_end"] == 4
+
+
+def test_astar_matches_dijkstra(map_file: Path, load_map: MapLoader) -> None:
+    """Verify that A* returns the same paths as Dijkstra."""
+    simulation = load_map(map_file)
+
+    dijkstra = solve(simulation)
+    astar = solve(simulation, search="astar")
+
+    assert dijkstra.drone_paths == astar.drone_paths
+    assert astar.expansions <= dijkstra.expansions
+
+
+def test_astar_saves_expansions_on_dead_end_map(load_map: MapLoader) -> None:
+    """Verify that A* skips the dead-end branch."""
+    simulation = load_map("medium/01_dead_end_trap.txt")
+
+    saved = count_saved_expansions(simulation, estimate_horizon(simulation))
+
+    assert saved > 0
+
+
+def test_layered_sweep_matches_dijkstra(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that the heap-free layered sweep returns Dijkstra's paths."""
+    simulation = load_map(map_file)
+
+    dijkstra = solve(simulation)
+    layered = solve(simulation, search="layered")
+
+    assert dijkstra.drone_paths == layered.drone_paths
+
+
+@pytest.mark.parametrize(
+    "search", ["dijkstra", "astar", "layered", "bitset"]
+)
+def test_reserved_edges_come_from_the_search(
+    search: str,
+    monkeypatch: pytest.MonkeyPatch,
+    load_map: MapLoader,
+) -> None:
+    """Verify that reserving a found path never looks edges up."""
+    simulation = load_map("medium/02_circular_loop.txt")
+    expected = solve(simulation, search=search).drone_paths
+
+    def no_lookup(*_: Any) -> None:
+        raise AssertionError("edge looked up by scanning")
+
+    solver = FlowSolver(
+        TimeGraph(simulation, estimate_horizon(simulation)),
+        simulation.nb_drones,
+        search,
+    )
+    monkeypatch.setattr(solver, "_get_edge", no_lookup)
+    solver.solve_all_drones()
+
+    assert solver.drone_paths == expected
+
+
+def test_layered_sweep_stops_at_first_end_layer(load_map: MapLoader) -> None:
+    """Verify that the sweep never expands layers past the arrival."""
+    simulation = load_map("easy/01_linear_path.txt")
+    solver = FlowSolver(TimeGraph(simulation, 20), 1, "layered")
+    start_node = solver.find_start_node()
+
+    path = solver.solve_for_drone(1, start_node)
+
+    assert path is not None
+    assert path[-1].time == 3
+    assert solver.expansions <= 4 * 3
+
+
+@pytest.mark.parametrize("graph_class", [TimeGraph, LazyTimeGraph])
+def test_horizon_grows_until_every_drone_arrives(
+    graph_class: type[TimeGraph],
+    load_map: MapLoader,
+) -> None:
+    """Verify that a too short horizon is extended in place."""
+    simulation = load_map("medium/02_circular_loop.txt")
+    solver = FlowSolver(graph_class(simulation, 6), simulation.nb_drones)
+
+    paths = solver.solve_all_drones()
+
+    assert len(paths) == simulation.nb_drones
+    assert solver.extensions > 0
+    final = FlowSolver(
+        TimeGraph(simulation, solver.time_graph.max_time),
+        simulation.nb_drones,
+    )
+    assert final.solve_all_drones() == paths
+
+
+def test_horizon_growth_stops_at_max_horizon(load_map: MapLoader) -> None:
+    """Verify that the graph never grows past max_horizon."""
+    simulation = load_map("medium/02_circular_loop.txt")
+    solver = FlowSolver(
+        TimeGraph(simulation, 6), simulation.nb_drones, max_horizon=8
+    )
+
+    unrouted = solver.route_drones()
+
+    assert unrouted
+    assert solver.time_graph.max_time == 8
+
+
+def test_incremental_repair_matches_dijkstra(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that repaired labels give Dijkstra's paths."""
+    simulation = load_map(map_file)
+
+    dijkstra = solve(simulation)
+    incremental = solve(simulation, search="incremental")
+
+    assert dijkstra.drone_paths == incremental.drone_paths
+    if simulation.nb_drones > 1:
+        assert incremental.expansions < dijkstra.expansions
+
+
+def test_incremental_repair_only_touches_changed_labels(
+    load_map: MapLoader,
+) -> None:
+    """Verify that the second drone resumes from the first one's labels."""
+    simulation = load_map("easy/01_linear_path.txt")
+    solver = FlowSolver(TimeGraph(simulation, 6), 2, "incremental")
+    start_node = solver.find_start_node()
+
+    first = solver.solve_for_drone(1, start_node)
+    assert first is not None
+    swept = solver.expansions
+    solver._reserve_path(first)
+    second = solver.solve_for_drone(2, start_node)
+
+    assert second is not None
+    assert second[-1].time == 4
+    assert solver.expansions - swept <= 3
+
+
+def test_convoy_paths_are_optimal(map_file: Path, load_map: MapLoader) -> None:
+    """Verify that every shortcut matches a full search's cost."""
+    simulation = load_map(map_file)
+    convoy = solve(simulation, convoy=3)
+    replay = FlowSolver(
+        TimeGraph(simulation, convoy.time_graph.max_time), 0
+    )
+    start_node = replay.find_start_node()
+
+    for drone_id in sorted(convoy.drone_paths):
+        path = convoy.drone_paths[drone_id]
+        expected = replay.solve_for_drone(drone_id, start_node)
+        assert expected is not None
+        assert path[-1].time == expected[-1].time
+        assert sum(node.is_priority for node in path) == sum(
+            node.is_priority for node in expected
+        )
+        replay._reserve_path(path)
+
+
+def test_convoy_serves_corridor_drones(load_map: MapLoader) -> None:
+    """Verify that a single corridor is served by shifted paths."""
+    simulation = load_map("mini_map.txt")
+
+    convoy = solve(simulation, convoy=1)
+
+    assert convoy.convoy_hits == simulation.nb_drones - 1
+    assert convoy.convoy_hit_ratio() == pytest.approx(10 / 11)
+    assert convoy.drone_paths == solve(simulation).drone_paths
+
+
+def test_max_priority_by_arrival_counts_waits(load_map: MapLoader) -> None:
+    """Verify that waiting on a priority hub raises the bound."""
+    simulation = load_map("medium/03_priority_puzzle.txt")
+
+    bounds = max_priority_by_arrival(simulation, 7)
+
+    assert bounds[:4] == [-1, -1, -1, -1]
+    assert bounds[5] == bounds[4] + 1
+
+
+def test_bulk_mode_reserves_wide_paths_once(
+    tmp_path: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that a wide corridor is searched once per group."""
+    map_file = tmp_path / "wide.txt"
+    map_file.write_text(
+        """nb_drones: 10
+        start_hub: start 0 0
+        hub: a 1 0 [max_drones=4]
+        hub: b 2 0 [max_drones=6]
+        end_hub: goal 3 0
+        connection: start-a [max_link_capacity=5]
+        connection: a-b [max_link_capacity=4]
+        connection: b-goal [max_link_capacity=4]
+        """,
+        encoding="utf-8",
+    )
+    simulation = load_map(map_file)
+
+    bulk = solve(simulation, bulk=True)
+    sequential = solve(simulation)
+
+    assert bulk.groups == 3
+    assert [path[-1].time for path in bulk.drone_paths.values()] == [
+        path[-1].time for path in sequential.drone_paths.values()
+    ]
+    row = bulk.reservations.hub_drones[bulk.time_graph.hub_indexes["a"]]
+    assert max(row) == 4
+
+
+def test_bulk_mode_keeps_arrival_turns(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that grouping never delays the fleet."""
+    simulation = load_map(map_file)
+
+    bulk = solve(simulation, bulk=True)
+    sequential = solve(simulation)
+
+    assert sorted(p[-1].time for p in bulk.drone_paths.values()) == sorted(
+        p[-1].time for p in sequential.drone_paths.values()
+    )
+
+
+def test_pruned_graph_gives_same_paths(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that time-window pruning only drops useless states."""
+    simulation = load_map(map_file)
+    max_time = estimate_horizon(simulation)
+    pruned_graph = TimeGraph(simulation, max_time, prune=True)
+
+    pruned = FlowSolver(pruned_graph, simulation.nb_drones)
+    pruned.solve_all_drones()
+    full = solve(simulation)
+
+    assert pruned_graph.pruned_nodes > 0
+    assert pruned.expansions <= full.expansions
+    assert pruned.drone_paths == full.drone_paths
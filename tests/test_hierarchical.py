@@ -0,0 +1,95 @@
+from pathlib import Path
+import pytest
+from src.parser.file_parser import FileParser
+from src.schemas.simulation_map import SimulationMap
+from src.solver.flow_solver import FlowSolver
+from src.solver.hierarchical import HierarchicalPlanner, solve_hierarchically
+from src.solver.time_estimator import estimate_horizon
+from src.solver.time_graph import TimeGraph
+from conftest import MapLoader
+
+
+def write_grid(tmp_path: Path, size: int, nb_drones: int) -> SimulationMap:
+    """size x size grid with START and END at both ends of row 0."""
+    lines = [f"nb_drones: {nb_drones}"]
+    capacity = f"[max_drones={nb_drones}]"
+    for x in range(size):
+        for y in range(size):
+            if (x, y) == (0, 0):
+                lines.append(f"start_hub: h{x}_{y} {x} {y} {capacity}")
+            elif (x, y) == (0, size - 1):
+                lines.append(f"end_hub: h{x}_{y} {x} {y} {capacity}")
+            else:
+                lines.append(f"hub: h{x}_{y} {x} {y}")
+    for x in range(size):
+        for y in range(size):
+            if x + 1 < size:
+                lines.append(f"connection: h{x}_{y}-h{x + 1}_{y}")
+            if y + 1 < size:
+                lines.append(f"connection: h{x}_{y}-h{x}_{y + 1}")
+    map_file = tmp_path / "grid.txt"
+    map_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return FileParser().parse(str(map_file))
+
+
+def test_clusters_cover_every_hub_once(tmp_path: Path) -> None:
+    """Verify that clusters partition the hubs into connected parts."""
+    simulation = write_grid(tmp_path, 12, 3)
+    planner = HierarchicalPlanner(simulation, cluster_size=16)
+
+    names = [name for members in planner.clusters for name in members]
+
+    assert sorted(names) == sorted(simulation.hubs)
+    assert 4 <= len(planner.clusters) <= 16
+    assert all(len(members) <= 16 for members in planner.clusters)
+    assert "h0_0" in planner.boundary and "h0_11" in planner.boundary
+
+
+def test_abstract_arcs_keep_static_distances(tmp_path: Path) -> None:
+    """Verify that the abstract graph keeps the best route length."""
+    simulation = write_grid(tmp_path, 12, 3)
+    planner = HierarchicalPlanner(simulation, cluster_size=16, slack=0)
+
+    planner.plan()
+
+    assert planner.best == 11
+
+
+def test_corridor_skips_far_clusters(tmp_path: Path) -> None:
+    """Verify that only the clusters near the best route are refined."""
+    simulation = write_grid(tmp_path, 16, 6)
+
+    solver, planner = solve_hierarchically(simulation, cluster_size=16)
+    submap = solver.time_graph.simulation
+
+    assert len(planner.selected) < len(planner.clusters)
+    assert len(submap.hubs) < len(simulation.hubs) // 2
+    assert len(solver.drone_paths) == simulation.nb_drones
+    assert all(
+        path[-1].hub.name == "h0_15" for path in solver.drone_paths.values()
+    )
+
+
+def test_cluster_size_must_be_positive(load_map: MapLoader) -> None:
+    """Verify that an empty cluster size is refused."""
+    simulation = load_map("easy/01_linear_path.txt")
+
+    with pytest.raises(ValueError, match="cluster_size"):
+        HierarchicalPlanner(simulation, cluster_size=0)
+
+
+def test_small_clusters_keep_makespan(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that refining the corridor loses no turn on bundled maps."""
+    simulation = load_map(map_file)
+    max_time = estimate_horizon(simulation)
+    flat = FlowSolver(TimeGraph(simulation, max_time), simulation.nb_drones)
+    flat.solve_all_drones()
+
+    solver, _ = solve_hierarchically(simulation, cluster_size=4)
+
+    assert max(p[-1].time for p in solver.drone_paths.values()) == max(
+        p[-1].time for p in flat.drone_paths.values()
+    )
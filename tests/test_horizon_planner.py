@@ -0,0 +1,66 @@
+from pathlib import Path
+import pytest
+from src.solver.horizon_planner import HorizonPlanner, solve_within_horizon
+from src.solver.time_estimator import NoPathError, distances_from_start
+from conftest import MapLoader
+
+
+def test_distances_from_start_count_restricted_twice(
+    load_map: MapLoader,
+) -> None:
+    """Verify that entering a restricted hub costs two turns."""
+    simulation = load_map("medium/03_priority_puzzle.txt")
+
+    distances = distances_from_start(simulation)
+
+    assert distances["start"] == 0
+    assert distances["goal"] == 4
+
+
+def test_linear_path_needs_one_turn_per_extra_drone(
+    load_map: MapLoader,
+) -> None:
+    """Verify the planned horizon on a capacity-1 corridor."""
+    simulation = load_map("easy/01_linear_path.txt")
+    planner = HorizonPlanner(simulation)
+
+    assert planner.plan() == 4
+    assert planner.max_flow(3) == 1
+    assert planner.max_flow(4) == 2
+
+
+def test_planned_horizon_is_a_makespan_certificate(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that no solved schedule beats the planned makespan."""
+    simulation = load_map(map_file)
+
+    solver, planner = solve_within_horizon(simulation)
+
+    assert len(solver.drone_paths) == simulation.nb_drones
+    assert planner.max_flow(planner.makespan - 1) < simulation.nb_drones
+    makespan = max(path[-1].time for path in solver.drone_paths.values())
+    assert planner.makespan <= makespan <= planner.upper_bound
+
+
+def test_unreachable_end_raises_no_path_error(
+    tmp_path: Path, load_map: MapLoader
+) -> None:
+    """Verify that only a missing START-END path raises NoPathError."""
+    map_file = tmp_path / "map.txt"
+    map_file.write_text(
+        """nb_drones: 2
+        start_hub: start 0 0
+        hub: a 1 0
+        end_hub: goal 4 0
+        connection: start-a
+        """,
+        encoding="utf-8",
+    )
+
+    with pytest.raises(NoPathError, match="No path exists"):
+        solve_within_horizon(load_map(map_file))
+    with pytest.raises(ValueError, match="Unknown search mode") as error:
+        solve_within_horizon(load_map("easy/01_linear_path.txt"), "bogus")
+    assert not isinstance(error.value, NoPathError)
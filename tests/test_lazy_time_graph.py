@@ -0,0 +1,87 @@
+from pathlib import Path
+from src.solver.flow_solver import FlowSolver
+from src.solver.lazy_time_graph import LazyTimeGraph
+from src.solver.time_estimator import estimate_horizon
+from src.solver.time_graph import TimeGraph
+from conftest import MapLoader
+
+
+def test_lazy_graph_starts_with_start_node_only(load_map: MapLoader) -> None:
+    """Verify that construction only materializes START at time 0."""
+    simulation = load_map("hard/01_maze_nightmare.txt")
+    graph = LazyTimeGraph(simulation, 50)
+
+    assert len(graph.nodes) == 1
+    assert graph.edges == []
+    assert graph.get_node("start", 0) in graph.nodes
+
+
+def test_lazy_graph_expands_on_first_touch(load_map: MapLoader) -> None:
+    """Verify that edges are derived from connections when requested."""
+    simulation = load_map("easy/01_linear_path.txt")
+    graph = LazyTimeGraph(simulation, 4)
+    start = graph.get_node("start", 0)
+    assert start is not None
+
+    edges = graph.get_edges(start)
+
+    assert {(e.target.hub.name, e.target.time) for e in edges} == {
+        ("waypoint1", 1),
+        ("start", 1),
+    }
+    assert graph.get_edges(start) is edges
+
+
+def test_lazy_graph_respects_horizon(load_map: MapLoader) -> None:
+    """Verify that no state is created beyond max_time."""
+    simulation = load_map("easy/01_linear_path.txt")
+    graph = LazyTimeGraph(simulation, 2)
+
+    assert graph.get_node("goal", 3) is None
+    last = graph.get_node("start", 2)
+    assert last is not None
+    assert graph.get_edges(last) == []
+
+
+def test_lazy_graph_matches_eager_graph(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that lazy and eager graphs route drones identically."""
+    simulation = load_map(map_file)
+    max_time = estimate_horizon(simulation)
+
+    eager_paths = FlowSolver(
+        TimeGraph(simulation, max_time), simulation.nb_drones
+    ).solve_all_drones()
+    lazy_paths = FlowSolver(
+        LazyTimeGraph(simulation, max_time), simulation.nb_drones
+    ).solve_all_drones()
+
+    assert eager_paths == lazy_paths
+
+
+def test_lazy_graph_touches_fewer_states(load_map: MapLoader) -> None:
+    """Verify that memory follows the explored states."""
+    simulation = load_map("hard/01_maze_nightmare.txt")
+    max_time = estimate_horizon(simulation) * 4
+    eager = TimeGraph(simulation, max_time)
+    lazy = LazyTimeGraph(simulation, max_time)
+
+    FlowSolver(lazy, simulation.nb_drones).solve_all_drones()
+
+    assert len(lazy.nodes) < len(eager.nodes)
+
+
+def test_lazy_graph_extends_cached_edges(load_map: MapLoader) -> None:
+    """Verify that nodes on the old last turn gain their edges."""
+    simulation = load_map("easy/01_linear_path.txt")
+    graph = LazyTimeGraph(simulation, 2)
+    last = graph.get_node("start", 2)
+    assert last is not None
+    assert graph.get_edges(last) == []
+
+    graph.extend_horizon(4)
+
+    assert {edge.target.time for edge in graph.get_edges(last)} == {3}
+    assert graph.get_node("goal", 3) is not None
@@ -0,0 +1,136 @@
+from pathlib import Path
+from src.parser.file_parser import FileParser
+from src.schemas.simulation_map import SimulationMap
+from src.solver.flow_solver import FlowSolver
+from src.solver.map_reduction import MapReduction
+from src.solver.time_estimator import estimate_horizon
+from src.solver.time_graph import TimeGraph
+from conftest import MapLoader
+
+
+def write_map(tmp_path: Path, text: str) -> SimulationMap:
+    map_file = tmp_path / "map.txt"
+    map_file.write_text(text, encoding="utf-8")
+    return FileParser().parse(str(map_file))
+
+
+def output_lines(simulation: SimulationMap, max_time: int) -> list[str]:
+    solver = FlowSolver(
+        TimeGraph(simulation, max_time), simulation.nb_drones
+    )
+    solver.solve_all_drones()
+    return solver.get_simulation_output()
+
+
+def test_dead_end_is_removed(load_map: MapLoader) -> None:
+    """Verify that the dead-end branch of the trap map is dropped."""
+    simulation = load_map("medium/01_dead_end_trap.txt")
+
+    reduction = MapReduction(simulation)
+
+    assert reduction.removed_hubs == ["dead_end"]
+    assert reduction.removed_connections == [("dead_end", "junction")]
+    assert "dead_end" not in reduction.simulation.hubs
+    assert "dead_end" not in reduction.simulation.connections["junction"]
+    assert "dead_end" in reduction.original.hubs
+    assert reduction.report()[0] == "Removed 1 hubs: dead_end"
+
+
+def test_traps_of_ultimate_challenge_are_removed(load_map: MapLoader) -> None:
+    """Verify that side branches hanging off a cut hub are dropped."""
+    simulation = load_map("hard/03_ultimate_challenge.txt")
+
+    removed = set(MapReduction(simulation).removed_hubs)
+
+    assert {"maze_trap1", "maze_trap2", "priority_dead_end"} <= removed
+    assert not {"priority_trap1", "priority_trap2"} & removed
+
+
+def test_cycles_between_start_and_end_are_kept(tmp_path: Path) -> None:
+    """Verify that every hub of a block on the path survives."""
+    simulation = write_map(
+        tmp_path,
+        """nb_drones: 2
+        start_hub: start 0 0
+        hub: a 1 0
+        hub: b 1 1
+        hub: c 2 0
+        hub: spur 3 1
+        hub: loop1 3 2
+        hub: loop2 4 2
+        end_hub: goal 4 0
+        connection: start-a
+        connection: start-b
+        connection: a-c
+        connection: b-c
+        connection: c-goal
+        connection: c-spur
+        connection: spur-loop1
+        connection: loop1-loop2
+        connection: loop2-spur
+        """,
+    )
+
+    reduction = MapReduction(simulation)
+
+    assert sorted(reduction.removed_hubs) == ["loop1", "loop2", "spur"]
+    assert set(reduction.simulation.hubs) == {"start", "a", "b", "c", "goal"}
+
+
+def test_dead_end_with_priority_hub_is_kept(tmp_path: Path) -> None:
+    """Verify that a priority detour Dijkstra takes survives the pass."""
+    simulation = write_map(
+        tmp_path,
+        """nb_drones: 3
+        start_hub: start 0 0 [max_drones=3]
+        hub: a 1 0 [max_drones=3]
+        hub: bonus 1 1 [zone=priority]
+        hub: b 2 0
+        end_hub: goal 3 0 [max_drones=3]
+        connection: start-a [max_link_capacity=3]
+        connection: a-bonus
+        connection: a-b
+        connection: b-goal
+        """,
+    )
+
+    reduction = MapReduction(simulation)
+
+    assert reduction.removed_hubs == []
+    assert "D1-b D2-a D3-bonus" in output_lines(simulation, 8)
+    assert output_lines(reduction.simulation, 8) == output_lines(
+        simulation, 8
+    )
+
+
+def test_unreachable_end_keeps_the_map(tmp_path: Path) -> None:
+    """Verify that nothing is removed when END cannot be reached."""
+    simulation = write_map(
+        tmp_path,
+        """nb_drones: 1
+        start_hub: start 0 0
+        hub: a 1 0
+        end_hub: goal 4 0
+        connection: start-a
+        """,
+    )
+
+    reduction = MapReduction(simulation)
+
+    assert reduction.removed_hubs == []
+    assert reduction.report() == ["No hub removed"]
+
+
+def test_reduced_map_gives_same_output(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that dropping dead ends keeps the simulation output."""
+    simulation = load_map(map_file)
+    max_time = estimate_horizon(simulation)
+
+    reduced = MapReduction(simulation).simulation
+
+    assert output_lines(reduced, max_time) == output_lines(
+        simulation, max_time
+    )
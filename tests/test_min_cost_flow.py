@@ -0,0 +1,51 @@
+from pathlib import Path
+from src.solver.flow_solver import FlowSolver
+from src.solver.min_cost_flow import MinCostFlowSolver
+from src.solver.time_estimator import estimate_horizon
+from src.solver.time_graph import TimeGraph
+from conftest import MapLoader
+
+
+def test_linear_path_sends_drones_one_turn_apart(load_map: MapLoader) -> None:
+    """Verify that the flow staggers drones on a single corridor."""
+    simulation = load_map("easy/01_linear_path.txt")
+    solver = MinCostFlowSolver(TimeGraph(simulation, 4), 2)
+
+    paths = solver.solve_all_drones()
+
+    assert solver.repaired == 0
+    assert [path[-1].time for path in paths.values()] == [3, 4]
+    assert solver.augmentations == 2
+
+
+def test_flow_paths_respect_capacities(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that flow paths replay and arrive no later than Dijkstra."""
+    simulation = load_map(map_file)
+    max_time = estimate_horizon(simulation)
+
+    flow = MinCostFlowSolver(
+        TimeGraph(simulation, max_time), simulation.nb_drones
+    )
+    flow.solve_all_drones()
+    sequential = FlowSolver(
+        TimeGraph(simulation, max_time), simulation.nb_drones
+    )
+    sequential.solve_all_drones()
+
+    replay = FlowSolver(TimeGraph(simulation, max_time), 0)
+    for drone_id in sorted(flow.drone_paths):
+        path = flow.drone_paths[drone_id]
+        edges = replay._get_path_edges(path)
+        assert len(edges) == len(path) - 1
+        assert all(node.can_enter(replay.reservations) for node in path)
+        assert all(edge.is_traversable(replay.reservations) for edge in edges)
+        replay._reserve_path(path)
+
+    flow_arrivals = [path[-1].time for path in flow.drone_paths.values()]
+    arrivals = [path[-1].time for path in sequential.drone_paths.values()]
+    assert len(flow_arrivals) == len(arrivals) == simulation.nb_drones
+    assert max(flow_arrivals) <= max(arrivals)
+    assert sum(flow_arrivals) <= sum(arrivals)
@@ -0,0 +1,103 @@
+from pathlib import Path
+import pytest
+from src.schemas.simulation_map import SimulationMap
+from src.solver.flow_solver import FlowSolver
+from src.solver.path_templates import PathTemplates, map_hash
+from src.solver.time_estimator import (
+    estimate_horizon,
+    estimate_min_path_length,
+)
+from src.solver.time_graph import TimeGraph
+from conftest import MapLoader
+
+
+def route_fleet(
+    simulation: SimulationMap, templates: PathTemplates | None
+) -> FlowSolver:
+    solver = FlowSolver(
+        TimeGraph(simulation, estimate_horizon(simulation)),
+        simulation.nb_drones,
+        templates=templates,
+    )
+    solver.solve_all_drones()
+    return solver
+
+
+def test_routes_are_ranked_loopless_paths(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that Yen's routes are distinct, simple and sorted."""
+    simulation = load_map(map_file)
+    templates = PathTemplates(simulation, 5)
+
+    costs = [templates.cost(route) for route in templates.routes]
+
+    assert costs == sorted(costs)
+    assert costs[0][0] == estimate_min_path_length(simulation)
+    assert len({tuple(route) for route in templates.routes}) == len(costs)
+    for route in templates.routes:
+        assert len(set(route)) == len(route)
+        for source, target in zip(route, route[1:]):
+            assert target in templates.neighbors[source]
+
+
+def test_priority_breaks_ties_between_routes(load_map: MapLoader) -> None:
+    """Verify that equal-turn routes put priority zones first."""
+    simulation = load_map("medium/03_priority_puzzle.txt")
+    templates = PathTemplates(simulation, 8)
+
+    costs = [templates.cost(route) for route in templates.routes]
+    equal_turns = [cost for cost in costs if cost[0] == costs[0][0]]
+
+    assert equal_turns == sorted(equal_turns)
+    assert costs[0][1] < 0
+
+
+def test_cache_is_reused_by_map_hash(
+    tmp_path: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that routes are written once and read back."""
+    simulation = load_map("hard/01_maze_nightmare.txt")
+
+    first = PathTemplates(simulation, 4, tmp_path)
+    second = PathTemplates(simulation, 3, tmp_path)
+    other = load_map("easy/02_simple_fork.txt")
+
+    assert not first.loaded
+    assert (tmp_path / f"{map_hash(simulation)}.json").is_file()
+    assert second.loaded
+    assert second.routes == first.routes[:3]
+    assert map_hash(other) != map_hash(simulation)
+    assert not PathTemplates(simulation, 6, tmp_path).loaded
+
+
+def test_templates_for_another_map_are_rejected(load_map: MapLoader) -> None:
+    """Verify that FlowSolver checks the template map hash."""
+    simulation = load_map("easy/01_linear_path.txt")
+    other = load_map("easy/02_simple_fork.txt")
+
+    with pytest.raises(ValueError, match="another map"):
+        FlowSolver(
+            TimeGraph(simulation, 4), 2, templates=PathTemplates(other)
+        )
+    with pytest.raises(ValueError, match="at least 1"):
+        PathTemplates(simulation, 0)
+
+
+def test_template_placement_keeps_arrivals(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that shifted routes reach END as early as the search."""
+    simulation = load_map(map_file)
+
+    placed = route_fleet(simulation, PathTemplates(simulation))
+    searched = route_fleet(simulation, None)
+
+    assert placed.template_hits > 0
+    assert len(placed.drone_paths) == simulation.nb_drones
+    assert sorted(p[-1].time for p in placed.drone_paths.values()) == sorted(
+        p[-1].time for p in searched.drone_paths.values()
+    )
@@ -0,0 +1,72 @@
+import multiprocessing
+import pytest
+from src.solver.portfolio import (
+    PortfolioSolver,
+    run_strategy,
+    solve_with_portfolio,
+)
+from conftest import MapLoader
+
+
+def test_unknown_strategy_is_rejected(load_map: MapLoader) -> None:
+    """Verify that the portfolio refuses unknown strategies."""
+    simulation = load_map("easy/01_linear_path.txt")
+
+    with pytest.raises(ValueError, match="Unknown strategy"):
+        PortfolioSolver(simulation, ["sequential", "bogus"])
+    with pytest.raises(ValueError, match="at least one strategy"):
+        PortfolioSolver(simulation, [])
+
+
+def test_stops_at_the_lower_bound(load_map: MapLoader) -> None:
+    """Verify that a schedule reaching the bound ends the race."""
+    simulation = load_map("hard/02_capacity_hell.txt")
+
+    solver = solve_with_portfolio(simulation, workers=1)
+
+    assert solver.winner == "sequential"
+    assert solver.makespans == {"sequential": solver.lower_bound}
+    assert len(solver.drone_paths) == simulation.nb_drones
+
+
+def test_keeps_the_first_best_schedule_above_the_bound(
+    load_map: MapLoader,
+) -> None:
+    """Verify that every strategy runs when none meets the bound."""
+    simulation = load_map("medium/02_circular_loop.txt")
+
+    solver = solve_with_portfolio(
+        simulation, ["bulk", "sequential", "sipp"], workers=1
+    )
+
+    assert set(solver.makespans) == {"bulk", "sequential", "sipp"}
+    assert solver.winner == "bulk"
+    assert max(
+        path[-1].time for path in solver.drone_paths.values()
+    ) == min(solver.makespans.values())
+
+
+def test_races_strategies_in_worker_processes(load_map: MapLoader) -> None:
+    """Verify that the process race returns and reaps every worker."""
+    simulation = load_map("hard/03_ultimate_challenge.txt")
+
+    solver = solve_with_portfolio(simulation, workers=2)
+
+    assert solver.winner in PortfolioSolver.STRATEGIES
+    assert len(solver.drone_paths) == simulation.nb_drones
+    assert solver.makespans[solver.winner] == solver.lower_bound
+    assert len(solver.get_simulation_output()) == solver.lower_bound
+    assert multiprocessing.active_children() == []
+
+
+def test_strategies_leave_reporting_to_the_portfolio(
+    load_map: MapLoader, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Verify that a worker strategy routes without printing."""
+    simulation = load_map("easy/01_linear_path.txt")
+
+    strategy, schedule = run_strategy((simulation, "sequential", 3, 3))
+
+    assert strategy == "sequential"
+    assert list(schedule) == [1]
+    assert capsys.readouterr().out == ""
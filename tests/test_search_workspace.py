@@ -0,0 +1,80 @@
+import pytest
+from src.solver.flow_solver import FlowSolver
+from src.solver.lazy_time_graph import LazyTimeGraph
+from src.solver.search_workspace import SearchWorkspace
+from src.solver.time_estimator import estimate_horizon
+from src.solver.time_graph import TimeGraph
+from conftest import MapLoader
+
+
+def test_reset_forgets_labels(load_map: MapLoader) -> None:
+    """Verify that a new generation drops every label in O(1)."""
+    simulation = load_map("easy/01_linear_path.txt")
+    graph = TimeGraph(simulation, 4)
+    workspace = SearchWorkspace(len(graph.hub_indexes), 4)
+    node = sorted(graph.nodes, key=lambda node: node.time)[-1]
+    node_id = workspace.node_id(node.hub_index, node.time)
+
+    workspace.reset(4, 0)
+    workspace.label(node, 1, None)
+    workspace.close(node_id)
+    assert workspace.is_labelled(node_id)
+    assert workspace.is_closed(node_id)
+
+    workspace.reset(4, 0)
+    assert not workspace.is_labelled(node_id)
+    assert not workspace.is_closed(node_id)
+
+
+def test_keys_give_back_the_state(load_map: MapLoader) -> None:
+    """Verify that queue keys follow turns then priorities."""
+    simulation = load_map("easy/01_linear_path.txt")
+    graph = TimeGraph(simulation, 5)
+    workspace = SearchWorkspace(len(graph.hub_indexes), 5)
+    workspace.reset(5, 1)
+    early = graph.get_node("waypoint1", 2)
+    late = graph.get_node("waypoint1", 3)
+    assert early is not None and late is not None
+
+    plain = workspace.label(early, 0, None)
+    favoured = workspace.label(early, 1, None)
+    later = workspace.label(late, 3, None)
+
+    assert favoured < plain < later
+    assert workspace.node_of(plain) == workspace.node_id(
+        early.hub_index, 2
+    )
+
+
+def test_ensure_grows_with_the_horizon() -> None:
+    """Verify that appending layers keeps existing slots."""
+    workspace = SearchWorkspace(3, 2)
+    assert len(workspace.stamp) == 9
+
+    workspace.ensure(4)
+    assert len(workspace.stamp) == 15
+    assert len(workspace.nodes) == 15
+    assert workspace.parent[14] == -1
+
+
+@pytest.mark.parametrize("graph_type", [TimeGraph, LazyTimeGraph])
+@pytest.mark.parametrize("search", ["dijkstra", "astar"])
+def test_workspace_is_shared_across_drones(
+    graph_type: type,
+    search: str,
+    load_map: MapLoader,
+) -> None:
+    """Verify that every drone reuses the solver workspace."""
+    simulation = load_map("medium/02_circular_loop.txt")
+    solver = FlowSolver(
+        graph_type(simulation, estimate_horizon(simulation)),
+        simulation.nb_drones,
+        search,
+    )
+    workspace = solver._workspace
+
+    solver.solve_all_drones()
+
+    assert solver._workspace is workspace
+    assert workspace.generation >= simulation.nb_drones
+    assert len(solver.drone_paths) == simulation.nb_drones
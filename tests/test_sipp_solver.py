@@ -0,0 +1,99 @@
+from pathlib import Path
+from src.solver.flow_solver import FlowSolver
+from src.solver.sipp_solver import IntervalReservations, SippSolver
+from src.solver.time_estimator import estimate_max_time
+from src.solver.time_graph import TimeGraph
+from conftest import MapLoader
+
+
+def test_safe_intervals_split_on_full_turns() -> None:
+    """Verify that full turns cut the free runs of a hub."""
+    reservations = IntervalReservations([1, 2], [1], [False, True])
+
+    reservations.add_hub_drone(0, 3)
+    reservations.add_hub_drone(0, 4)
+
+    assert reservations.safe_interval(0, 1, 10) == (0, 2)
+    assert reservations.safe_interval(0, 4, 10) is None
+    assert reservations.safe_interval(0, 7, 10) == (5, 10)
+    assert reservations.next_free_turn(0, 3) == 5
+
+
+def test_end_absorbs_drones() -> None:
+    """Verify that END fills up from the last allowed arrival."""
+    reservations = IntervalReservations([1, 2], [1], [False, True])
+
+    reservations.add_hub_drone(1, 6)
+    assert reservations.hub_drones(1, 9) == 1
+    assert reservations.safe_interval(1, 9, 20) == (0, 20)
+
+    reservations.add_hub_drone(1, 4)
+    assert reservations.safe_interval(1, 3, 20) == (0, 5)
+    assert reservations.next_free_turn(1, 6) is None
+
+
+def test_link_reports_first_full_turn() -> None:
+    """Verify that a traversal sees every turn it covers."""
+    reservations = IntervalReservations([1], [1], [False])
+
+    reservations.add_link_drone(0, 5, 2)
+
+    assert reservations.blocked_link_turn(0, 3, 2) is None
+    assert reservations.blocked_link_turn(0, 4, 2) == 5
+    assert reservations.blocked_link_turn(0, 6, 1) == 6
+
+
+def test_sipp_schedule_is_valid_and_as_fast(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that SIPP paths follow the TEG rules and match FlowSolver."""
+    simulation = load_map(map_file)
+    max_time = estimate_max_time(simulation)
+
+    sipp = SippSolver(simulation, simulation.nb_drones, max_time)
+    sipp.solve_all_drones()
+    flow = FlowSolver(TimeGraph(simulation, max_time), simulation.nb_drones)
+    flow.solve_all_drones()
+
+    replay = FlowSolver(TimeGraph(simulation, max_time), 0)
+    for drone_id in sorted(sipp.drone_paths):
+        path = sipp.drone_paths[drone_id]
+        edges = replay._get_path_edges(path)
+        assert len(edges) == len(path) - 1
+        assert all(node.can_enter(replay.reservations) for node in path)
+        assert all(edge.is_traversable(replay.reservations) for edge in edges)
+        replay._reserve_path(path)
+
+    assert sipp.drone_paths == flow.drone_paths
+    assert sipp.expansions <= flow.expansions
+
+
+def test_drones_wait_at_start_like_flow_solver(
+    tmp_path: Path, load_map: MapLoader
+) -> None:
+    """Verify that a delayed drone waits at START, as in FlowSolver."""
+    map_file = tmp_path / "map.txt"
+    map_file.write_text(
+        """nb_drones: 2
+        start_hub: start 0 0 [max_drones=2]
+        hub: a 1 0 [max_drones=2]
+        hub: b 2 0
+        end_hub: goal 3 0 [max_drones=2]
+        connection: start-a [max_link_capacity=2]
+        connection: a-b [max_link_capacity=2]
+        connection: b-goal [max_link_capacity=2]
+        """,
+        encoding="utf-8",
+    )
+    simulation = load_map(map_file)
+
+    sipp = SippSolver(simulation, 2)
+    sipp.solve_all_drones()
+
+    assert [(node.hub.name, node.time) for node in sipp.drone_paths[2]] == [
+        ("start", 0), ("start", 1), ("a", 2), ("b", 3), ("goal", 4)
+    ]
+    flow = FlowSolver(TimeGraph(simulation, 4), 2)
+    flow.solve_all_drones()
+    assert sipp.drone_paths == flow.drone_paths
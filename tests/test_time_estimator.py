@@ -0,0 +1,109 @@
+from pathlib import Path
+import pytest
+from src.parser.file_parser import FileParser
+from src.schemas.simulation_map import SimulationMap
+from src.solver.compact_graph import CompactTimeGraph
+from src.solver.compact_solver import CompactFlowSolver
+from src.solver.time_estimator import (
+    estimate_horizon,
+    estimate_max_time,
+    estimate_min_path_length,
+    static_min_cut,
+)
+
+
+def write_map(tmp_path: Path, content: str) -> SimulationMap:
+    map_file = tmp_path / "map.txt"
+    map_file.write_text(content, encoding="utf-8")
+    return FileParser().parse(str(map_file))
+
+
+def test_min_path_is_exact_with_restricted_first(tmp_path: Path) -> None:
+    """Verify that a cheaper branch found later still wins."""
+    simulation = write_map(
+        tmp_path,
+        """nb_drones: 1
+        start_hub: start 0 0
+        hub: slow 1 1 [zone=restricted]
+        hub: fast 1 0
+        end_hub: goal 2 0
+        connection: start-slow
+        connection: start-fast
+        connection: slow-goal
+        connection: fast-goal
+        """,
+    )
+
+    assert estimate_min_path_length(simulation) == 2
+
+
+def test_min_cut_counts_hubs_and_links(tmp_path: Path) -> None:
+    """Verify the bottleneck of two corridors with different limits."""
+    simulation = write_map(
+        tmp_path,
+        """nb_drones: 10
+        start_hub: start 0 0
+        hub: wide 1 0 [max_drones=4]
+        hub: slow 1 1 [zone=restricted max_drones=4]
+        end_hub: goal 2 0
+        connection: start-wide [max_link_capacity=3]
+        connection: wide-goal [max_link_capacity=5]
+        connection: start-slow [max_link_capacity=2]
+        connection: slow-goal [max_link_capacity=2]
+        """,
+    )
+
+    assert static_min_cut(simulation) == 4
+    assert estimate_horizon(simulation) == 2 + 3
+    assert estimate_horizon(simulation, slack=2) == 2 + 3 + 2
+
+
+def test_unreachable_end_has_no_cut(tmp_path: Path) -> None:
+    """Verify that an unreachable END gives no horizon."""
+    simulation = write_map(
+        tmp_path,
+        """nb_drones: 2
+        start_hub: start 0 0
+        hub: island 1 0
+        end_hub: goal 2 0
+        connection: start-island
+        """,
+    )
+
+    assert static_min_cut(simulation) == 0
+    assert estimate_horizon(simulation) == -1
+
+
+def test_fixed_horizon_engines_need_the_upper_bound(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Verify that the cut estimate can be too short, not the bound."""
+    simulation = write_map(
+        tmp_path,
+        """nb_drones: 4
+        start_hub: start 0 0 [max_drones=4]
+        hub: a 1 1
+        hub: b 2 1
+        hub: c 3 1
+        end_hub: goal 4 0 [max_drones=4]
+        connection: start-goal
+        connection: start-a
+        connection: a-b
+        connection: b-c
+        connection: c-goal
+        """,
+    )
+
+    assert estimate_horizon(simulation) == 1 + 2
+    assert estimate_max_time(simulation) == 4 * 1
+
+    short = CompactFlowSolver(CompactTimeGraph(simulation, 3), 4)
+    short.solve_all_drones()
+    assert len(short.drone_paths) == 3
+    assert "Drone 4: No valid path found!" in capsys.readouterr().out
+
+    bounded = CompactFlowSolver(
+        CompactTimeGraph(simulation, estimate_max_time(simulation)), 4
+    )
+    bounded.solve_all_drones()
+    assert len(bounded.drone_paths) == 4
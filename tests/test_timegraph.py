@@ -4,7 +4,12 @@ from src.schemas.connection import Connection
 from src.schemas.definitions import ZoneType, NodeCategory
 from src.schemas.simulation_map import SimulationMap
 from src.solver.time_graph import TimeGraph
-from src.solver.models import TimeNode
+from src.solver.models import (
+    ArrivalCounter,
+    ReservationTable,
+    SparseReservationTable,
+    TimeNode,
+)
 
 
 @pytest.fixture
@@ -138,6 +143,16 @@ def test_time_graph_initialization(simple_simulation: SimulationMap) -> None:
     assert len(graph.adjacency) > 0
 
 
+def test_start_and_end_indexes_are_found_once(
+    blocked_simulation: SimulationMap,
+) -> None:
+    """Verify that START and END hub indexes skip blocked hubs."""
+    graph = TimeGraph(blocked_simulation, 3)
+
+    assert graph.hub_names[graph.start_index] == "A"
+    assert [graph.hub_names[index] for index in graph.end_indexes] == ["C"]
+
+
 def test_build_graph_creates_all_nodes(
     simple_simulation: SimulationMap,
 ) -> None:
@@ -457,3 +472,217 @@ def test_no_edges_from_nonexistent_nodes(
     for edge in graph.edges:
         assert edge.source in graph.nodes
         assert edge.target in graph.nodes
+
+
+def test_connection_ids_shared_between_directions(
+    simple_simulation: SimulationMap,
+) -> None:
+    """Verify that both directions of a connection use the same id."""
+    graph = TimeGraph(simple_simulation, 3)
+
+    assert len(graph.connection_ids) == 2
+    assert graph._connection_key("A", "B") == graph._connection_key("B", "A")
+    for edge in graph.edges:
+        if edge.source.hub.name != edge.target.hub.name:
+            key = graph._connection_key(
+                edge.target.hub.name, edge.source.hub.name
+            )
+            assert edge.connection_id == graph.connection_ids[key]
+
+
+def test_wait_edges_have_no_connection_id(
+    simple_simulation: SimulationMap,
+) -> None:
+    """Verify that wait edges are bounded by hub occupancy only."""
+    graph = TimeGraph(simple_simulation, 3)
+
+    for edge in graph.edges:
+        if edge.source.hub.name == edge.target.hub.name:
+            assert edge.connection_id == -1
+            assert edge.is_traversable(graph.reservations)
+
+
+def test_reservation_table_tracks_hub_occupancy(
+    simple_simulation: SimulationMap,
+) -> None:
+    """Verify that nodes read their occupancy from the reservation table."""
+    graph = TimeGraph(simple_simulation, 3)
+    node = graph.get_node("B", 1)
+    assert node is not None
+
+    assert node.can_enter(graph.reservations)
+    node.add_drone(graph.reservations)
+    assert not node.can_enter(graph.reservations)
+    assert graph.reservations.hub_drones[node.hub_index][1] == 1
+
+
+def test_restricted_edge_checks_every_turn(
+    restricted_simulation: SimulationMap,
+) -> None:
+    """Verify that a 2-turn edge is blocked if any of its turns is full."""
+    graph = TimeGraph(restricted_simulation, 5)
+    edge = next(
+        e for e in graph.edges
+        if e.source.hub.name == "A" and e.target.hub.name == "R"
+        and e.source.time == 0
+    )
+
+    assert edge.is_traversable(graph.reservations)
+    graph.reservations.add_link_drone(edge.connection_id, 1, 1)
+    assert not edge.is_traversable(graph.reservations)
+
+
+def test_use_edge_registers_all_turns(
+    restricted_simulation: SimulationMap,
+) -> None:
+    """Verify that using a 2-turn edge occupies the link for 2 turns."""
+    graph = TimeGraph(restricted_simulation, 5)
+    edge = next(
+        e for e in graph.edges
+        if e.source.hub.name == "A" and e.target.hub.name == "R"
+        and e.source.time == 1
+    )
+
+    edge.use_edge(graph.reservations)
+
+    row = graph.reservations.link_drones[edge.connection_id]
+    assert list(row) == [0, 1, 1, 0, 0, 0]
+
+
+def test_extend_horizon_matches_fresh_graph(
+    restricted_simulation: SimulationMap,
+) -> None:
+    """Verify that appended layers equal a graph built at that size."""
+    graph = TimeGraph(restricted_simulation, 2)
+    graph.extend_horizon(6)
+    fresh = TimeGraph(restricted_simulation, 6)
+
+    def edge_keys(g: TimeGraph) -> set[tuple[str, int, str, int, int]]:
+        return {
+            (
+                e.source.hub.name,
+                e.source.time,
+                e.target.hub.name,
+                e.target.time,
+                e.connection_id,
+            )
+            for e in g.edges
+        }
+
+    assert graph.nodes == fresh.nodes
+    assert edge_keys(graph) == edge_keys(fresh)
+    assert sum(len(v) for v in graph.adjacency.values()) == len(graph.edges)
+    assert len(graph.reservations.hub_drones[0]) == 7
+
+
+def test_extend_horizon_keeps_end_absorption(
+    simple_simulation: SimulationMap,
+) -> None:
+    """Verify that drones already at END stay there on new layers."""
+    graph = TimeGraph(simple_simulation, 3)
+    end = graph.hub_indexes["C"]
+    graph.reservations.add_hub_drone(end, 3)
+    graph.reservations.add_hub_drone(graph.hub_indexes["B"], 3)
+
+    graph.extend_horizon(5)
+
+    assert [
+        graph.reservations.hub_count(end, turn) for turn in range(6)
+    ] == [0, 0, 0, 1, 1, 1]
+    assert graph.reservations.hub_drones[graph.hub_indexes["B"]][4] == 0
+
+
+def test_arrival_counter_prefix_counts() -> None:
+    """Verify that arrivals count on their turn and every later one."""
+    counter = ArrivalCounter(6)
+    counter.add(2)
+    counter.add(4, 2)
+
+    assert [counter.arrived_by(turn) for turn in range(7)] == [
+        0, 0, 1, 1, 3, 3, 3
+    ]
+
+    counter.extend(9)
+    assert counter.arrived_by(9) == 3
+
+
+@pytest.mark.parametrize(
+    "table", [ReservationTable, SparseReservationTable]
+)
+def test_absorbing_hub_fills_after_arrivals(table: type) -> None:
+    """Verify that an absorbing hub is full once enough drones arrived."""
+    reservations = table([2, 2], [1], 5, [1])
+    reservations.add_hub_drone(1, 1)
+    reservations.add_hub_drone(1, 3)
+    reservations.add_hub_drone(0, 1)
+
+    assert reservations.hub_room(1, 2) == 1
+    assert not reservations.hub_has_room(1, 3)
+    assert not reservations.hub_has_room(1, 5)
+    assert reservations.hub_count(0, 2) == 0
+
+    reservations.extend(8)
+    assert not reservations.hub_has_room(1, 8)
+
+
+def test_edge_room_counts_link_and_target(
+    restricted_simulation: SimulationMap,
+) -> None:
+    """Verify that an edge's room is its tightest resource."""
+    graph = TimeGraph(restricted_simulation, 5)
+    edge = next(
+        e for e in graph.edges
+        if e.source.hub.name == "A" and e.target.hub.name == "R"
+        and e.source.time == 0
+    )
+    link_capacity = graph.reservations.link_capacity[edge.connection_id]
+    expected = min(link_capacity, edge.target.hub.max_drones)
+
+    assert edge.room(graph.reservations) == expected
+    edge.use_edge(graph.reservations, expected)
+    assert edge.room(graph.reservations) == 0
+    assert not edge.is_traversable(graph.reservations)
+
+
+def test_prune_keeps_only_time_windows(
+    simple_simulation: SimulationMap,
+) -> None:
+    """Verify that nodes outside their START/END window are skipped."""
+    graph = TimeGraph(simple_simulation, 4, prune=True)
+
+    times = {
+        name: sorted(n.time for n in graph.nodes if n.hub.name == name)
+        for name in ("A", "B", "C")
+    }
+
+    assert times == {"A": [0, 1, 2], "B": [1, 2, 3], "C": [2, 3, 4]}
+    assert len(graph.edges) == 12
+    assert graph.pruned_nodes == 6
+    assert graph.pruned_edges == 8
+    assert TimeGraph(simple_simulation, 4).pruned_nodes == 0
+
+
+def test_prune_extend_horizon_reopens_windows(
+    restricted_simulation: SimulationMap,
+) -> None:
+    """Verify that a pruned graph grows into the fresh pruned graph."""
+    graph = TimeGraph(restricted_simulation, 3, prune=True)
+    graph.extend_horizon(7)
+    fresh = TimeGraph(restricted_simulation, 7, prune=True)
+
+    def edge_keys(g: TimeGraph) -> list[tuple[str, int, str, int, int]]:
+        return sorted(
+            (
+                e.source.hub.name,
+                e.source.time,
+                e.target.hub.name,
+                e.target.time,
+                e.connection_id,
+            )
+            for e in g.edges
+        )
+
+    assert graph.nodes == fresh.nodes
+    assert edge_keys(graph) == edge_keys(fresh)
+    assert sum(len(v) for v in graph.adjacency.values()) == len(graph.edges)
+    assert graph.pruned_edges == fresh.pruned_edges
@@ -0,0 +1,83 @@
+from collections import Counter
+from pathlib import Path
+from src.schemas.definitions import NodeCategory
+from src.schemas.simulation_map import SimulationMap
+from src.solver.flow_solver import FlowSolver
+from src.solver.models import TimeNode
+from src.solver.time_estimator import estimate_horizon
+from src.solver.time_graph import TimeGraph
+from src.solver.twin_hubs import TwinCompression, TwinHubSolver
+from conftest import MapLoader
+
+
+def assert_capacities(
+    simulation: SimulationMap, paths: dict[int, list[TimeNode]]
+) -> None:
+    """Checks every hub and link occupancy of paths against the map."""
+    hubs: Counter[tuple[str, int]] = Counter()
+    links: Counter[tuple[frozenset[str], int]] = Counter()
+    for path in paths.values():
+        for node in path:
+            hubs[(node.hub.name, node.time)] += 1
+        for source, target in zip(path, path[1:]):
+            if source.hub.name == target.hub.name:
+                continue
+            assert target.hub.name in simulation.connections[source.hub.name]
+            link = frozenset((source.hub.name, target.hub.name))
+            for turn in range(source.time, target.time):
+                links[(link, turn)] += 1
+
+    for (name, _), count in hubs.items():
+        if simulation.hubs[name].category != NodeCategory.END:
+            assert count <= simulation.hubs[name].max_drones
+    for (link, _), count in links.items():
+        first, second = sorted(link)
+        connection = simulation.connections[first][second]
+        assert count <= connection.max_link_capacity
+
+
+def test_parallel_stretches_are_merged(load_map: MapLoader) -> None:
+    """Verify that twin hubs collapse with summed capacities."""
+    simulation = load_map("hard/01_maze_nightmare.txt")
+
+    compression = TwinCompression(simulation)
+    merged = compression.simulation
+
+    assert compression.members["final_stretch1"] == [
+        "final_stretch1", "final_stretch2", "final_stretch3"
+    ]
+    assert compression.merged_hubs() == 3
+    assert "final_stretch2" not in merged.hubs
+    assert merged.hubs["final_stretch1"].max_drones == 3
+    assert merged.connections["goal"]["final_stretch1"].max_link_capacity == 3
+    assert simulation.hubs["final_stretch1"].max_drones == 1
+
+
+def test_map_without_twins_is_unchanged(load_map: MapLoader) -> None:
+    """Verify that hubs without a twin are left alone."""
+    simulation = load_map("medium/03_priority_puzzle.txt")
+
+    compression = TwinCompression(simulation)
+
+    assert compression.merged_hubs() == 0
+    assert compression.simulation.hubs == simulation.hubs
+
+
+def test_twin_solver_respects_concrete_capacities(
+    map_file: Path,
+    load_map: MapLoader,
+) -> None:
+    """Verify that assigned hubs fit and arrivals match the full search."""
+    simulation = load_map(map_file)
+    max_time = estimate_horizon(simulation)
+
+    twins = TwinHubSolver(simulation, max_time)
+    twins.solve_all_drones()
+    full = FlowSolver(TimeGraph(simulation, max_time), simulation.nb_drones)
+    full.solve_all_drones()
+
+    assert len(twins.drone_paths) == simulation.nb_drones
+    assert_capacities(simulation, twins.drone_paths)
+    assert sorted(p[-1].time for p in twins.drone_paths.values()) == sorted(
+        p[-1].time for p in full.drone_paths.values()
+    )